@@ -1,12 +1,25 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
+import hashlib
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from src.news_fetcher import NewsFetcher
+from src.response_cache import ResponseCache
+from src.rate_limiter import TokenBucket
+from src.analysis_cache import AnalysisCache
+from src.article_body import ArticleBodyFetcher, BodyCache
+from src.deduplicator import ArticleDeduplicator
+from src.story_clusterer import StoryClusterer
+from src.search_index import ArticleSearchIndex, parse_published_at, search_with_fallback
+from src.trending import TrendingTracker, article_phrases
 from src.text_processor import TextProcessor
-from src.summarizer import NewsSummarizer
+from src.model_registry import ModelRegistry
 from src.linguistic_analyzer import LinguisticAnalyzer
 from src.topic_extractor import TopicExtractor
+from src.metrics import carry_context, metrics, profile_request
 from config.config import Config
 
 # Page config
@@ -19,19 +32,161 @@ st.set_page_config(
 # Initialize components
 @st.cache_resource
 def init_components():
-    fetcher = NewsFetcher(Config.GNEWS_API_KEY)
-    processor = TextProcessor()
-    summarizer = NewsSummarizer()
-    analyzer = LinguisticAnalyzer()
-    extractor = TopicExtractor()
-    return fetcher, processor, summarizer, analyzer, extractor
+    cache = ResponseCache(
+        ttl=Config.CACHE_TTL,
+        endpoint_ttls=Config.CACHE_ENDPOINT_TTLS,
+        stale_ttl=Config.CACHE_STALE_TTL,
+        max_entries=Config.CACHE_MAX_ENTRIES,
+        path=Config.CACHE_PATH,
+        daily_quota=Config.GNEWS_DAILY_QUOTA,
+        max_db_entries=Config.CACHE_DB_MAX_ENTRIES
+    )
+    fetcher = NewsFetcher(
+        Config.GNEWS_API_KEY,
+        cache=cache,
+        rate_limiter=TokenBucket(Config.GNEWS_RATE_LIMIT),
+        max_page_size=Config.GNEWS_MAX_PAGE_SIZE,
+        language=Config.DEFAULT_LANGUAGE
+    )
+    # Cleaning and search tokenization only; spaCy and sumy models come
+    # from the registry, per article language
+    processor = TextProcessor(tfidf_path=Config.TFIDF_INDEX_PATH)
+    models = ModelRegistry(
+        Config.MODEL_MEMORY_BUDGET_MB,
+        Config.DEFAULT_LANGUAGE,
+        Config.SUPPORTED_LANGUAGES
+    )
+    analyzer = LinguisticAnalyzer(Config.WORDNET_INDEX_PATH)
+    category_lexicon = None
+    if Config.CATEGORY_LEXICON_PATH:
+        with open(Config.CATEGORY_LEXICON_PATH, encoding='utf-8') as f:
+            category_lexicon = json.load(f)
+    extractor = TopicExtractor(
+        Config.TOPIC_MODEL_PATH,
+        Config.TOPIC_MODEL_TOPICS,
+        category_lexicon=category_lexicon
+    )
+    
+    # Heavy imports and models load lazily unless warm-up is requested
+    if Config.WARM_UP_ON_START:
+        models.get(Config.DEFAULT_LANGUAGE)
+        for component in (analyzer, extractor):
+            component.warm_up()
+    analysis_cache = AnalysisCache(
+        Config.ANALYSIS_CACHE_PATH,
+        max_entries=Config.ANALYSIS_CACHE_MAX_ENTRIES
+    )
+    search_index = ArticleSearchIndex(
+        Config.SEARCH_INDEX_DIR,
+        processor,
+        recency_half_life_hours=Config.SEARCH_RECENCY_HALF_LIFE_HOURS
+    )
+    body_fetcher = ArticleBodyFetcher(
+        per_host=Config.BODY_FETCH_PER_HOST,
+        max_bytes=Config.BODY_FETCH_MAX_BYTES,
+        timeout=Config.BODY_FETCH_TIMEOUT,
+        cache=BodyCache(Config.BODY_CACHE_PATH)
+    )
+    trending = TrendingTracker.load_or_create(
+        Config.TRENDING_PATH,
+        bucket_seconds=Config.TRENDING_BUCKET_SECONDS,
+        num_buckets=Config.TRENDING_WINDOW_HOURS * 3600 // Config.TRENDING_BUCKET_SECONDS,
+        half_life_hours=Config.TRENDING_HALF_LIFE_HOURS
+    )
+    return (fetcher, processor, models, analyzer, extractor, analysis_cache,
+            search_index, body_fetcher, trending)
+
+@st.cache_resource
+def init_executor():
+    # Background analysis of the articles on the current page, shared by all sessions
+    return ThreadPoolExecutor(max_workers=Config.UI_ANALYSIS_WORKERS,
+                              thread_name_prefix='analysis')
+
+def analyze_articles(contents, languages, processor, models, extractor, analysis_cache, settings):
+    """
+    Clean, keyword/entity, summary, category and key phrase analysis per article.
+    Results are looked up in the content-addressed analysis cache first; only
+    the misses are analyzed, with spaCy run over all of them in one batch per
+    language, using that language's models.
+    """
+    clean_contents = [processor.clean_text(content) for content in contents]
+    # Keyed by the language and its model too: the same text analyzed as another
+    # language, or by an upgraded model, must not hit
+    params = [dict(settings, **models.cache_params(language)) for language in languages]
+    results = [analysis_cache.get(clean, params[i]) if clean else None
+               for i, clean in enumerate(clean_contents)]
+    missing = [i for i, result in enumerate(results) if result is None]
+    
+    # Each article is parsed once; keywords, summary, category and key phrases
+    # all reuse the same document
+    for language, positions in models.group([languages[i] for i in missing]).items():
+        language_models = models.get(language)
+        group = [missing[position] for position in positions]
+        documents = language_models.processor.analyze_many([clean_contents[i] for i in group])
+        for i, document in zip(group, documents):
+            results[i] = _analysis(clean_contents[i], document, language_models,
+                                   extractor, settings)
+            if clean_contents[i]:
+                analysis_cache.set(clean_contents[i], params[i], results[i])
+    
+    for clean_content, result in zip(clean_contents, results):
+        result['clean_content'] = clean_content
+    return results
+
+def _analysis(clean_content, document, language_models, extractor, settings):
+    """One article's analysis from its parsed document"""
+    important_words, entities = language_models.processor.important_words(
+        document, settings['num_keywords']
+    )
+    return {
+        'keywords': important_words if clean_content else [],
+        'entities': entities if clean_content else [],
+        'summary': language_models.summarizer.summarize_text(
+            document,
+            settings['summary_length'],
+            settings['summary_method'],
+            time_budget=Config.SUMMARY_TIME_BUDGET,
+            max_sentences=Config.SUMMARY_MAX_SENTENCES
+        ),
+        'category': extractor.categorize_article(document),
+        'key_phrases': extractor.extract_key_phrases(document)
+    }
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+# In-memory memos in front of the on-disk analysis cache, so reruns triggered
+# by widgets re-render without recomputing. Arguments starting with '_' are
+# not hashed by Streamlit: texts are keyed by their content hash instead.
+@st.cache_data(max_entries=Config.UI_CACHE_MAX_ENTRIES, show_spinner=False)
+def analyze_cached(digest, language, settings, _content):
+    (_, processor, models, _, extractor, analysis_cache, _, _, _) = init_components()
+    return analyze_articles([_content], [language], processor, models, extractor,
+                            analysis_cache, settings)[0]
+
+@st.cache_data(max_entries=Config.UI_CACHE_MAX_ENTRIES, show_spinner=False)
+def summarize_story_cached(digest, language, summary_length, summary_method, _texts):
+    (_, _, models, _, _, _, _, _, _) = init_components()
+    return models.summarizer(language).summarize_cluster(_texts, summary_length, summary_method)
+
+@st.cache_data(max_entries=Config.UI_CACHE_MAX_ENTRIES, show_spinner=False)
+def synonyms_cached(words):
+    (_, _, _, analyzer, _, _, _, _, _) = init_components()
+    return analyzer.analyze_words(list(words))
+
+@st.cache_data(max_entries=100, show_spinner=False)
+def topics_cached(digest, _contents):
+    (_, _, _, _, extractor, _, _, _, _) = init_components()
+    return extractor.extract_topics_lda(_contents, n_topics=3)
 
 def main():
     st.title("📰 Intelligent News Summarizer")
     st.markdown("---")
     
     # Initialize components
-    fetcher, processor, summarizer, analyzer, extractor = init_components()
+    (fetcher, processor, models, analyzer, extractor, analysis_cache,
+     search_index, body_fetcher, trending) = init_components()
+    executor = init_executor()
     
     # Sidebar
     with st.sidebar:
@@ -54,24 +209,69 @@ def main():
             )
         else:
             search_query = st.text_input("Search Query")
+            api_fallback = st.checkbox(
+                "Query GNews when nothing matches locally", True,
+                help=f"{len(search_index)} articles indexed locally"
+            )
+        num_articles = st.slider("Articles to fetch", 5, 50, 10, step=5)
+        language = st.selectbox(
+            "Language",
+            models.languages,
+            index=models.languages.index(models.default_language)
+        )
         
         # Summarization settings
         st.subheader("Summarization Settings")
         summary_method = st.selectbox(
             "Method",
-            ["textrank", "lsa", "lexrank"]
+            ["textrank", "lsa", "lexrank", "fast_textrank", "fast_lexrank"]
         )
         summary_length = st.slider("Summary Sentences", 2, 5, 3)
         
         # Analysis settings
         st.subheader("Analysis Settings")
         num_keywords = st.slider("Number of Keywords", 5, 15, 10)
+        full_text = st.checkbox(
+            "Analyze full article text", False,
+            help="Download each article's page instead of using the GNews snippet"
+        )
+        story_view = st.checkbox(
+            "Group articles into stories", True,
+            help="One summary per story from all of its articles, instead of one per article"
+        )
         show_synonyms = st.checkbox("Show Synonyms/Antonyms", True)
         extract_topics = st.checkbox("Extract Topics", True)
         
         fetch_button = st.button("🔍 Fetch & Analyze News")
+        
+        # Cache effectiveness and remaining API quota
+        if fetcher.cache is not None:
+            st.subheader("📦 API Cache")
+            cache_stats = fetcher.cache.stats()
+            col_hits, col_saved = st.columns(2)
+            col_hits.metric("Hit Rate", f"{cache_stats['hit_rate']:.0%}")
+            col_saved.metric("Calls Saved", cache_stats['api_calls_saved'])
+            st.caption(
+                f"Quota used today: {cache_stats['quota_used_today']} / {Config.GNEWS_DAILY_QUOTA} "
+                f"({cache_stats['quota_remaining']} remaining)"
+            )
+        
+        analysis_stats = analysis_cache.stats()
+        st.caption(
+            f"Analysis cache: {analysis_stats['entries']} articles, "
+            f"hit rate {analysis_stats['hit_rate']:.0%}"
+        )
+        model_stats = models.stats()
+        st.caption(
+            f"Language models: {', '.join(model_stats['loaded']) or 'none loaded'} "
+            f"({model_stats['memory_mb']:.0f} / {model_stats['memory_budget_mb']} MB)"
+        )
+        
+        trending_panel(trending)
+        performance_panel()
     
-    # Main content area
+    # Main content area: fetch on demand, then keep the stories across reruns
+    # so paging and widget changes don't refetch
     if fetch_button:
         with st.spinner("Fetching news..."):
             # Fetch news
@@ -79,152 +279,302 @@ def main():
                 news_data = fetcher.get_top_headlines(
                     country=country,
                     category=category,
-                    page_size=5
+                    page_size=num_articles,
+                    lang=language
                 )
             else:
                 if search_query:
-                    news_data = fetcher.search_news(search_query)
+                    news_data = search_with_fallback(
+                        search_index, fetcher, search_query,
+                        limit=num_articles,
+                        api_fallback=api_fallback,
+                        lang=language
+                    )
                 else:
                     st.error("Please enter a search query")
                     return
             
-            # Debug information
-            st.write("Debug Info:")
-            st.write(f"- GNews API Key present: {bool(Config.GNEWS_API_KEY)}")
-            st.write(f"- GNews API Key length: {len(Config.GNEWS_API_KEY) if Config.GNEWS_API_KEY else 0}")
-            st.write(f"- Selected country: {country if news_source == 'Top Headlines' else 'N/A'}")
-            st.write(f"- Selected category: {category if news_source == 'Top Headlines' else 'N/A'}")
-            st.write(f"- Response status: {news_data.get('status', 'No status')}")
-            st.write(f"- Number of articles: {len(news_data.get('articles', []))}")
+            if not Config.GNEWS_API_KEY:
+                st.warning("GNEWS_API_KEY is not set")
             
             if news_data.get('status') == 'error':
                 st.error(f"API Error: {news_data.get('message', 'Unknown error')}")
                 st.write("Full response:", news_data)
             
+            st.session_state.pop('stories', None)
             if news_data['status'] == 'ok' and news_data['articles']:
                 articles = news_data['articles']
+                search_index.add_articles(articles)
                 
-                # Process each article
-                for idx, article in enumerate(articles[:3]):  # Limit to 3 articles for demo
-                    st.markdown(f"## Article {idx + 1}")
-                    
-                    # Original content
-                    content = article['description'] or article['content'] or ""
-                    
-                    # Initialize variables
-                    clean_content = ""
-                    important_words = []
-                    entities = []
-                    
-                    if content:
-                        # Clean text
-                        clean_content = processor.clean_text(content)
-                        
-                        # Important words and entities
-                        important_words, entities = processor.extract_important_words(
-                            clean_content, 
-                            num_keywords
-                        )
-                    
-                    col1, col2 = st.columns([2, 1])
-                    
-                    with col1:
-                        st.subheader(article['title'])
-                        st.caption(f"Source: {article['source']['name']} | Published: {article['publishedAt'][:10]}")
-                        
-                        if content:
-                            with st.expander("📄 Original Content"):
-                                st.write(content)
-                            
-                            # Summary
-                            st.markdown("### 📝 Summary")
-                            summary = summarizer.summarize_text(
-                                clean_content, 
-                                summary_length, 
-                                summary_method
-                            )
-                            st.info(summary)
-                            
-                            # Display keywords
-                            st.markdown("### 🔑 Key Words")
-                            keywords_df = pd.DataFrame(important_words)
-                            if not keywords_df.empty:
-                                st.dataframe(keywords_df)
-                            
-                            # Synonyms and Antonyms
-                            if show_synonyms and important_words:
-                                st.markdown("### 📚 Synonyms & Antonyms")
-                                word_list = [w['word'] for w in important_words[:5]]
-                                linguistic_analysis = analyzer.analyze_words(word_list)
-                                
-                                for analysis in linguistic_analysis:
-                                    with st.expander(f"Word: **{analysis['word']}**"):
-                                        col_syn, col_ant = st.columns(2)
-                                        with col_syn:
-                                            st.write("**Synonyms:**")
-                                            if analysis['synonyms']:
-                                                for syn in analysis['synonyms']:
-                                                    st.write(f"• {syn}")
-                                            else:
-                                                st.write("No synonyms found")
-                                        
-                                        with col_ant:
-                                            st.write("**Antonyms:**")
-                                            if analysis['antonyms']:
-                                                for ant in analysis['antonyms']:
-                                                    st.write(f"• {ant}")
-                                            else:
-                                                st.write("No antonyms found")
-                        else:
-                            st.warning("No content available for this article")
-                    
-                    with col2:
-                        # Entities
-                        if entities:
-                            st.markdown("### 👤 Named Entities")
-                            entity_df = pd.DataFrame(entities, columns=['Entity', 'Type'])
-                            st.dataframe(entity_df)
-                        
-                        # Topics
-                        if extract_topics and clean_content:
-                            st.markdown("### 📊 Topics")
-                            
-                            # Category
-                            category = extractor.categorize_article(clean_content)
-                            st.metric("Category", category.capitalize())
-                            
-                            # Key phrases
-                            phrases = extractor.extract_key_phrases(clean_content)
-                            if phrases:
-                                st.write("**Key Phrases:**")
-                                for phrase in phrases:
-                                    st.write(f"• {phrase}")
-                        
-                        # Article URL
-                        if article.get('url'):
-                            st.markdown("### 🔗 Full Article")
-                            st.markdown(f"[Read More]({article['url']})")
-                    
-                    st.markdown("---")
-                
-                # Overall topic analysis (if multiple articles)
-                if extract_topics and len(articles) > 1:
-                    st.markdown("## 🎯 Overall Topic Analysis")
-                    all_content = [a.get('content', '') or a.get('description', '') 
-                                  for a in articles if a.get('content') or a.get('description')]
-                    
-                    if len(all_content) >= 2:
-                        topics = extractor.extract_topics_lda(all_content, n_topics=3)
-                        
-                        if topics:
-                            topic_cols = st.columns(len(topics))
-                            for idx, (topic, col) in enumerate(zip(topics, topic_cols)):
-                                with col:
-                                    st.markdown(f"**Topic {idx + 1}**")
-                                    for word in topic['words']:
-                                        st.write(f"• {word}")
+                # Cluster articles into stories (or only syndicated copies); analyze
+                # one article per cluster
+                if story_view:
+                    _, clusters = StoryClusterer(Config.STORY_SIMILARITY_THRESHOLD).cluster(articles)
+                else:
+                    _, clusters = ArticleDeduplicator().deduplicate(articles)
+                st.session_state['stories'] = list(clusters.values())
+                st.session_state['articles'] = articles
+                st.session_state['news_origin'] = news_data.get('source')
+                st.session_state['page'] = 0
             else:
                 st.error("No articles found or API error occurred")
+    
+    stories = st.session_state.get('stories')
+    if not stories:
+        return
+    articles = st.session_state['articles']
+    if st.session_state.get('news_origin') == 'local':
+        st.caption(f"Answered from the local index ({len(search_index)} articles)")
+    
+    pages = -(-len(stories) // Config.ARTICLES_PER_PAGE)
+    page = min(st.session_state.get('page', 0), pages - 1)
+    first = page * Config.ARTICLES_PER_PAGE
+    page_stories = stories[first:first + Config.ARTICLES_PER_PAGE]
+    settings = {
+        'summary_method': summary_method,
+        'summary_length': summary_length,
+        'num_keywords': num_keywords
+    }
+    
+    # Only this page's stories are analyzed, in the background; each one is
+    # rendered into its slot as soon as its analysis finishes
+    slots = []
+    for offset in range(len(page_stories)):
+        slot = st.empty()
+        slot.info(f"Analyzing article {first + offset + 1}...")
+        slots.append(slot)
+    
+    context = get_script_run_ctx()
+    futures = {
+        executor.submit(carry_context(_with_context), context, analyze_story, members,
+                        settings, full_text, story_view): offset
+        for offset, members in enumerate(page_stories)
+    }
+    counted = []
+    for future in as_completed(futures):
+        offset = futures[future]
+        members = page_stories[offset]
+        with slots[offset].container():
+            try:
+                result = future.result()
+            except Exception as e:
+                st.error(f"Analysis of article {first + offset + 1} failed: {e}")
+                continue
+            render_story(first + offset, members, result, summary_length, summary_method,
+                         show_synonyms, extract_topics)
+        
+        # Feed the trending tracker; articles already counted (by URL) are skipped
+        article = members[0]
+        counted.append(trending.add(
+            article_phrases(result['analysis']['entities'], result['analysis']['key_phrases']),
+            parse_published_at(article.get('publishedAt')) or None,
+            key=article.get('url') or None
+        ))
+    if any(counted):
+        trending.save(Config.TRENDING_PATH)
+    
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    col_prev.button("◀ Previous", on_click=_turn_page, args=(page - 1,), disabled=page == 0)
+    col_page.caption(f"Page {page + 1} of {pages} ({len(stories)} stories, "
+                     f"{len(articles)} articles)")
+    col_next.button("Next ▶", on_click=_turn_page, args=(page + 1,), disabled=page >= pages - 1)
+    
+    # Overall topic analysis (if multiple articles)
+    if extract_topics and len(articles) > 1:
+        all_content = [a.get('content', '') or a.get('description', '')
+                      for a in articles if a.get('content') or a.get('description')]
+        
+        if len(all_content) >= 2:
+            st.markdown("## 🎯 Overall Topic Analysis")
+            topics = topics_cached(content_hash('\n'.join(all_content)), all_content)
+            
+            if topics:
+                topic_cols = st.columns(len(topics))
+                for idx, (topic, col) in enumerate(zip(topics, topic_cols)):
+                    with col:
+                        st.markdown(f"**Topic {idx + 1}**")
+                        for word in topic['words']:
+                            st.write(f"• {word}")
+
+def _turn_page(page):
+    st.session_state['page'] = page
+
+def _with_context(context, function, *args):
+    """Run function on an executor thread attached to the calling script run"""
+    add_script_run_ctx(threading.current_thread(), context)
+    return function(*args)
+
+def analyze_story(members, settings, full_text, story_view):
+    """
+    Background task: analysis of a story's first article (and the summary of
+    the whole story when it has several), through the per-article caches
+    """
+    (_, _, models, _, _, _, _, body_fetcher, _) = init_components()
+    article = members[0]
+    content = ((body_fetcher.fetch(article.get('url', '')) if full_text else None)
+               or article['description'] or article['content'] or "")
+    language = models.language_of(article)
+    result = {
+        'content': content,
+        'language': language,
+        'analysis': analyze_cached(content_hash(content), language, settings, content),
+        'story_summary': None
+    }
+    if story_view and len(members) > 1:
+        texts = [a.get('description') or a.get('content') or "" for a in members]
+        result['story_summary'] = summarize_story_cached(
+            content_hash('\n'.join(texts)), language,
+            settings['summary_length'], settings['summary_method'], texts
+        )
+    return result
+
+def render_story(idx, members, result, summary_length, summary_method,
+                 show_synonyms, extract_topics):
+    article = members[0]
+    st.markdown(f"## Article {idx + 1}")
+    
+    # Original content and its (possibly cached) analysis
+    content = result['content']
+    analysis_result = result['analysis']
+    clean_content = analysis_result['clean_content']
+    important_words = analysis_result['keywords']
+    entities = analysis_result['entities']
+    
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        st.subheader(article['title'])
+        st.caption(f"Source: {article['source']['name']} | Published: {article['publishedAt'][:10]}")
+        duplicates = members[1:]
+        if duplicates:
+            st.caption("Also reported by: " + ", ".join(
+                f"[{a['source']['name']}]({a['url']})" for a in duplicates
+            ))
+        
+        if content:
+            with st.expander("📄 Original Content"):
+                st.write(content)
+            
+            # Summary: of the whole story when several articles cover it
+            if result['story_summary'] is not None:
+                st.markdown(f"### 📝 Story Summary ({len(members)} articles)")
+                st.info(result['story_summary'])
+            else:
+                st.markdown("### 📝 Summary")
+                st.info(analysis_result['summary'])
+            
+            # Display keywords
+            st.markdown("### 🔑 Key Words")
+            keywords_df = pd.DataFrame(important_words)
+            if not keywords_df.empty:
+                st.dataframe(keywords_df)
+            
+            # Synonyms and Antonyms (WordNet is English only)
+            if show_synonyms and important_words and result['language'] == 'en':
+                st.markdown("### 📚 Synonyms & Antonyms")
+                word_list = tuple(w['word'] for w in important_words[:5])
+                linguistic_analysis = synonyms_cached(word_list)
+                
+                for analysis in linguistic_analysis:
+                    with st.expander(f"Word: **{analysis['word']}**"):
+                        col_syn, col_ant = st.columns(2)
+                        with col_syn:
+                            st.write("**Synonyms:**")
+                            if analysis['synonyms']:
+                                for syn in analysis['synonyms']:
+                                    st.write(f"• {syn}")
+                            else:
+                                st.write("No synonyms found")
+                        
+                        with col_ant:
+                            st.write("**Antonyms:**")
+                            if analysis['antonyms']:
+                                for ant in analysis['antonyms']:
+                                    st.write(f"• {ant}")
+                            else:
+                                st.write("No antonyms found")
+        else:
+            st.warning("No content available for this article")
+    
+    with col2:
+        # Entities
+        if entities:
+            st.markdown("### 👤 Named Entities")
+            entity_df = pd.DataFrame(entities, columns=['Entity', 'Type'])
+            st.dataframe(entity_df)
+        
+        # Topics
+        if extract_topics and clean_content:
+            st.markdown("### 📊 Topics")
+            
+            # Category
+            st.metric("Category", analysis_result['category'].capitalize())
+            
+            # Key phrases
+            phrases = analysis_result['key_phrases']
+            if phrases:
+                st.write("**Key Phrases:**")
+                for phrase in phrases:
+                    st.write(f"• {phrase}")
+        
+        # Article URL
+        if article.get('url'):
+            st.markdown("### 🔗 Full Article")
+            st.markdown(f"[Read More]({article['url']})")
+    
+    st.markdown("---")
+
+def trending_panel(trending):
+    """Sidebar: entities and phrases trending across every article analyzed so far"""
+    with st.expander("🔥 Trending"):
+        hours = st.selectbox("Last", [1, 6, 24, 72], index=2, format_func=lambda h: f"{h} hours")
+        rows = trending.trending(hours=hours, top_n=10)
+        if rows:
+            st.dataframe(pd.DataFrame([
+                {'phrase': row['phrase'], 'articles': int(row['count']),
+                 'growth': f"{row['growth']:.1f}x" if row['growth'] is not None else ''}
+                for row in rows
+            ]).set_index('phrase'))
+        else:
+            st.caption("Nothing yet: trends build up as articles are analyzed")
+        st.caption(f"{trending.articles} articles tracked")
+
+def performance_panel():
+    """Sidebar metrics: per-operation latency, cache hit counts, exports and profiling"""
+    with st.expander("⏱️ Performance"):
+        # Per session: the script run and its background tasks read it via metrics.session()
+        st.checkbox("Collect metrics (this session)", Config.METRICS_ENABLED, key="collect_metrics")
+        st.checkbox(
+            "Profile each run (cProfile + tracemalloc)", False, key="profile_run",
+            help="Adds noticeable overhead; the report appears at the bottom of the sidebar"
+        )
+        
+        rows = metrics.summary_rows()
+        if rows:
+            st.dataframe(pd.DataFrame(rows).set_index('operation'))
+        else:
+            st.caption("No calls recorded yet")
+        
+        for cache, results in metrics.snapshot()['caches'].items():
+            st.caption(f"{cache} cache: " + ", ".join(f"{k} {v}" for k, v in sorted(results.items())))
+        
+        col_prom, col_json = st.columns(2)
+        col_prom.download_button("Prometheus", metrics.to_prometheus(),
+                                 file_name="metrics.prom", mime="text/plain")
+        col_json.download_button("JSON", json.dumps(metrics.snapshot(), indent=2),
+                                 file_name="metrics.json", mime="application/json")
+        if st.button("Reset metrics"):
+            metrics.reset()
+
+def run():
+    if st.session_state.get("profile_run"):
+        with profile_request() as profile:
+            main()
+        with st.sidebar.expander("🔬 Profile of this run", expanded=True):
+            st.code(profile.report(limit=30))
+    else:
+        main()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    with metrics.session(st.session_state.get("collect_metrics", Config.METRICS_ENABLED)):
+        run()
\ No newline at end of file
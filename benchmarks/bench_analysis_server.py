@@ -0,0 +1,130 @@
+"""
+Load generator for the analysis server: throughput and p50/p99 latency of
+POST /analyze as client concurrency grows, for a single unbatched worker
+versus forked workers with micro-batching.
+
+    python -m benchmarks.bench_analysis_server --workers 4 --max-batch 32 --concurrency 1 4 16 64
+    python -m benchmarks.bench_analysis_server --url http://127.0.0.1:8600   # an already running server
+"""
+import argparse
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+from benchmarks.corpus import news_corpus
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, max_batch: int, max_wait: float, model: str):
+    port = free_port()
+    process = subprocess.Popen([
+        sys.executable, '-m', 'src.analysis_server', '--port', str(port),
+        '--workers', str(workers), '--max-batch', str(max_batch),
+        '--max-wait', str(max_wait), '--spacy-model', model, '--no-synonyms',
+    ])
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server exited with status {process.returncode}")
+        try:
+            requests.get(f"{url}/health", timeout=1)
+            return process, url
+        except requests.exceptions.ConnectionError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("server did not start within 120s")
+
+
+def load(url: str, texts, concurrency: int, total: int, method: str):
+    latencies, errors = [], []
+    lock = threading.Lock()
+    counter = iter(range(total))
+
+    def client():
+        with requests.Session() as session:
+            while True:
+                with lock:
+                    i = next(counter, None)
+                if i is None:
+                    return
+                start = time.perf_counter()
+                try:
+                    response = session.post(f"{url}/analyze", timeout=120, json={
+                        'text': texts[i % len(texts)], 'summary_method': method,
+                    })
+                    response.raise_for_status()
+                except requests.exceptions.RequestException as e:
+                    errors.append(e)
+                    continue
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors, time.perf_counter() - start
+
+
+def report(url: str, texts, levels, requests_per_level: int, method: str):
+    load(url, texts, 4, 8, method)  # warm-up
+    for concurrency in levels:
+        latencies, errors, elapsed = load(url, texts, concurrency,
+                                          max(requests_per_level, concurrency), method)
+        if not latencies:
+            print(f"  c={concurrency:<4} all {len(errors)} requests failed: {errors[0]}")
+            continue
+        cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        print(f"  c={concurrency:<4} {len(latencies) / elapsed:8.1f} req/s  "
+              f"p50 {cuts[49] * 1000:8.1f} ms  p99 {cuts[98] * 1000:8.1f} ms"
+              + (f"  ({len(errors)} errors)" if errors else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help="benchmark this server instead of starting one")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--max-batch', type=int, default=32)
+    parser.add_argument('--max-wait', type=float, default=0.005)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--requests', type=int, default=200, help="requests per concurrency level")
+    parser.add_argument('--summary-method', default='fast_textrank')
+    parser.add_argument('--spacy-model', default="en_core_web_sm")
+    args = parser.parse_args()
+
+    texts = [article['content'] for article in news_corpus(500)]
+
+    if args.url:
+        print(f"{args.url}")
+        report(args.url, texts, args.concurrency, args.requests, args.summary_method)
+        return
+
+    for label, workers, max_batch in (
+        ("1 worker, no batching", 1, 1),
+        (f"{args.workers} workers, batches of up to {args.max_batch}", args.workers, args.max_batch),
+    ):
+        process, url = start_server(workers, max_batch, args.max_wait, args.spacy_model)
+        try:
+            print(label)
+            report(url, texts, args.concurrency, args.requests, args.summary_method)
+        finally:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Full-article retrieval against local static servers (one per simulated host):
+a sequential requests.get + regex strip loop versus ArticleBodyFetcher, then
+a re-run served from the body cache and one revalidated with ETags.
+
+    python -m benchmarks.bench_article_body --hosts 4 --pages 40 --latency 0.05
+"""
+import argparse
+import hashlib
+import re
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import requests
+
+from src.article_body import ArticleBodyFetcher, BodyCache
+
+PARAGRAPH = ("The council approved the new transit plan on Tuesday after months of debate, "
+             "with officials saying construction could begin early next year. ")
+
+
+def make_page(index: int, huge: bool = False) -> bytes:
+    paragraphs = ''.join(f"<p>{PARAGRAPH * 2}({index}.{i})</p>\n" for i in range(12))
+    filler = "<script>var tracking = '" + "x" * 5_000_000 + "';</script>" if huge else ""
+    return (f"<html><head><title>Story {index}</title><style>p {{ margin: 0 }}</style></head><body>"
+            f"<nav><ul><li>Home</li><li>World</li></ul></nav>{filler}"
+            f"<article><h1>Story {index}</h1>{paragraphs}</article>"
+            f"<footer><p>Copyright Example News, all rights reserved.</p></footer></body></html>").encode()
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        index = int(self.path.rstrip('/').rsplit('/', 1)[-1])
+        body = make_page(index, huge=index % 10 == 9)
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        time.sleep(self.server.latency)
+        with self.server.lock:
+            self.server.requests += 1
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client stopped reading at its byte cap
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PageServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        pass  # resets from clients abandoning capped downloads are expected
+
+
+def start_servers(count: int, latency: float):
+    servers = []
+    for _ in range(count):
+        httpd = PageServer(('127.0.0.1', 0), PageHandler)
+        httpd.latency, httpd.requests, httpd.lock = latency, 0, threading.Lock()
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        servers.append(httpd)
+    return servers
+
+
+def sequential(urls):
+    bodies = {}
+    for url in urls:
+        html = requests.get(url, timeout=30).text
+        bodies[url] = ' '.join(re.sub(r'<.*?>', '', html).split())
+    return bodies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--hosts', type=int, default=4)
+    parser.add_argument('--pages', type=int, default=40, help="pages per host")
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--per-host', type=int, default=4)
+    args = parser.parse_args()
+
+    servers = start_servers(args.hosts, args.latency)
+    urls = [f"http://127.0.0.1:{server.server_address[1]}/article/{i}"
+            for i in range(args.pages) for server in servers]
+    print(f"{len(urls)} pages on {args.hosts} hosts, every 10th page padded with 5 MB of script")
+
+    start = time.perf_counter()
+    sequential(urls)
+    print(f"  sequential + regex strip   {time.perf_counter() - start:7.2f}s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = BodyCache(f"{directory}/bodies.sqlite3")
+        fetcher = ArticleBodyFetcher(max_workers=16, per_host=args.per_host,
+                                     max_bytes=1_000_000, cache=cache)
+        start = time.perf_counter()
+        bodies = dict(fetcher.fetch_many(urls))
+        elapsed = time.perf_counter() - start
+        sample = next(iter(bodies.values()))
+        print(f"  ArticleBodyFetcher         {elapsed:7.2f}s  ({len(sample)} chars/body, stats {fetcher.stats})")
+
+        start = time.perf_counter()
+        dict(fetcher.fetch_many(urls))
+        print(f"  cached                     {time.perf_counter() - start:7.2f}s")
+
+        cache.ttl = 0
+        start = time.perf_counter()
+        dict(fetcher.fetch_many(urls))
+        print(f"  revalidated (304s)         {time.perf_counter() - start:7.2f}s  (stats {fetcher.stats})")
+        fetcher.close()
+
+    for server in servers:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Memory and throughput of the article representations at bulk-ingest sizes:
+NewsFetcher's NewsAPI-like dicts, a list of Article records, and ArticleBatch.
+
+    python -m benchmarks.bench_articles --articles 100000
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks.mock_gnews import make_articles
+from src.articles import Article, ArticleBatch
+from src.news_fetcher import NewsFetcher
+
+SOURCES = ['Reuters', 'AP', 'BBC News', 'The Hindu', 'Bloomberg', 'CNN']
+
+
+def gnews_payload(n: int) -> bytes:
+    articles = make_articles(n, 'markets')
+    for i, article in enumerate(articles):
+        article['source'] = {'name': SOURCES[i % len(SOURCES)], 'url': f"https://{i % len(SOURCES)}.example.com"}
+        article['publishedAt'] = f"2024-01-{1 + i % 28:02d}T{i % 24:02d}:00:00Z"
+    return json.dumps({'totalArticles': n, 'articles': articles}).encode()
+
+
+def measure(build):
+    """(result, seconds, bytes retained) of build(), json parsing included"""
+    gc.collect()
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+
+    # Timed and traced separately: tracemalloc slows allocation-heavy code down
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, elapsed, retained
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=100000)
+    args = parser.parse_args()
+
+    payload = gnews_payload(args.articles)
+    fetcher = NewsFetcher(api_key='')
+    start, end = datetime(2024, 1, 10, tzinfo=timezone.utc), datetime(2024, 1, 20, tzinfo=timezone.utc)
+    # ArticleBatch imports pandas on first use; keep that out of the timings
+    ArticleBatch.from_gnews([])
+
+    builders = {
+        'dicts': lambda: fetcher._convert_gnews_articles(json.loads(payload)['articles']),
+        'Article': lambda: [Article.from_gnews(a) for a in json.loads(payload)['articles']],
+        'ArticleBatch': lambda: ArticleBatch.from_json(payload),
+    }
+    queries = {
+        'dicts': lambda articles: [
+            a for a in articles
+            if a['source']['name'] == 'BBC News'
+            and start.isoformat().replace('+00:00', 'Z') <= a['publishedAt'] < end.isoformat().replace('+00:00', 'Z')
+        ],
+        'Article': lambda articles: [
+            a for a in articles
+            if a.source_name == 'BBC News' and a.published_at and start <= a.published_at < end
+        ],
+        'ArticleBatch': lambda batch: batch.from_source('BBC News').published_between(start, end),
+    }
+
+    print(f"{args.articles} articles ({len(payload) / 1e6:.1f} MB of JSON)")
+    print(f"  {'':<13}{'build':>10}{'memory':>12}{'query':>10}{'slice':>10}")
+    for name, build in builders.items():
+        articles, elapsed, retained = measure(build)
+
+        query_start = time.perf_counter()
+        matches = queries[name](articles)
+        query = time.perf_counter() - query_start
+
+        slice_start = time.perf_counter()
+        for offset in range(0, len(articles), 1000):
+            articles[offset:offset + 1000]
+        sliced = time.perf_counter() - slice_start
+
+        print(f"  {name:<13}{elapsed * 1000:8.0f}ms{retained / 1e6:10.1f}MB"
+              f"{query * 1000:8.1f}ms{sliced * 1000:8.1f}ms  ({len(matches)} matches)")
+        del articles, matches
+    fetcher.close()
+
+
+if __name__ == '__main__':
+    main()
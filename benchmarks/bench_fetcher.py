@@ -0,0 +1,73 @@
+"""
+Compare the sequential fetch loop against NewsFetcher.fetch_many / fetch_many_async
+using a local stand-in GNews server.
+
+    python -m benchmarks.bench_fetcher --latency 0.05 --workers 8
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.mock_gnews import MockGNewsServer
+from src.news_fetcher import NewsFetcher
+
+CATEGORIES = ["general", "world", "nation", "business", "technology",
+              "entertainment", "sports", "science", "health"]
+COUNTRIES = ["us", "gb", "ca", "au", "in"]
+
+
+def build_specs():
+    return [{'type': 'top_headlines', 'country': country, 'category': category}
+            for country in COUNTRIES for category in CATEGORIES]
+
+
+def run_sequential(fetcher, specs):
+    results = []
+    for spec in specs:
+        results.append(fetcher.get_top_headlines(country=spec['country'],
+                                                 category=spec['category']))
+    return results
+
+
+def run_concurrent(fetcher, specs, workers):
+    return [result for _, result in fetcher.fetch_many(specs, max_workers=workers)]
+
+
+def run_async(fetcher, specs, workers):
+    async def collect():
+        return [result async for _, result in
+                fetcher.fetch_many_async(specs, max_concurrency=workers)]
+    return asyncio.run(collect())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help="simulated server latency per request (seconds)")
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    specs = build_specs()
+    with MockGNewsServer(latency=args.latency) as server:
+        fetcher = NewsFetcher("test-key", base_url=server.url, max_workers=args.workers)
+        timings = {}
+        for name, run in [
+            ('sequential', lambda: run_sequential(fetcher, specs)),
+            ('fetch_many', lambda: run_concurrent(fetcher, specs, args.workers)),
+            ('fetch_many_async', lambda: run_async(fetcher, specs, args.workers)),
+        ]:
+            start = time.perf_counter()
+            results = run()
+            timings[name] = time.perf_counter() - start
+            assert len(results) == len(specs)
+            assert all(r['status'] == 'ok' for r in results), name
+        fetcher.close()
+
+    print(f"{len(specs)} requests, {args.latency * 1000:.0f} ms simulated latency")
+    for name, elapsed in timings.items():
+        speedup = timings['sequential'] / elapsed
+        print(f"  {name:<18} {elapsed:7.3f}s  speedup x{speedup:.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Pagination, rate limiting, retries and quota handling of NewsFetcher against
+the mock GNews server.
+
+    python -m benchmarks.bench_rate_limit --articles 100 --server-rate 5
+"""
+import argparse
+import time
+
+from benchmarks.mock_gnews import MockGNewsServer
+from src.news_fetcher import NewsFetcher
+from src.rate_limiter import RetryPolicy, TokenBucket
+
+
+def fetch(server, articles, **fetcher_kwargs):
+    fetcher = NewsFetcher(api_key='bench', base_url=server.url, **fetcher_kwargs)
+    start = time.perf_counter()
+    result = fetcher.get_top_headlines(country='us', page_size=articles)
+    elapsed = time.perf_counter() - start
+    fetcher.close()
+    return result, elapsed
+
+
+def report(label, server, result, elapsed):
+    note = f", partial: {result['message']}" if result.get('partial') else ''
+    if result['status'] != 'ok':
+        note = f", error: {result['message']}"
+    print(f"  {label:<34}{elapsed:7.2f}s  {len(result['articles']):4d} articles  "
+          f"{server.request_count:3d} requests  {server.throttled_count:3d} throttled{note}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--articles', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--server-rate', type=float, default=5.0,
+                        help="requests/second the mock server allows before answering 429")
+    args = parser.parse_args()
+    total = args.articles * 10
+    retry = RetryPolicy(max_retries=6, base_delay=0.2, seed=1)
+
+    print(f"{args.articles} articles in pages of 10")
+    for workers in (1, 8):
+        with MockGNewsServer(args.latency, total_articles=total) as server:
+            result, elapsed = fetch(server, args.articles, max_workers=workers)
+            report(f"pages, {workers} worker(s)", server, result, elapsed)
+
+    with MockGNewsServer(args.latency, total_articles=total,
+                         rate_limit=args.server_rate, retry_after=1) as server:
+        result, elapsed = fetch(server, args.articles, retry_policy=retry)
+        report("server limit, retry only", server, result, elapsed)
+
+    with MockGNewsServer(args.latency, total_articles=total,
+                         rate_limit=args.server_rate, retry_after=1) as server:
+        result, elapsed = fetch(server, args.articles, retry_policy=retry,
+                                rate_limiter=TokenBucket(args.server_rate * 0.9, capacity=1))
+        report("server limit, client token bucket", server, result, elapsed)
+
+    with MockGNewsServer(args.latency, total_articles=total, server_errors=2) as server:
+        result, elapsed = fetch(server, args.articles, retry_policy=retry)
+        report("two 503s, then healthy", server, result, elapsed)
+
+    with MockGNewsServer(args.latency, total_articles=total, daily_quota=4) as server:
+        result, elapsed = fetch(server, args.articles, max_workers=2, retry_policy=retry)
+        report("daily quota of 4 requests", server, result, elapsed)
+
+    # Quota runs out while later pages are queued: they are cancelled, not raised
+    with MockGNewsServer(args.latency, total_articles=100000, daily_quota=4) as server:
+        result, elapsed = fetch(server, 100000, max_workers=2, retry_policy=retry)
+        report("quota of 4, pages still queued", server, result, elapsed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Cold-start cost per component, each measured in a fresh interpreter:
+module import, construction, and the first request (which now pays for
+lazy imports and model loads).
+
+    python -m benchmarks.bench_startup
+"""
+import json
+import subprocess
+import sys
+
+TEXT = ("The government announced a new policy on trade on Monday. "
+        "Officials said the plan would cut tariffs and support exporters. "
+        "Critics warned that the change could hurt domestic manufacturers.")
+
+COMPONENTS = {
+    'NewsFetcher': ('src.news_fetcher', 'NewsFetcher("key")', 'None'),
+    'TextProcessor': ('src.text_processor', 'TextProcessor()',
+                      'obj.extract_important_words(TEXT)'),
+    'NewsSummarizer': ('src.summarizer', 'NewsSummarizer()',
+                       'obj.summarize_text(TEXT, 2)'),
+    'LinguisticAnalyzer': ('src.linguistic_analyzer', 'LinguisticAnalyzer()',
+                           'obj.analyze_words(["policy", "trade"])'),
+    'TopicExtractor': ('src.topic_extractor', 'TopicExtractor()',
+                       'obj.extract_topics_lda([TEXT, TEXT.upper()], n_topics=2)'),
+}
+
+PROBE = """
+import json, time
+TEXT = {text!r}
+t0 = time.perf_counter()
+from {module} import *
+t1 = time.perf_counter()
+obj = {construct}
+t2 = time.perf_counter()
+{first_call}
+t3 = time.perf_counter()
+print(json.dumps({{'import': t1 - t0, 'construct': t2 - t1, 'first_request': t3 - t2}}))
+"""
+
+
+def measure(module: str, construct: str, first_call: str) -> dict:
+    code = PROBE.format(text=TEXT, module=module, construct=construct, first_call=first_call)
+    result = subprocess.run([sys.executable, '-c', code],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        return {'error': next((line for line in reversed(lines) if 'Error' in line), lines[-1])}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    print(f"{'component':<20}{'import':>10}{'construct':>12}{'first req':>12}")
+    for name, (module, construct, first_call) in COMPONENTS.items():
+        timings = measure(module, construct, first_call)
+        if 'error' in timings:
+            print(f"{name:<20}  error: {timings['error']}")
+            continue
+        print(f"{name:<20}{timings['import'] * 1000:>9.1f}ms"
+              f"{timings['construct'] * 1000:>11.1f}ms"
+              f"{timings['first_request'] * 1000:>11.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Per-document latency of the sumy textrank/lexrank methods versus the
+vectorized fast_textrank/fast_lexrank engine, plus an output agreement check
+on a fixed synthetic corpus.
+
+    python -m benchmarks.bench_summarizer --docs 300 --max-sentences 40
+"""
+import argparse
+import random
+import time
+
+from src.summarizer import NewsSummarizer
+
+WORDS = ("market bank policy trade vote election player team score virus vaccine "
+         "hospital research study court law tax oil price growth government company "
+         "the a of and to in that is was for on").split()
+
+
+def synthetic_corpus(n: int, max_sentences: int, seed: int = 1):
+    rng = random.Random(seed)
+
+    def sentence():
+        return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(4, 15))).capitalize() + '.'
+
+    return [' '.join(sentence() for _ in range(rng.randint(2, max_sentences)))
+            for _ in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=300)
+    parser.add_argument('--max-sentences', type=int, default=40)
+    parser.add_argument('--sentences', type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = synthetic_corpus(args.docs, args.max_sentences)
+    summarizer = NewsSummarizer().warm_up()
+
+    for method in ('textrank', 'lexrank'):
+        start = time.perf_counter()
+        reference = [summarizer.summarize_text(doc, args.sentences, method) for doc in corpus]
+        sumy_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fast = summarizer.summarize_many(corpus, args.sentences, f"fast_{method}")
+        fast_elapsed = time.perf_counter() - start
+
+        matches = sum(a == b for a, b in zip(reference, fast))
+        print(f"{method:<9} sumy {sumy_elapsed / len(corpus) * 1000:6.2f} ms/doc   "
+              f"fast {fast_elapsed / len(corpus) * 1000:6.2f} ms/doc   "
+              f"x{sumy_elapsed / fast_elapsed:.1f}   identical {matches}/{len(corpus)}")
+
+
+if __name__ == '__main__':
+    main()
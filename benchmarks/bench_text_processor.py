@@ -0,0 +1,57 @@
+"""
+Docs/sec of TextProcessor.extract_important_words (one nlp() call per text,
+full pipeline) versus extract_important_words_batch (nlp.pipe, trimmed pipeline).
+
+    python -m benchmarks.bench_text_processor --docs 2000 --batch-size 64 --n-process 2
+"""
+import argparse
+import random
+import time
+
+from src.text_processor import TextProcessor
+
+SUBJECTS = ["The government", "Apple", "The central bank", "Researchers at MIT",
+            "Manchester United", "The World Health Organization", "Tesla", "Voters in Ohio"]
+VERBS = ["announced", "reported", "rejected", "launched", "investigated", "approved"]
+OBJECTS = ["a new policy on trade", "record quarterly earnings", "a vaccine trial",
+           "plans for a stadium", "an electric truck", "interest rate cuts"]
+
+
+def synthetic_texts(n: int, sentences: int = 4, seed: int = 42):
+    rng = random.Random(seed)
+    return [
+        ' '.join(f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)} on Monday."
+                 for _ in range(sentences))
+        for _ in range(n)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--docs', type=int, default=1000)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--n-process', type=int, default=1)
+    args = parser.parse_args()
+
+    processor = TextProcessor()
+    texts = synthetic_texts(args.docs)
+
+    start = time.perf_counter()
+    single = [processor.extract_important_words(text) for text in texts]
+    per_call = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = processor.extract_important_words_batch(
+        texts, batch_size=args.batch_size, n_process=args.n_process
+    )
+    batched = time.perf_counter() - start
+
+    assert len(batch) == len(single)
+    print(f"{args.docs} docs")
+    print(f"  per-call  {args.docs / per_call:8.1f} docs/sec")
+    print(f"  batch     {args.docs / batched:8.1f} docs/sec  "
+          f"(batch_size={args.batch_size}, n_process={args.n_process}, x{per_call / batched:.1f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Deterministic synthetic news corpora for the benchmark suite.
+
+Articles are GNews-shaped dicts built from per-category vocabularies, with
+named entities, numbers and varied sentence counts, so every analysis
+component has realistic work to do. The same (n, seed) always yields the
+same corpus.
+
+    python -m benchmarks.corpus --articles 1000 --output corpus-1000.jsonl
+"""
+import argparse
+import json
+import random
+from typing import Dict, List
+
+CATEGORIES = {
+    'business': ("market shares investors earnings revenue profit bank rates inflation "
+                 "economy merger acquisition quarter growth stocks bonds currency trade").split(),
+    'technology': ("software chip startup smartphone cloud data security privacy users "
+                   "platform network device launch update artificial intelligence model").split(),
+    'sports': ("match team player coach season league goal score tournament final "
+               "championship injury transfer fans stadium victory defeat").split(),
+    'health': ("hospital patients doctors vaccine virus treatment disease study trial "
+               "health care clinic drug symptoms outbreak researchers").split(),
+    'politics': ("government minister election vote parliament policy law court president "
+                 "party campaign reform opposition senate bill budget").split(),
+    'science': ("scientists research space climate species discovery telescope planet "
+                "experiment energy ocean carbon laboratory data physics").split(),
+}
+PEOPLE = ["Maria Lopez", "James Chen", "Aisha Khan", "Peter Novak", "Sofia Rossi",
+          "Daniel Okafor", "Emma Schmidt", "Ravi Patel", "Lucas Martin", "Hannah Berg"]
+ORGANIZATIONS = ["Global Finance Group", "Northwind Labs", "United Health Council",
+                 "Orion Motors", "Pacific Energy", "Atlas Sports Club", "European Space Agency",
+                 "National Research Institute", "Summit Bank", "Vertex Systems"]
+PLACES = ["London", "New York", "Mumbai", "Berlin", "Tokyo", "Nairobi", "Sydney",
+          "Toronto", "Paris", "Singapore"]
+VERBS = ["announced", "reported", "rejected", "launched", "investigated", "approved",
+         "warned about", "expanded", "delayed", "confirmed"]
+CONNECTORS = ["the", "a", "new", "major", "its", "several", "recent", "planned"]
+SOURCES = ["Reuters", "AP", "BBC News", "The Hindu", "Bloomberg", "CNN", "Al Jazeera"]
+
+
+def _sentence(rng: random.Random, vocabulary: List[str]) -> str:
+    subject = rng.choice(PEOPLE + ORGANIZATIONS)
+    words = [rng.choice(vocabulary) for _ in range(rng.randint(3, 9))]
+    extra = ""
+    if rng.random() < 0.4:
+        extra = f" in {rng.choice(PLACES)}"
+    if rng.random() < 0.3:
+        extra += f", citing {rng.randint(2, 98)} percent {rng.choice(vocabulary)}"
+    return f"{subject} {rng.choice(VERBS)} {rng.choice(CONNECTORS)} {' '.join(words)}{extra}."
+
+
+def make_article(index: int, rng: random.Random,
+                 min_sentences: int = 3, max_sentences: int = 25) -> Dict:
+    category = rng.choice(list(CATEGORIES))
+    vocabulary = CATEGORIES[category]
+    sentences = [_sentence(rng, vocabulary) for _ in range(rng.randint(min_sentences, max_sentences))]
+    source = rng.choice(SOURCES)
+    return {
+        'title': sentences[0].rstrip('.'),
+        'description': ' '.join(sentences[:2]),
+        'content': ' '.join(sentences),
+        'url': f"https://{source.lower().replace(' ', '')}.example.com/{category}/{index}",
+        'image': '',
+        'publishedAt': f"2024-{1 + index % 12:02d}-{1 + index % 28:02d}T{index % 24:02d}:00:00Z",
+        'source': {'name': source, 'url': f"https://{source.lower().replace(' ', '')}.example.com"},
+        'category': category,
+    }
+
+
+def news_corpus(n: int, seed: int = 42, min_sentences: int = 3,
+                max_sentences: int = 25) -> List[Dict]:
+    """n synthetic articles; deterministic for a given (n, seed)"""
+    rng = random.Random(seed)
+    return [make_article(i, rng, min_sentences, max_sentences) for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='-')
+    args = parser.parse_args()
+
+    lines = (json.dumps(article) for article in news_corpus(args.articles, args.seed))
+    if args.output == '-':
+        for line in lines:
+            print(line)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.writelines(line + '\n' for line in lines)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Local stand-in for the GNews API used by the benchmarks"""
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from typing import Dict, List, Optional
+
+from src.rate_limiter import TokenBucket
+
+
+def make_articles(n: int, tag: str = "", start: int = 0) -> List[Dict]:
+    """Build n GNews-shaped article dicts, numbered from start"""
+    return [{
+        'title': f"Story {i} {tag}".strip(),
+        'description': f"Description of story {i} about {tag or 'the news'}.",
+        'content': f"Full content of story {i}. It covers {tag or 'the news'} in detail.",
+        'url': f"https://example.com/{tag or 'news'}/{i}",
+        'image': '',
+        'publishedAt': f"2024-01-01T{i % 24:02d}:00:00Z",
+        'source': {'name': 'Example', 'url': 'https://example.com'}
+    } for i in range(start, start + n)]
+
+
+class MockGNewsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection pooling is observable
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        server = self.server
+        with server.lock:
+            server.request_count += 1
+            count = server.request_count
+            throttled = server.limiter is not None and not server.limiter.try_acquire()
+            if throttled:
+                server.throttled_count += 1
+        time.sleep(server.latency)
+
+        if server.daily_quota is not None and count > server.daily_quota:
+            return self._send(403, {'errors': ["You have reached your request limit for today"]})
+        if count <= server.server_errors:
+            return self._send(503, {'errors': ["Service unavailable"]})
+        if throttled:
+            return self._send(429, {'errors': ["Too many requests"]},
+                              {'Retry-After': str(server.retry_after)})
+
+        tag = params.get('q') or params.get('category') or params.get('country', '')
+        max_results = int(params.get('max', 10))
+        page = int(params.get('page', 1))
+        total = server.total_articles if server.total_articles is not None else max_results
+        start = (page - 1) * max_results
+        self._send(200, {
+            'totalArticles': total,
+            'articles': make_articles(max(0, min(max_results, total - start)), tag, start)
+        })
+
+    def _send(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockGNewsServer:
+    """
+    Run the mock API on a background thread: with MockGNewsServer() as server: server.url
+
+    total_articles makes results pageable (page/max). rate_limit (requests per
+    second) answers excess requests with 429 + Retry-After, daily_quota answers
+    403 once exceeded, and the first server_errors requests fail with 503.
+    """
+
+    def __init__(self, latency: float = 0.05, port: int = 0,
+                 total_articles: Optional[int] = None,
+                 rate_limit: Optional[float] = None,
+                 retry_after: float = 1,
+                 daily_quota: Optional[int] = None,
+                 server_errors: int = 0):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), MockGNewsHandler)
+        self.httpd.latency = latency
+        self.httpd.request_count = 0
+        self.httpd.throttled_count = 0
+        self.httpd.lock = threading.Lock()
+        self.httpd.total_articles = total_articles
+        self.httpd.limiter = TokenBucket(rate_limit) if rate_limit else None
+        self.httpd.retry_after = retry_after
+        self.httpd.daily_quota = daily_quota
+        self.httpd.server_errors = server_errors
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/api/v4"
+
+    @property
+    def request_count(self) -> int:
+        return self.httpd.request_count
+
+    @property
+    def throttled_count(self) -> int:
+        return self.httpd.throttled_count
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
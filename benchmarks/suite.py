@@ -0,0 +1,318 @@
+"""
+Offline benchmark suite for the analysis components.
+
+Runs every case over synthetic corpora (benchmarks/corpus.py) of increasing
+size and records throughput, latency percentiles and peak traced memory as
+JSON; compare flags regressions of a run against a saved baseline.
+
+    python -m benchmarks.suite run --sizes 100 1000 --output baseline.json
+    # ... upgrade spaCy / sumy / scikit-learn ...
+    python -m benchmarks.suite run --sizes 100 1000 --output current.json
+    python -m benchmarks.suite compare baseline.json current.json --threshold 0.15
+
+Cases whose models or corpora are not installed are recorded as skipped,
+with the error, rather than failing the run. compare exits with status 1
+when any case regressed (or stopped running).
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+from benchmarks.corpus import news_corpus
+
+PACKAGES = ('spacy', 'sumy', 'sklearn', 'nltk', 'numpy', 'scipy', 'pandas')
+TFIDF_GROUP = 10
+LDA_GROUP = 10
+WORDS_PER_CALL = 5
+
+
+class Components:
+    """Analysis components, built on first use and shared by all cases"""
+
+    def __init__(self, model: str):
+        self.model = model
+        self._built = {}
+
+    def get(self, name: str):
+        if name not in self._built:
+            if name == 'processor':
+                from src.text_processor import TextProcessor
+                self._built[name] = TextProcessor(self.model)
+            elif name == 'summarizer':
+                from src.summarizer import NewsSummarizer
+                self._built[name] = NewsSummarizer()
+            elif name == 'analyzer':
+                from config.config import Config
+                from src.linguistic_analyzer import LinguisticAnalyzer
+                self._built[name] = LinguisticAnalyzer(Config.WORDNET_INDEX_PATH)
+            elif name == 'extractor':
+                from src.topic_extractor import TopicExtractor
+                self._built[name] = TopicExtractor()
+        return self._built[name]
+
+
+def _texts(corpus: List[Dict]) -> List[str]:
+    return [article['content'] for article in corpus]
+
+
+def _groups(items: List, size: int) -> List[List]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _content_words(text: str) -> List[str]:
+    words = []
+    for word in text.split():
+        word = word.strip('.,').lower()
+        if word.isalpha() and len(word) > 3 and word not in words:
+            words.append(word)
+        if len(words) == WORDS_PER_CALL:
+            break
+    return words
+
+
+def _summarize(method: str):
+    def case(components: Components, corpus: List[Dict]):
+        summarizer = components.get('summarizer')
+        return (lambda text: summarizer.summarize_text(text, 3, method)), _texts(corpus), 1
+    return case
+
+
+def _pipeline(**settings):
+    def case(components: Components, corpus: List[Dict]):
+        from src.pipeline import NewsPipeline
+
+        def run(articles):
+            with tempfile.TemporaryDirectory() as directory:
+                pipeline_settings = dict(settings, spacy_model=components.model)
+                for name, value in settings.items():
+                    if name.endswith('_path'):  # fresh files per run, so every run starts cold
+                        pipeline_settings[name] = os.path.join(directory, value)
+                items = list(NewsPipeline(pipeline_settings).run(articles))
+            errors = [item['error'] for item in items if 'error' in item]
+            if errors:
+                raise RuntimeError(f"{len(errors)} articles failed, first: {errors[0]}")
+            return items
+        return run, [corpus], len(corpus)
+    return case
+
+
+# name -> case(components, corpus) returning (call, inputs, items per input)
+CASES: Dict[str, Callable[[Components, List[Dict]], Tuple[Callable, List, int]]] = {
+    'clean_text': lambda c, corpus: (c.get('processor').clean_text, _texts(corpus), 1),
+    'extract_important_words': lambda c, corpus: (
+        c.get('processor').extract_important_words, _texts(corpus), 1),
+    'calculate_tfidf': lambda c, corpus: (
+        c.get('processor').calculate_tfidf, _groups(_texts(corpus), TFIDF_GROUP), TFIDF_GROUP),
+    'summarize_textrank': _summarize('textrank'),
+    'summarize_lsa': _summarize('lsa'),
+    'summarize_lexrank': _summarize('lexrank'),
+    'summarize_fast_textrank': _summarize('fast_textrank'),
+    'summarize_fast_lexrank': _summarize('fast_lexrank'),
+    'analyze_words': lambda c, corpus: (
+        c.get('analyzer').analyze_words, [_content_words(text) for text in _texts(corpus)], 1),
+    'extract_topics_lda': lambda c, corpus: (
+        c.get('extractor').extract_topics_lda, _groups(_texts(corpus), LDA_GROUP), LDA_GROUP),
+    'extract_key_phrases': lambda c, corpus: (
+        c.get('extractor').extract_key_phrases, _texts(corpus), 1),
+    'categorize_article': lambda c, corpus: (
+        c.get('extractor').categorize_article, _texts(corpus), 1),
+    'pipeline': _pipeline(),
+    'pipeline_stories_cached': _pipeline(stories=True, analysis_cache_path='analysis.sqlite3'),
+}
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    if len(ordered) == 1:
+        return ordered[0]
+    return statistics.quantiles(ordered, n=100, method='inclusive')[int(q) - 1]
+
+
+def measure(call: Callable, inputs: List, items_per_input: int, memory_sample: int) -> Dict:
+    """Time every call, then trace peak memory over the first memory_sample inputs"""
+    call(inputs[0])  # warm-up: model loading is not what we measure
+
+    gc.collect()
+    latencies = []
+    for value in inputs:
+        start = time.perf_counter()
+        call(value)
+        latencies.append(time.perf_counter() - start)
+    total = sum(latencies)
+    ordered = sorted(latencies)
+
+    # Traced separately: tracemalloc slows allocation-heavy code several-fold
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    for value in inputs[:memory_sample]:
+        call(value)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    items = len(inputs) * items_per_input
+    return {
+        'calls': len(inputs),
+        'items': items,
+        'total_seconds': total,
+        'throughput_per_second': items / total if total else 0.0,
+        'latency_ms': {
+            'mean': total / len(inputs) * 1000,
+            'p50': _percentile(ordered, 50) * 1000,
+            'p95': _percentile(ordered, 95) * 1000,
+            'p99': _percentile(ordered, 99) * 1000,
+        },
+        'peak_memory_mb': peak / 1e6,
+    }
+
+
+def environment() -> Dict:
+    from importlib.metadata import PackageNotFoundError, version
+    versions = {}
+    for package in PACKAGES:
+        try:
+            versions[package] = version('scikit-learn' if package == 'sklearn' else package)
+        except PackageNotFoundError:
+            versions[package] = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'packages': versions,
+    }
+
+
+def _describe(error: Exception) -> str:
+    """One line for an error; NLTK's missing-resource messages span a screen"""
+    lines = [line.strip() for line in str(error).splitlines() if line.strip(' *')]
+    return f"{type(error).__name__}: {lines[0] if lines else ''}"
+
+
+def run_suite(sizes: List[int], names: List[str], model: str = "en_core_web_sm",
+              seed: int = 42, memory_sample: int = 20) -> Dict:
+    components = Components(model)
+    results: Dict[str, Dict] = {name: {} for name in names}
+    for size in sizes:
+        corpus = news_corpus(size, seed)
+        for name in names:
+            if 'skipped' in results[name]:
+                continue
+            try:
+                call, inputs, per_input = CASES[name](components, corpus)
+                result = measure(call, inputs, per_input, memory_sample)
+            except Exception as e:
+                results[name] = {'skipped': _describe(e)}
+                print(f"  {name:26} skipped ({_describe(e)})", file=sys.stderr)
+                continue
+            results[name][str(size)] = result
+            print(f"  {name:26} n={size:<6} {result['throughput_per_second']:10.1f} items/s  "
+                  f"p95 {result['latency_ms']['p95']:9.2f} ms  "
+                  f"peak {result['peak_memory_mb']:7.1f} MB", file=sys.stderr)
+    return {'environment': environment(),
+            'settings': {'sizes': sizes, 'seed': seed, 'model': model,
+                         'memory_sample': memory_sample},
+            'results': results}
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = 0.15,
+            memory_threshold: float = 0.25) -> List[Dict]:
+    """
+    One row per (case, size, metric) measured in both runs. A row is a
+    regression when throughput dropped, or p95 latency / peak memory grew,
+    by more than the threshold; a case the baseline ran but the current run
+    skipped is one too.
+    """
+    rows = []
+    for name, before_sizes in baseline['results'].items():
+        after_sizes = current['results'].get(name)
+        if after_sizes is None:
+            continue
+        if 'skipped' in after_sizes and 'skipped' not in before_sizes:
+            rows.append({'case': name, 'size': '-', 'metric': 'skipped', 'baseline': None,
+                         'current': None, 'change': None, 'regression': True,
+                         'note': after_sizes['skipped']})
+            continue
+        for size, before in before_sizes.items():
+            after = after_sizes.get(size)
+            if not isinstance(before, dict) or not isinstance(after, dict):
+                continue
+            for metric, old, new, higher_is_better, limit in (
+                ('throughput_per_second', before['throughput_per_second'],
+                 after['throughput_per_second'], True, threshold),
+                ('p95_ms', before['latency_ms']['p95'], after['latency_ms']['p95'], False, threshold),
+                ('peak_memory_mb', before['peak_memory_mb'], after['peak_memory_mb'], False,
+                 memory_threshold),
+            ):
+                change = (new - old) / old if old else 0.0
+                regression = change < -limit if higher_is_better else change > limit
+                rows.append({'case': name, 'size': size, 'metric': metric, 'baseline': old,
+                             'current': new, 'change': change, 'regression': regression})
+    return rows
+
+
+def print_comparison(rows: List[Dict]):
+    print(f"{'case':26} {'size':>6} {'metric':22} {'baseline':>12} {'current':>12} {'change':>8}")
+    for row in rows:
+        if row['metric'] == 'skipped':
+            print(f"{row['case']:26} {'-':>6} now skipped: {row['note']}  REGRESSION")
+            continue
+        flag = "  REGRESSION" if row['regression'] else ""
+        print(f"{row['case']:26} {row['size']:>6} {row['metric']:22} {row['baseline']:12.2f} "
+              f"{row['current']:12.2f} {row['change']:+8.1%}{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="run the suite and write JSON results")
+    run.add_argument('--sizes', type=int, nargs='+', default=[100, 1000])
+    run.add_argument('--only', nargs='+', choices=sorted(CASES), metavar='CASE',
+                     help=f"cases to run (default all: {', '.join(CASES)})")
+    run.add_argument('--model', default="en_core_web_sm", help="spaCy model for TextProcessor")
+    run.add_argument('--seed', type=int, default=42)
+    run.add_argument('--memory-sample', type=int, default=20,
+                     help="inputs traced for peak memory per case and size")
+    run.add_argument('--output', default='-')
+
+    comparison = commands.add_parser('compare', help="flag regressions against a baseline")
+    comparison.add_argument('baseline')
+    comparison.add_argument('current')
+    comparison.add_argument('--threshold', type=float, default=0.15,
+                            help="allowed relative throughput / p95 latency change")
+    comparison.add_argument('--memory-threshold', type=float, default=0.25)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        report = run_suite(sorted(args.sizes), args.only or list(CASES), args.model,
+                           args.seed, args.memory_sample)
+        text = json.dumps(report, indent=2)
+        if args.output == '-':
+            print(text)
+        else:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(text + '\n')
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, encoding='utf-8') as f:
+        current = json.load(f)
+    rows = compare(baseline, current, args.threshold, args.memory_threshold)
+    print_comparison(rows)
+    regressions = sum(row['regression'] for row in rows)
+    print(f"\n{regressions} regression(s) in {len(rows)} comparisons")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
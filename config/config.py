@@ -20,4 +20,85 @@ class Config:
     # Parameters
     DEFAULT_COUNTRY = "in"
     DEFAULT_PAGE_SIZE = 10
-    DEFAULT_LANGUAGE = "en"
\ No newline at end of file
+    DEFAULT_LANGUAGE = os.getenv('DEFAULT_LANGUAGE', 'en')
+    
+    # Languages analyzed with their own models (see src/model_registry.py); the
+    # models of a language load when its first article arrives, and the least
+    # recently used languages are unloaded beyond the budget
+    SUPPORTED_LANGUAGES = os.getenv('SUPPORTED_LANGUAGES', 'en,de,fr,es,it,pt,nl').split(',')
+    MODEL_MEMORY_BUDGET_MB = int(os.getenv('MODEL_MEMORY_BUDGET_MB', '1024'))
+    
+    # Per-call latency/size/error metrics (see src/metrics.py); off costs one flag check
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') == '1'
+    
+    # Load NLP models at startup instead of on the first request
+    WARM_UP_ON_START = os.getenv('WARM_UP_ON_START', '0') == '1'
+    
+    # Summarization budget per article
+    SUMMARY_TIME_BUDGET = 1.0  # seconds
+    SUMMARY_MAX_SENTENCES = 200  # sentences ranked in the similarity graph
+    
+    # Precomputed WordNet synonym/antonym index (built by `python news.py`)
+    WORDNET_INDEX_PATH = os.getenv('WORDNET_INDEX_PATH', 'data/wordnet.idx')
+    
+    # Corpus-wide TF-IDF document frequencies
+    TFIDF_INDEX_PATH = os.getenv('TFIDF_INDEX_PATH', 'data/tfidf.npz')
+    
+    # Local BM25 index over every fetched article, used by Search News
+    SEARCH_INDEX_DIR = os.getenv('SEARCH_INDEX_DIR', 'data/search_index')
+    SEARCH_RECENCY_HALF_LIFE_HOURS = 48
+    
+    # Full article pages fetched for analysis (optional)
+    BODY_CACHE_PATH = os.getenv('BODY_CACHE_PATH', 'data/article_bodies.sqlite3')
+    BODY_FETCH_MAX_BYTES = 2_000_000
+    BODY_FETCH_TIMEOUT = 10  # seconds
+    BODY_FETCH_PER_HOST = 2  # concurrent requests per site
+    
+    # Streamlit app: stories shown per page, background analysis threads and
+    # in-memory memoized results (per article and settings)
+    ARTICLES_PER_PAGE = 3
+    UI_ANALYSIS_WORKERS = 2
+    UI_CACHE_MAX_ENTRIES = 1000
+    
+    # Trending entities and phrases across all analyzed articles (see src/trending.py)
+    TRENDING_PATH = os.getenv('TRENDING_PATH', 'data/trending.npz')
+    TRENDING_BUCKET_SECONDS = 3600
+    TRENDING_WINDOW_HOURS = 72  # history kept
+    TRENDING_HALF_LIFE_HOURS = 6
+    
+    # Articles whose TF-IDF cosine with a story's centroid reaches this join that story
+    STORY_SIMILARITY_THRESHOLD = 0.25
+    
+    # Persistent online LDA topic model
+    TOPIC_MODEL_PATH = os.getenv('TOPIC_MODEL_PATH', 'data/topic_model.joblib')
+    TOPIC_MODEL_TOPICS = 10
+    
+    # Optional JSON {category: [keywords]} lexicon for article categorization
+    CATEGORY_LEXICON_PATH = os.getenv('CATEGORY_LEXICON_PATH')
+    
+    # Per-article analysis results, keyed by content hash + parameters + versions
+    ANALYSIS_CACHE_PATH = os.getenv('ANALYSIS_CACHE_PATH', 'data/analysis_cache.sqlite3')
+    ANALYSIS_CACHE_MAX_ENTRIES = 10000
+    
+    # Standalone analysis service (python -m src.analysis_server)
+    ANALYSIS_SERVER_HOST = os.getenv('ANALYSIS_SERVER_HOST', '127.0.0.1')
+    ANALYSIS_SERVER_PORT = int(os.getenv('ANALYSIS_SERVER_PORT', '8600'))
+    ANALYSIS_SERVER_WORKERS = int(os.getenv('ANALYSIS_SERVER_WORKERS', '2'))
+    ANALYSIS_BATCH_MAX_SIZE = 32  # texts per nlp.pipe batch
+    ANALYSIS_BATCH_MAX_WAIT = 0.005  # seconds a request waits for others to join its batch
+    
+    # Response cache
+    CACHE_PATH = os.getenv('NEWS_CACHE_PATH', '.news_cache.sqlite3')
+    CACHE_TTL = 900  # seconds
+    CACHE_ENDPOINT_TTLS = {
+        'top-headlines': 900,
+        'search': 1800
+    }
+    CACHE_STALE_TTL = 3600  # serve stale while revalidating for this long
+    CACHE_MAX_ENTRIES = 256
+    CACHE_DB_MAX_ENTRIES = 10000  # rows kept in the SQLite tier
+    GNEWS_DAILY_QUOTA = int(os.getenv('GNEWS_DAILY_QUOTA', '100'))
+    
+    # Plan limits: requests per second (token bucket) and articles per request
+    GNEWS_RATE_LIMIT = float(os.getenv('GNEWS_RATE_LIMIT', '1'))
+    GNEWS_MAX_PAGE_SIZE = int(os.getenv('GNEWS_MAX_PAGE_SIZE', '10'))
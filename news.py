@@ -1,2 +1,85 @@
-import nltk
-nltk.download('all')
\ No newline at end of file
+"""
+Provision only the NLP data the app actually uses.
+
+    python news.py            # download missing resources, build the WordNet index
+    python news.py --check    # report what is missing, download nothing
+"""
+import argparse
+import importlib.util
+import os
+import subprocess
+import sys
+
+from config.config import Config
+from src.model_registry import LANGUAGES, normalize_language
+
+# (nltk.data path, download id)
+NLTK_RESOURCES = [
+    ('tokenizers/punkt', 'punkt'),        # sent_tokenize, sumy Tokenizer
+    ('corpora/stopwords', 'stopwords'),   # TextProcessor stop words
+    ('corpora/wordnet', 'wordnet'),       # LinguisticAnalyzer
+    ('corpora/omw-1.4', 'omw-1.4'),       # WordNet lemma names
+]
+# The pipeline of every served language (languages without one fall back to the default)
+SPACY_MODELS = list(dict.fromkeys(
+    LANGUAGES[language]['spacy']
+    for language in map(normalize_language, [Config.DEFAULT_LANGUAGE, *Config.SUPPORTED_LANGUAGES])
+    if language in LANGUAGES
+))
+
+
+def missing_resources():
+    import nltk
+    missing_nltk = []
+    for path, name in NLTK_RESOURCES:
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            try:
+                nltk.data.find(f"{path}.zip")
+            except LookupError:
+                missing_nltk.append(name)
+    missing_spacy = [model for model in SPACY_MODELS
+                     if importlib.util.find_spec(model) is None]
+    missing_index = not os.path.exists(Config.WORDNET_INDEX_PATH)
+    return missing_nltk, missing_spacy, missing_index
+
+
+def provision():
+    import nltk
+    missing_nltk, missing_spacy, missing_index = missing_resources()
+    for name in missing_nltk:
+        nltk.download(name, quiet=True)
+    for model in missing_spacy:
+        subprocess.check_call([sys.executable, '-m', 'spacy', 'download', model])
+    if missing_index:
+        from src.wordnet_index import build_index
+        build_index(Config.WORDNET_INDEX_PATH)
+    return missing_nltk, missing_spacy, missing_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--check', action='store_true',
+                        help="only report missing resources")
+    args = parser.parse_args()
+
+    if args.check:
+        missing_nltk, missing_spacy, missing_index = missing_resources()
+        if not (missing_nltk or missing_spacy or missing_index):
+            print("All NLP resources present")
+            return
+        print(f"Missing NLTK data: {missing_nltk or 'none'}")
+        print(f"Missing spaCy models: {missing_spacy or 'none'}")
+        if missing_index:
+            print(f"Missing WordNet index: {Config.WORDNET_INDEX_PATH}")
+        sys.exit(1)
+
+    missing_nltk, missing_spacy, missing_index = provision()
+    print(f"Installed NLTK data: {missing_nltk or 'none'}; spaCy models: {missing_spacy or 'none'}")
+    if missing_index:
+        print(f"Built WordNet index at {Config.WORDNET_INDEX_PATH}")
+
+
+if __name__ == '__main__':
+    main()
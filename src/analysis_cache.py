@@ -0,0 +1,148 @@
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from importlib import metadata
+from typing import Callable, Dict, Optional
+from src.metrics import metrics
+
+# Bump when the analysis algorithms change in a way that alters results
+ANALYSIS_VERSION = 1
+
+def component_versions(model: str = "en_core_web_sm") -> str:
+    """Versions of the analysis algorithms and the libraries/models behind them"""
+    versions = {'analysis': ANALYSIS_VERSION}
+    for package in (model, 'spacy', 'sumy', 'scikit-learn', 'nltk'):
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return json.dumps(versions, sort_keys=True)
+
+
+class AnalysisCache:
+    """
+    Content-addressed SQLite store for per-article analysis results.
+    Keys hash the cleaned content, the analysis parameters and the component
+    versions, so changed articles, settings or model upgrades never hit stale
+    results. Entries from other versions are purged on open; the store is
+    bounded by max_entries with least-recently-used eviction.
+    Access times of hits are kept in memory and written in one transaction
+    every flush_every hits, before evicting and on close() or exit, so
+    reads don't commit.
+    """
+    
+    def __init__(self, path: str, max_entries: int = 10000,
+                 version: Optional[str] = None, flush_every: int = 256):
+        self.path = path
+        self.max_entries = max_entries
+        self.version = version or component_versions()
+        self.flush_every = flush_every
+        self._lock = threading.Lock()
+        # key -> last access time of hits not written yet
+        self._accessed: Dict[str, float] = {}
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS analyses "
+            "(key TEXT PRIMARY KEY, version TEXT, result TEXT, last_access REAL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS analyses_last_access ON analyses (last_access)"
+        )
+        # Invalidate everything computed by other algorithm or model versions
+        self._db.execute("DELETE FROM analyses WHERE version != ?", (self.version,))
+        self._db.commit()
+        atexit.register(self.flush)
+    
+    def make_key(self, content: str, params: Dict) -> str:
+        payload = json.dumps([content, params, self.version], sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, content: str, params: Dict) -> Optional[Dict]:
+        key = self.make_key(content, params)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT result FROM analyses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._stats['misses'] += 1
+                metrics.cache_result('analysis', 'miss')
+                return None
+            self._accessed[key] = time.time()
+            if len(self._accessed) >= self.flush_every:
+                self._flush()
+            self._stats['hits'] += 1
+        metrics.cache_result('analysis', 'hit')
+        return json.loads(row[0])
+    
+    def set(self, content: str, params: Dict, result: Dict):
+        key = self.make_key(content, params)
+        with self._lock:
+            self._accessed.pop(key, None)
+            self._db.execute(
+                "INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?)",
+                (key, self.version, json.dumps(result), time.time())
+            )
+            count = self._db.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+            if count > self.max_entries:
+                # Evict by up-to-date access times
+                self._flush(commit=False)
+                evicted = self._db.execute(
+                    "DELETE FROM analyses WHERE key IN "
+                    "(SELECT key FROM analyses ORDER BY last_access LIMIT ?)",
+                    (count - self.max_entries,)
+                ).rowcount
+                self._stats['evictions'] += evicted
+            self._db.commit()
+    
+    def _flush(self, commit: bool = True):
+        """Write pending access times; the caller holds the lock"""
+        if not self._accessed:
+            return
+        self._db.executemany(
+            "UPDATE analyses SET last_access = ? WHERE key = ?",
+            [(accessed, key) for key, accessed in self._accessed.items()]
+        )
+        self._accessed.clear()
+        if commit:
+            self._db.commit()
+    
+    def flush(self):
+        """Write the access times of recent hits"""
+        with self._lock:
+            self._flush()
+    
+    def close(self):
+        atexit.unregister(self.flush)
+        with self._lock:
+            self._flush()
+            self._db.close()
+    
+    def get_or_compute(self, content: str, params: Dict,
+                       compute: Callable[[], Dict]) -> Dict:
+        """Return the stored result, computing and storing it on a miss"""
+        result = self.get(content, params)
+        if result is None:
+            result = compute()
+            self.set(content, params, result)
+        return result
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = self._db.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+    
+    def clear(self):
+        with self._lock:
+            self._accessed.clear()
+            self._db.execute("DELETE FROM analyses")
+            self._db.commit()
@@ -0,0 +1,428 @@
+"""
+Standalone analysis HTTP service.
+
+    python -m src.analysis_server --port 8600 --workers 4
+
+    POST /analyze        {"text": "...", "summary_method": "textrank", "language": "de"}
+    POST /analyze_batch  {"texts": ["...", "..."], "num_keywords": 5}
+    GET  /health
+    GET  /metrics        Prometheus text, for the worker that answers
+
+The default language's models are loaded once in the parent, which then
+forks the workers: they share the loaded pipelines copy-on-write and accept
+on the same socket. Other languages are loaded by a worker when it first
+gets a text in them, within Config.MODEL_MEMORY_BUDGET_MB per worker.
+Inside a worker, concurrent requests are coalesced for up to max_wait
+seconds into micro-batches, so one nlp.pipe call parses the texts of many
+requests at once.
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from queue import Empty, Queue
+from typing import Dict, List, Optional, Tuple, Union
+
+from config.config import Config
+from src.metrics import metrics
+from src.model_registry import ModelRegistry, normalize_language
+from src.summarizer import NewsSummarizer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_OPTIONS = {
+    'summary_method': 'textrank',
+    'summary_length': 3,
+    'num_keywords': 10,
+    'key_phrases': 5,
+    'synonyms': False,
+    'language': '',  # ISO 639-1 code; empty to detect per text
+}
+MAX_BODY_BYTES = 10_000_000
+MAX_BATCH_TEXTS = 1000
+REQUEST_TIMEOUT = 120  # seconds
+
+
+class AnalysisService:
+    """
+    The per-article analysis of app.py, over a whole batch of texts at once.
+    Texts are analyzed with the models of their language (the request's
+    'language' option, else detected), loaded on demand by the registry.
+    """
+
+    def __init__(self, models, extractor, analyzer=None):
+        self.models = models
+        self.extractor = extractor
+        self.analyzer = analyzer
+
+    def warm_up(self):
+        # Only the default language: the others load in whichever worker needs them
+        self.models.get(self.models.default_language)
+        self.extractor.warm_up()
+        if self.analyzer is not None:
+            try:
+                self.analyzer.warm_up()
+            except LookupError:
+                logger.warning("WordNet is not installed; synonyms are disabled")
+                self.analyzer = None
+        return self
+
+    def options(self, request: Dict) -> Dict:
+        """Request options merged over the defaults; ValueError when invalid"""
+        options = dict(DEFAULT_OPTIONS)
+        for name, default in DEFAULT_OPTIONS.items():
+            if name in request:
+                value = request[name]
+                if type(value) is not type(default):
+                    raise ValueError(f"{name} must be a {type(default).__name__}")
+                options[name] = value
+        if options['summary_method'] not in NewsSummarizer.PAIR_COST:
+            raise ValueError(f"unknown summary_method {options['summary_method']!r}")
+        for name in ('summary_length', 'num_keywords', 'key_phrases'):
+            if not 0 < options[name] <= 100:
+                raise ValueError(f"{name} must be between 1 and 100")
+        if options['synonyms'] and self.analyzer is None:
+            raise ValueError("synonyms are not available on this server")
+        if options['language']:
+            language = normalize_language(options['language'])
+            if language not in self.models.languages:
+                raise ValueError(f"unsupported language {options['language']!r} "
+                                 f"(supported: {', '.join(self.models.languages)})")
+            options['language'] = language
+        return options
+
+    def analyze_batch(self, texts: List[str], options: Dict) -> List[Union[Dict, Exception]]:
+        """
+        One result per text; the texts of a language whose models fail get
+        the exception instead, without failing the other languages
+        """
+        languages = [options['language'] or self.models.language_of({'content': text})
+                     for text in texts]
+        results: List[Union[Dict, Exception, None]] = [None] * len(texts)
+        for language, positions in self.models.group(languages).items():
+            try:
+                analyzed = self._analyze(self.models.get(language),
+                                         [texts[i] for i in positions], options)
+            except Exception as e:
+                logger.exception("Analysis of %d %s texts failed", len(positions), language)
+                analyzed = [e] * len(positions)
+            for i, result in zip(positions, analyzed):
+                if isinstance(result, dict):
+                    result['language'] = language
+                results[i] = result
+        return results
+
+    def _analyze(self, models, texts: List[str], options: Dict) -> List[Dict]:
+        processor, summarizer = models.processor, models.summarizer
+        clean = [processor.clean_text(text) for text in texts]
+        documents = processor.analyze_many(clean)
+        summaries = summarizer.summarize_many(
+            documents,
+            options['summary_length'],
+            options['summary_method'],
+            time_budget=Config.SUMMARY_TIME_BUDGET,
+            max_sentences=Config.SUMMARY_MAX_SENTENCES
+        )
+        categories = self.extractor.categorize_many(documents)
+
+        results = []
+        for text, document, summary, category in zip(clean, documents, summaries, categories):
+            keywords, entities = processor.important_words(document, options['num_keywords'])
+            result = {
+                'keywords': keywords if text else [],
+                'entities': entities if text else [],
+                'summary': summary,
+                'category': category,
+                'key_phrases': self.extractor.extract_key_phrases(document, options['key_phrases']),
+            }
+            if options['synonyms']:
+                # WordNet is English only
+                result['synonyms'] = self.analyzer.analyze_document(
+                    document, stop_words=processor.stop_words
+                ) if models.language == 'en' else []
+            results.append(result)
+        return results
+
+
+class MicroBatcher:
+    """
+    Collects texts submitted from concurrent request threads and analyzes
+    them in batches of up to max_batch, waiting at most max_wait seconds
+    after the first text for others to arrive.
+    """
+
+    def __init__(self, service: AnalysisService, max_batch: int = 32, max_wait: float = 0.005):
+        self.service = service
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: Queue = Queue()
+        self.batches = 0
+        self.texts = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str, options: Dict) -> Future:
+        future = Future()
+        self._queue.put((text, options, future))
+        return future
+
+    def _collect(self) -> List[Tuple[str, Dict, Future]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            # Texts only share a batch with others analyzed the same way
+            groups: Dict[Tuple, List[Tuple[str, Dict, Future]]] = {}
+            for entry in batch:
+                groups.setdefault(tuple(sorted(entry[1].items())), []).append(entry)
+            for entries in groups.values():
+                try:
+                    results = self.service.analyze_batch([text for text, _, _ in entries],
+                                                         entries[0][1])
+                except Exception as e:
+                    for _, _, future in entries:
+                        future.set_exception(e)
+                else:
+                    for (_, _, future), result in zip(entries, results):
+                        if isinstance(result, Exception):
+                            future.set_exception(result)
+                        else:
+                            future.set_result(result)
+                self.batches += 1
+                self.texts += len(entries)
+
+
+class AnalysisHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, keep-alive
+    # clients would wait out the delayed ACK (~40 ms) on every response
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.path == '/health':
+            batcher = self.server.batcher
+            self._send_json(200, {'status': 'ok', 'pid': os.getpid(),
+                                  'batches': batcher.batches, 'texts': batcher.texts})
+        elif self.path == '/metrics':
+            self._send(200, metrics.to_prometheus().encode(), 'text/plain; version=0.0.4')
+        else:
+            self._send_json(404, {'error': f"no such endpoint {self.path}"})
+
+    def do_POST(self):
+        if self.path not in ('/analyze', '/analyze_batch'):
+            self.close_connection = True  # the unread body would be taken for the next request
+            self._send_json(404, {'error': f"no such endpoint {self.path}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if length > MAX_BODY_BYTES:
+                self.close_connection = True
+                self._send_json(413, {'error': "request body too large"})
+                return
+            request = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(request, dict):
+                raise ValueError("request body must be a JSON object")
+            texts = self._texts(request)
+            options = self.server.batcher.service.options(request)
+        except ValueError as e:  # includes JSONDecodeError
+            self._send_json(400, {'error': str(e)})
+            return
+
+        futures = [self.server.batcher.submit(text, options) for text in texts]
+        try:
+            results = [future.result(timeout=REQUEST_TIMEOUT) for future in futures]
+        except Exception as e:
+            self._send_json(500, {'error': f"analysis failed: {e}"})
+            return
+        if self.path == '/analyze':
+            self._send_json(200, results[0])
+        else:
+            self._send_json(200, {'results': results})
+
+    def _texts(self, request: Dict) -> List[str]:
+        if self.path == '/analyze':
+            text = request.get('text')
+            if not isinstance(text, str):
+                raise ValueError("'text' must be a string")
+            return [text]
+        texts = request.get('texts')
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            raise ValueError("'texts' must be a list of strings")
+        if len(texts) > MAX_BATCH_TEXTS:
+            raise ValueError(f"at most {MAX_BATCH_TEXTS} texts per request")
+        return texts
+
+    def _send_json(self, status: int, payload: Dict):
+        self._send(status, json.dumps(payload).encode(), 'application/json')
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class AnalysisHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, sock: socket.socket, batcher: MicroBatcher):
+        # Serve on an already listening (possibly inherited) socket
+        super().__init__(sock.getsockname()[:2], AnalysisHandler, bind_and_activate=False)
+        self.socket.close()
+        self.socket = sock
+        # Every worker wakes up for each connection and only one wins the
+        # accept(); the others must not block in it
+        self.socket.setblocking(False)
+        self.batcher = batcher
+
+
+def build_service(spacy_model: Optional[str] = None, synonyms: bool = True,
+                  languages: Optional[List[str]] = None) -> AnalysisService:
+    """spacy_model overrides the pipeline of the default language"""
+    from src.topic_extractor import TopicExtractor
+    from src.linguistic_analyzer import LinguisticAnalyzer
+
+    category_lexicon = None
+    if Config.CATEGORY_LEXICON_PATH:
+        with open(Config.CATEGORY_LEXICON_PATH, encoding='utf-8') as f:
+            category_lexicon = json.load(f)
+    return AnalysisService(
+        ModelRegistry(
+            Config.MODEL_MEMORY_BUDGET_MB,
+            Config.DEFAULT_LANGUAGE,
+            languages or Config.SUPPORTED_LANGUAGES,
+            spacy_models={Config.DEFAULT_LANGUAGE: spacy_model} if spacy_model else None
+        ),
+        TopicExtractor(category_lexicon=category_lexicon),
+        LinguisticAnalyzer(Config.WORDNET_INDEX_PATH) if synonyms else None
+    )
+
+
+def _serve_worker(sock: socket.socket, service: AnalysisService,
+                  max_batch: int, max_wait: float):
+    # The batcher thread is started here, after the fork: threads don't survive fork()
+    server = AnalysisHTTPServer(sock, MicroBatcher(service, max_batch, max_wait))
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    server.serve_forever()
+
+
+def serve(service: AnalysisService, host: str = '127.0.0.1', port: int = 8600,
+          workers: int = 2, max_batch: int = 32, max_wait: float = 0.005,
+          ready: Optional[threading.Event] = None):
+    """
+    Load the models, then serve with `workers` forked processes (or in this
+    process when workers is 1 or fork() is unavailable). Blocks until
+    interrupted; SIGTERM / Ctrl-C stop the workers too.
+    """
+    service.warm_up()
+    sock = socket.create_server((host, port), backlog=256)
+    print(f"Analysis server on http://{host}:{sock.getsockname()[1]} "
+          f"({workers} worker(s), batches of {max_batch} within {max_wait * 1000:.0f} ms)",
+          file=sys.stderr, flush=True)
+
+    if workers <= 1 or not hasattr(os, 'fork'):
+        if ready is not None:
+            ready.set()
+        try:
+            _serve_worker(sock, service, max_batch, max_wait)
+        finally:
+            sock.close()
+        return
+
+    # Objects alive now are never collected, so the workers' GC doesn't
+    # dirty (and copy) the pages holding the loaded models
+    gc.freeze()
+    children = set()
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            try:
+                signal.signal(signal.SIGINT, signal.SIG_IGN)  # the parent handles Ctrl-C
+                _serve_worker(sock, service, max_batch, max_wait)
+            finally:
+                os._exit(0)
+        children.add(pid)
+
+    for _ in range(workers):
+        spawn()
+    if ready is not None:
+        ready.set()
+
+    stopping = False
+
+    def stop(*_):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        while children:
+            try:
+                pid, _ = os.wait()
+            except ChildProcessError:
+                break
+            children.discard(pid)
+            if not stopping:
+                print(f"Worker {pid} exited, restarting", file=sys.stderr, flush=True)
+                spawn()
+    except KeyboardInterrupt:
+        stop()
+        for pid in list(children):
+            os.waitpid(pid, 0)
+    finally:
+        sock.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default=Config.ANALYSIS_SERVER_HOST)
+    parser.add_argument('--port', type=int, default=Config.ANALYSIS_SERVER_PORT)
+    parser.add_argument('--workers', type=int, default=Config.ANALYSIS_SERVER_WORKERS)
+    parser.add_argument('--max-batch', type=int, default=Config.ANALYSIS_BATCH_MAX_SIZE)
+    parser.add_argument('--max-wait', type=float, default=Config.ANALYSIS_BATCH_MAX_WAIT,
+                        help="seconds a request waits for others to join its batch")
+    parser.add_argument('--spacy-model', help="spaCy pipeline for the default language")
+    parser.add_argument('--languages', nargs='+',
+                        help=f"languages served (default {' '.join(Config.SUPPORTED_LANGUAGES)})")
+    parser.add_argument('--no-synonyms', action='store_true',
+                        help="don't load WordNet; requests asking for synonyms are rejected")
+    args = parser.parse_args(argv)
+
+    metrics.enabled = Config.METRICS_ENABLED
+    service = build_service(args.spacy_model, not args.no_synonyms, args.languages)
+    serve(service, args.host, args.port, args.workers, args.max_batch, args.max_wait)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+import codecs
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+
+from src.html_extractor import MainTextExtractor
+from src.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Bytes of a page looked at to find its encoding before decoding starts
+SNIFF_BYTES = 4096
+HEADER_CHARSET = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+BOMS = ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+
+
+def _codec(name) -> Optional[str]:
+    """Python codec name for a declared charset, or None if unknown"""
+    if isinstance(name, bytes):
+        name = name.decode('ascii', 'ignore')
+    try:
+        return codecs.lookup(name).name if name else None
+    except LookupError:
+        return None
+
+
+def page_encoding(content_type: Optional[str], head: bytes) -> str:
+    """
+    Encoding of an HTML page from its Content-Type header and first bytes:
+    a charset the server declared, else a byte order mark or <meta> charset,
+    else a guess from the bytes, else UTF-8. Unlike requests, a text/html
+    response without a charset is not taken to be ISO-8859-1.
+    """
+    match = HEADER_CHARSET.search(content_type or '')
+    declared = _codec(match.group(1)) if match else None
+    if declared:
+        return declared
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    match = META_CHARSET.search(head)
+    declared = _codec(match.group(1)) if match else None
+    if declared:
+        return declared
+    try:
+        # Not final: the sample may end inside a character
+        codecs.getincrementaldecoder('utf-8')().decode(head)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    guessed = chardet.detect(head).get('encoding') if chardet is not None else None
+    return _codec(guessed) or 'utf-8'
+
+
+class BodyCache:
+    """
+    SQLite cache of extracted article bodies by URL, with the ETag and
+    Last-Modified validators needed to revalidate them with a conditional GET
+    """
+
+    def __init__(self, path: str, ttl: float = 86400):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS bodies "
+            "(url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body TEXT, fetched_at REAL)"
+        )
+        self._db.commit()
+
+    def get(self, url: str) -> Optional[Tuple[str, Optional[str], Optional[str], bool]]:
+        """(body, etag, last_modified, fresh) or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM bodies WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        body, etag, last_modified, fetched_at = row
+        return body, etag, last_modified, time.time() - fetched_at < self.ttl
+
+    def set(self, url: str, body: str, etag: Optional[str] = None,
+            last_modified: Optional[str] = None):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO bodies VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body, time.time())
+            )
+            self._db.commit()
+
+    def touch(self, url: str):
+        """Mark a revalidated (304) entry as fresh again"""
+        with self._lock:
+            self._db.execute("UPDATE bodies SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM bodies").fetchone()[0]
+
+
+class ArticleBodyFetcher:
+    """
+    Fetch full article pages concurrently and extract their main text.
+
+    Pages are streamed through a pooled session into MainTextExtractor chunk
+    by chunk, so no page is held whole in memory; downloads stop at max_bytes.
+    At most per_host requests run against one host at a time, and bodies are
+    cached by URL and revalidated with ETag / Last-Modified.
+    """
+
+    def __init__(self, max_workers: int = 16, per_host: int = 2,
+                 max_bytes: int = 2_000_000, timeout: float = 10,
+                 cache: Optional[BodyCache] = None,
+                 user_agent: str = "Mozilla/5.0 (compatible; NewsSummarizer/1.0)"):
+        self.max_workers = max_workers
+        self.per_host = per_host
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.cache = cache
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = user_agent
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.stats = {'fetched': 0, 'cached': 0, 'revalidated': 0, 'truncated': 0, 'errors': 0}
+
+    def _slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._host_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return slot
+
+    def _count(self, name: str):
+        with self._host_lock:
+            self.stats[name] += 1
+
+    def fetch(self, url: str) -> Optional[str]:
+        """Main text of the page at url, or None when it cannot be fetched or is not HTML"""
+        if not url or not url.startswith(('http://', 'https://')):
+            return None
+
+        cached = self.cache.get(url) if self.cache is not None else None
+        headers = {}
+        if cached is not None:
+            body, etag, last_modified, fresh = cached
+            if fresh:
+                self._count('cached')
+                metrics.cache_result('article_body', 'hit')
+                return body
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        try:
+            with self._slot(url):
+                with self.session.get(url, headers=headers, timeout=self.timeout,
+                                      stream=True) as response:
+                    if response.status_code == 304 and cached is not None:
+                        self.cache.touch(url)
+                        self._count('revalidated')
+                        metrics.cache_result('article_body', 'revalidated')
+                        return cached[0]
+                    response.raise_for_status()
+                    if 'html' not in response.headers.get('Content-Type', 'text/html'):
+                        return None
+                    body = self._extract(response)
+        except requests.exceptions.RequestException as e:
+            self._count('errors')
+            logger.warning("Error fetching article body %s: %s", url, e)
+            return cached[0] if cached is not None else None
+
+        self._count('fetched')
+        metrics.cache_result('article_body', 'miss')
+        if self.cache is not None:
+            self.cache.set(url, body, response.headers.get('ETag'),
+                           response.headers.get('Last-Modified'))
+        return body
+
+    def _extract(self, response) -> str:
+        """Stream the response into the extractor, stopping after max_bytes or the timeout"""
+        extractor = MainTextExtractor()
+        decoder = None
+        head = b''
+        received = 0
+        deadline = time.monotonic() + self.timeout
+        for chunk in response.iter_content(chunk_size=16384):
+            received += len(chunk)
+            if decoder is None:
+                # Hold the first bytes back until the encoding can be told from them
+                head += chunk
+                if len(head) < SNIFF_BYTES:
+                    continue
+                encoding = page_encoding(response.headers.get('Content-Type'), head[:SNIFF_BYTES])
+                decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+                chunk, head = head, b''
+            extractor.feed(decoder.decode(chunk))
+            if received >= self.max_bytes or time.monotonic() > deadline:
+                if received >= self.max_bytes:
+                    self._count('truncated')
+                break
+        else:
+            if decoder is None:
+                encoding = page_encoding(response.headers.get('Content-Type'), head)
+                decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+            extractor.feed(decoder.decode(head, final=True))
+        extractor.close()
+        return extractor.text()
+
+    def fetch_many(self, urls: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """Yield (url, body) pairs as they finish"""
+        # Interleave hosts so workers don't all queue up behind one host's slots
+        by_host: Dict[str, List[str]] = {}
+        for url in dict.fromkeys(urls):
+            by_host.setdefault(urlsplit(url).netloc.lower(), []).append(url)
+        queues = list(by_host.values())
+        ordered = [queue[i] for i in range(max(map(len, queues), default=0))
+                   for queue in queues if i < len(queue)]
+
+        futures = {self._executor.submit(self.fetch, url): url for url in ordered}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+    def enrich(self, articles: List[Dict], field: str = 'full_content') -> List[Dict]:
+        """Set article[field] to the fetched body (or None) for each article, in place"""
+        bodies = dict(self.fetch_many(article.get('url', '') for article in articles))
+        for article in articles:
+            article[field] = bodies.get(article.get('url', ''))
+        return articles
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
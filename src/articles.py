@@ -0,0 +1,261 @@
+"""
+Typed article records and a columnar batch for bulk ingest.
+
+Article is a frozen, slotted record with a parsed publishedAt; NewsFetcher
+converts GNews articles through it. ArticleBatch keeps a whole response (or
+many) as pandas columns built straight from the GNews JSON; slices and
+filters share those columns and only carry an array of row positions, so
+nothing is copied until a frame is materialized. numpy and pandas are
+imported on first use of ArticleBatch, so importing Article stays cheap.
+"""
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+
+def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Timezone-aware datetime of an ISO 8601 publishedAt string, None when missing or invalid"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class Article:
+    __slots__ = ('title', 'description', 'content', 'url', 'image',
+                 'published_at', 'source_name', 'source_url', 'lang')
+    title: str
+    description: str
+    content: str
+    url: str
+    image: str
+    published_at: Optional[datetime]
+    source_name: str
+    source_url: str
+    # Language the article was requested in, None when unknown
+    lang: Optional[str]
+    
+    @classmethod
+    def from_gnews(cls, article: Dict, lang: Optional[str] = None) -> 'Article':
+        """From a GNews article, or a dict from to_dict(); lang if the article has none"""
+        source = article.get('source') or {}
+        description = article.get('description') or ''
+        return cls(
+            title=article.get('title') or '',
+            description=description,
+            content=article.get('content') or description,
+            url=article.get('url') or '',
+            image=article.get('image') or article.get('urlToImage') or '',
+            published_at=parse_datetime(article.get('publishedAt')),
+            source_name=source.get('name') or 'Unknown',
+            source_url=source.get('url') or '',
+            lang=article.get('lang') or lang
+        )
+
+    @property
+    def text(self) -> str:
+        """The text analyzed downstream: description, else content"""
+        return self.description or self.content
+
+    def to_dict(self) -> Dict:
+        """NewsAPI-like dict, as returned by NewsFetcher; from_gnews() reads it back"""
+        return {
+            'source': {'id': None, 'name': self.source_name, 'url': self.source_url},
+            'author': None,
+            'title': self.title,
+            'description': self.description,
+            'url': self.url,
+            'urlToImage': self.image,
+            'publishedAt': self.published_at.isoformat().replace('+00:00', 'Z') if self.published_at else '',
+            'content': self.content,
+            'lang': self.lang
+        }
+
+
+class ArticleBatch:
+    """
+    Columnar view over many articles.
+
+    len(), indexing (an Article), slicing and filter() work on row positions
+    into a shared DataFrame, so views are cheap and never copy text columns.
+    to_frame(), to_records() and to_parquet() materialize the selected rows.
+    """
+    COLUMNS = ('title', 'description', 'content', 'url', 'image',
+               'published_at', 'source_name', 'source_url', 'lang')
+    # Few distinct values per response: stored as codes, not repeated strings
+    CATEGORY_COLUMNS = ('source_name', 'source_url', 'lang')
+    
+    def __init__(self, frame: 'pd.DataFrame', rows: Optional['np.ndarray'] = None):
+        self._frame = frame
+        # None selects every row of the frame
+        self._rows = rows
+
+    @classmethod
+    def from_gnews(cls, data: Union[Dict, List[Dict]],
+                   lang: Optional[str] = None) -> 'ArticleBatch':
+        """Build from a GNews response (or its 'articles' list) without per-article dicts"""
+        import pandas as pd
+        
+        articles = data.get('articles', []) if isinstance(data, dict) else data
+        columns = {name: [] for name in cls.COLUMNS}
+        published = []
+        for article in articles:
+            source = article.get('source') or {}
+            description = article.get('description') or ''
+            columns['title'].append(article.get('title') or '')
+            columns['description'].append(description)
+            columns['content'].append(article.get('content') or description)
+            columns['url'].append(article.get('url') or '')
+            columns['image'].append(article.get('image') or '')
+            columns['source_name'].append(source.get('name') or 'Unknown')
+            columns['source_url'].append(source.get('url') or '')
+            columns['lang'].append(article.get('lang') or lang)
+            published.append(article.get('publishedAt'))
+        columns['published_at'] = pd.to_datetime(published, utc=True, errors='coerce', format='ISO8601')
+        return cls._from_columns(columns)
+
+    @classmethod
+    def from_json(cls, payload: Union[str, bytes], lang: Optional[str] = None) -> 'ArticleBatch':
+        """Build from the raw response body of a GNews request"""
+        return cls.from_gnews(json.loads(payload), lang)
+
+    @classmethod
+    def from_articles(cls, articles: Iterable[Article]) -> 'ArticleBatch':
+        import pandas as pd
+        
+        columns = {name: [] for name in cls.COLUMNS}
+        for article in articles:
+            for name in cls.COLUMNS:
+                columns[name].append(getattr(article, name))
+        columns['published_at'] = pd.to_datetime(columns['published_at'], utc=True)
+        return cls._from_columns(columns)
+
+    @classmethod
+    def concat(cls, batches: Iterable['ArticleBatch']) -> 'ArticleBatch':
+        import pandas as pd
+        
+        frames = [batch.to_frame() for batch in batches]
+        if not frames:
+            return cls.from_gnews([])
+        frame = pd.concat(frames, ignore_index=True)
+        # Concatenating categoricals with different categories falls back to object
+        for name in cls.CATEGORY_COLUMNS:
+            frame[name] = frame[name].astype('category')
+        return cls(frame)
+
+    @classmethod
+    def _from_columns(cls, columns: Dict[str, list]) -> 'ArticleBatch':
+        import pandas as pd
+        
+        frame = pd.DataFrame(columns, columns=list(cls.COLUMNS))
+        for name in cls.CATEGORY_COLUMNS:
+            frame[name] = frame[name].astype('category')
+        return cls(frame)
+
+    @property
+    def rows(self) -> 'np.ndarray':
+        """Positions of the selected rows in the shared frame"""
+        import numpy as np
+        
+        return np.arange(len(self._frame)) if self._rows is None else self._rows
+
+    def __len__(self) -> int:
+        return len(self._frame) if self._rows is None else len(self._rows)
+
+    def __getitem__(self, key):
+        import numpy as np
+        
+        if isinstance(key, (int, np.integer)):
+            return self._article(int(self.rows[key]))
+        # A slice of the rows array is a numpy view; fancy indexing copies positions only
+        return ArticleBatch(self._frame, self.rows[key])
+
+    def __iter__(self) -> Iterator[Article]:
+        for row in self.rows:
+            yield self._article(int(row))
+
+    def _article(self, row: int) -> Article:
+        import pandas as pd
+        
+        values = {name: self._frame[name].iat[row] for name in self.COLUMNS}
+        published_at = values['published_at']
+        values['published_at'] = None if pd.isna(published_at) else published_at.to_pydatetime()
+        if pd.isna(values['lang']):
+            values['lang'] = None
+        return Article(**values)
+    
+    def column(self, name: str) -> 'np.ndarray':
+        """Values of one column for the selected rows (publish times as UTC datetime64)"""
+        import numpy as np
+        import pandas as pd
+        
+        # .values of a tz-aware column is the underlying datetime64[ns] array, not Timestamps
+        values = self._frame[name].values
+        if isinstance(values, pd.Categorical):
+            values = np.asarray(values)
+        return values if self._rows is None else values[self._rows]
+
+    def filter(self, mask) -> 'ArticleBatch':
+        """Rows where mask (a boolean array over this batch) is true"""
+        import numpy as np
+        
+        mask = np.asarray(mask, dtype=bool)
+        if len(mask) != len(self):
+            raise ValueError(f"mask has {len(mask)} entries for {len(self)} articles")
+        return ArticleBatch(self._frame, self.rows[mask])
+
+    def published_between(self, start: Optional[datetime] = None,
+                          end: Optional[datetime] = None) -> 'ArticleBatch':
+        """Articles published in [start, end); naive datetimes are taken as UTC"""
+        import numpy as np
+        
+        published = self.column('published_at')
+        mask = ~np.isnat(published)
+        if start is not None:
+            mask &= published >= _utc_datetime64(start)
+        if end is not None:
+            mask &= published < _utc_datetime64(end)
+        return self.filter(mask)
+
+    def from_source(self, name: str) -> 'ArticleBatch':
+        """Articles from the source with this name (compared on category codes)"""
+        import numpy as np
+        
+        sources = self._frame['source_name'].cat
+        if name not in sources.categories:
+            return self.filter(np.zeros(len(self), dtype=bool))
+        codes = sources.codes.to_numpy()
+        if self._rows is not None:
+            codes = codes[self._rows]
+        return self.filter(codes == sources.categories.get_loc(name))
+
+    def to_frame(self) -> 'pd.DataFrame':
+        """DataFrame of the selected rows (a copy unless this is the whole batch)"""
+        if self._rows is None:
+            return self._frame
+        return self._frame.take(self._rows).reset_index(drop=True)
+
+    def to_records(self) -> List[Dict]:
+        """NewsAPI-like dicts, for code that still works on NewsFetcher's format"""
+        return [article.to_dict() for article in self]
+
+    def to_parquet(self, path: str, **kwargs):
+        """Write the selected rows to Parquet (needs pyarrow or fastparquet)"""
+        self.to_frame().to_parquet(path, index=False, **kwargs)
+
+
+def _utc_datetime64(value: datetime) -> 'np.datetime64':
+    import pandas as pd
+    
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert('UTC').tz_localize(None)
+    return timestamp.to_datetime64()
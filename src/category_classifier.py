@@ -0,0 +1,76 @@
+import json
+import re
+from typing import Dict, List
+
+DEFAULT_CATEGORY_KEYWORDS = {
+    'technology': ['tech', 'software', 'ai', 'computer', 'digital', 'internet', 'app'],
+    'business': ['business', 'economy', 'market', 'finance', 'stock', 'trade', 'company'],
+    'politics': ['politics', 'government', 'election', 'president', 'congress', 'law', 'policy'],
+    'sports': ['sports', 'game', 'team', 'player', 'match', 'score', 'championship'],
+    'health': ['health', 'medical', 'doctor', 'disease', 'treatment', 'hospital', 'covid'],
+    'science': ['science', 'research', 'study', 'discovery', 'experiment', 'scientist'],
+    'entertainment': ['movie', 'music', 'celebrity', 'film', 'actor', 'singer', 'show']
+}
+
+class CategoryClassifier:
+    """
+    Keyword category classifier compiled once into a single regex.
+    Keywords match whole words (plus a plural -s/-es), so 'ai' no longer
+    matches 'said'. Each category scores one point per distinct keyword
+    found, and all categories are scored in one pass over the text.
+    """
+    
+    def __init__(self, lexicon: Dict[str, List[str]] = None):
+        lexicon = lexicon or DEFAULT_CATEGORY_KEYWORDS
+        # Keywords are matched lowercased with single spaces; empty ones and
+        # categories left without any are dropped
+        self.lexicon = {}
+        for category, keywords in lexicon.items():
+            normalized = [' '.join(keyword.lower().split()) for keyword in keywords]
+            normalized = list(dict.fromkeys(keyword for keyword in normalized if keyword))
+            if normalized:
+                self.lexicon[category] = normalized
+        self.categories = list(self.lexicon)
+        
+        self._keyword_categories: Dict[str, List[int]] = {}
+        for idx, keywords in enumerate(self.lexicon.values()):
+            for keyword in keywords:
+                self._keyword_categories.setdefault(keyword, []).append(idx)
+        
+        # Longest first so multi-word and longer keywords win over their prefixes;
+        # any run of whitespace in the text matches the single space of a keyword
+        alternation = '|'.join(
+            re.escape(keyword).replace(r'\ ', ' ').replace(' ', r'\s+')
+            for keyword in sorted(self._keyword_categories, key=len, reverse=True)
+        )
+        self._pattern = None
+        if alternation:
+            self._pattern = re.compile(rf'\b({alternation})(?:e?s)?\b', re.IGNORECASE)
+    
+    @classmethod
+    def from_file(cls, path: str) -> 'CategoryClassifier':
+        """Load a {category: [keywords]} lexicon from a JSON file"""
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
+    
+    def scores(self, text: str) -> Dict[str, int]:
+        """Number of distinct keywords found per category (categories with no match omitted)"""
+        if self._pattern is None:
+            return {}
+        matched = {' '.join(m.group(1).lower().split()) for m in self._pattern.finditer(text or '')}
+        counts = [0] * len(self.categories)
+        for keyword in matched:
+            for idx in self._keyword_categories[keyword]:
+                counts[idx] += 1
+        return {self.categories[i]: c for i, c in enumerate(counts) if c > 0}
+    
+    def categorize(self, text: str) -> str:
+        """Best scoring category (first in lexicon order on ties), or 'general'"""
+        scores = self.scores(text)
+        if scores:
+            return max(scores, key=scores.get)
+        return 'general'
+    
+    def categorize_many(self, texts: List[str]) -> List[str]:
+        """Categorize a batch of texts with the same compiled matcher"""
+        return [self.categorize(text) for text in texts]
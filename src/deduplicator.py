@@ -0,0 +1,179 @@
+import re
+import zlib
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+import numpy as np
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_TRACKING_PARAMS = re.compile(r'^(utm_\w+|fbclid|gclid|ref|source|cmpid|ocid)$', re.IGNORECASE)
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of an article URL: host + path + query, without scheme, www,
+    fragment, tracking parameters or trailing slash"""
+    if not url:
+        return ''
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = urlencode(sorted(
+        (k, v) for k, v in parse_qsl(parts.query) if not _TRACKING_PARAMS.match(k)
+    ))
+    return f"{host}{parts.path.rstrip('/')}" + (f"?{query}" if query else '')
+
+
+class ArticleDeduplicator:
+    """
+    Near-duplicate article clustering with MinHash-LSH over a rolling window
+    of recently seen articles.
+    
+    Each article is fingerprinted from its title plus description/content
+    (word shingles), banded into LSH buckets, and compared only against the
+    candidates sharing a bucket, so lookups stay sub-linear in the window
+    size. Articles whose estimated Jaccard similarity reaches the threshold,
+    or whose normalized URLs match, join the same cluster.
+    """
+    
+    def __init__(self, 
+                 threshold: float = 0.6,
+                 num_perm: int = 64,
+                 bands: int = 16,
+                 shingle_size: int = 3,
+                 window: int = 5000,
+                 seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.window = window
+        
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _MERSENNE_PRIME, num_perm).astype(np.uint64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, num_perm).astype(np.uint64)
+        
+        self._next_id = 0
+        self._order = deque()  # article ids in arrival order
+        self._signatures: Dict[int, np.ndarray] = {}
+        self._band_keys: Dict[int, List[bytes]] = {}
+        self._buckets: List[Dict[bytes, set]] = [{} for _ in range(bands)]
+        self._urls: Dict[str, int] = {}
+        self._url_of: Dict[int, str] = {}
+        self._cluster_of: Dict[int, int] = {}
+        self.cluster_sizes: Dict[int, int] = {}
+    
+    def _shingles(self, text: str) -> List[bytes]:
+        words = re.findall(r'\w+', text.lower())
+        if len(words) < self.shingle_size:
+            return [' '.join(words).encode('utf-8')] if words else []
+        return [' '.join(words[i:i + self.shingle_size]).encode('utf-8')
+                for i in range(len(words) - self.shingle_size + 1)]
+    
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of the text's word shingles (None for empty text)"""
+        shingles = self._shingles(text)
+        if not shingles:
+            return None
+        hashes = np.fromiter((zlib.crc32(s) for s in set(shingles)), dtype=np.uint64)
+        permuted = (np.outer(hashes % _MERSENNE_PRIME, self._a) + self._b) % _MERSENNE_PRIME
+        return permuted.min(axis=0)
+    
+    @staticmethod
+    def article_text(article: Dict) -> str:
+        return ' '.join(filter(None, [
+            article.get('title'),
+            article.get('description') or article.get('content')
+        ]))
+    
+    def add(self, article: Dict) -> Dict:
+        """
+        Register an article and return its cluster assignment:
+        {'id', 'cluster_id', 'duplicate_of' (representative article id or None), 'similarity'}
+        """
+        article_id = self._next_id
+        self._next_id += 1
+        
+        match, similarity = None, 0.0
+        url = normalize_url(article.get('url', ''))
+        if url and url in self._urls:
+            match, similarity = self._urls[url], 1.0
+        
+        signature = self.signature(self.article_text(article))
+        band_keys = []
+        if signature is not None:
+            band_keys = [signature[b * self.rows:(b + 1) * self.rows].tobytes()
+                         for b in range(self.bands)]
+            if match is None:
+                candidates = set()
+                for band, key in enumerate(band_keys):
+                    candidates |= self._buckets[band].get(key, set())
+                for candidate in candidates:
+                    estimate = float(np.mean(self._signatures[candidate] == signature))
+                    if estimate >= self.threshold and estimate > similarity:
+                        match, similarity = candidate, estimate
+        
+        cluster_id = self._cluster_of[match] if match is not None else article_id
+        self._remember(article_id, cluster_id, url, signature, band_keys)
+        return {
+            'id': article_id,
+            'cluster_id': cluster_id,
+            'duplicate_of': cluster_id if match is not None else None,
+            'similarity': similarity
+        }
+    
+    def _remember(self, article_id: int, cluster_id: int, url: str,
+                  signature: Optional[np.ndarray], band_keys: List[bytes]):
+        self._cluster_of[article_id] = cluster_id
+        self.cluster_sizes[cluster_id] = self.cluster_sizes.get(cluster_id, 0) + 1
+        if url:
+            self._urls.setdefault(url, article_id)
+            self._url_of[article_id] = url
+        if signature is not None:
+            self._signatures[article_id] = signature
+            self._band_keys[article_id] = band_keys
+            for band, key in enumerate(band_keys):
+                self._buckets[band].setdefault(key, set()).add(article_id)
+        self._order.append(article_id)
+        
+        while len(self._order) > self.window:
+            self._forget(self._order.popleft())
+    
+    def _forget(self, article_id: int):
+        for band, key in enumerate(self._band_keys.pop(article_id, [])):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(article_id)
+                if not bucket:
+                    del self._buckets[band][key]
+        self._signatures.pop(article_id, None)
+        url = self._url_of.pop(article_id, None)
+        if url is not None and self._urls.get(url) == article_id:
+            del self._urls[url]
+        cluster_id = self._cluster_of.pop(article_id)
+        self.cluster_sizes[cluster_id] -= 1
+        if not self.cluster_sizes[cluster_id]:
+            del self.cluster_sizes[cluster_id]
+    
+    def deduplicate(self, articles: List[Dict]) -> Tuple[List[Dict], Dict[int, List[Dict]]]:
+        """
+        Cluster a batch. Returns the cluster representatives (first article of
+        each cluster, in order) and the members of every cluster by representative
+        index in `articles`.
+        """
+        representatives = []
+        clusters: Dict[int, List[Dict]] = {}
+        index_of_cluster: Dict[int, int] = {}
+        for idx, article in enumerate(articles):
+            assignment = self.add(article)
+            cluster_id = assignment['cluster_id']
+            if cluster_id not in index_of_cluster:
+                # Cluster founded by this article, or by one seen in an earlier batch
+                index_of_cluster[cluster_id] = idx
+                representatives.append(article)
+            clusters.setdefault(index_of_cluster[cluster_id], []).append(article)
+        return representatives, clusters
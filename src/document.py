@@ -0,0 +1,138 @@
+import sys
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class AnalyzedDocument:
+    """
+    One article parsed once: sentences, tokens, POS tags and entities.
+
+    Built by TextProcessor.analyze/analyze_many from a spaCy doc and accepted
+    directly by NewsSummarizer, TopicExtractor and LinguisticAnalyzer, so the
+    text is not re-split or re-tokenized by each of them. Token and sentence
+    boundaries are kept as array offsets into the text; per-token attributes
+    are tuples of (interned) strings. Picklable, so it can cross process
+    boundaries in the streaming pipeline.
+    """
+    __slots__ = ('text', 'token_starts', 'token_ends', 'pos',
+                 'sentence_starts', 'entities', '_words')
+
+    def __init__(self, text: str,
+                 token_starts: array, token_ends: array,
+                 pos: Tuple[str, ...],
+                 sentence_starts: array,
+                 entities: Tuple[Tuple[str, str], ...]):
+        self.text = text
+        self.token_starts = token_starts
+        self.token_ends = token_ends
+        self.pos = pos
+        # Index of the first token of every sentence
+        self.sentence_starts = sentence_starts
+        self.entities = entities
+        self._words = None
+
+    @classmethod
+    def from_spacy(cls, doc) -> 'AnalyzedDocument':
+        starts, ends = array('I'), array('I')
+        pos = []
+        for token in doc:
+            starts.append(token.idx)
+            ends.append(token.idx + len(token.text))
+            pos.append(sys.intern(token.pos_))
+
+        if doc.has_annotation("SENT_START"):
+            sentence_starts = array('I', (sent.start for sent in doc.sents))
+        else:
+            sentence_starts = array('I', [0] if len(doc) else [])
+
+        return cls(
+            doc.text, starts, ends, tuple(pos), sentence_starts,
+            tuple((ent.text, ent.label_) for ent in doc.ents)
+        )
+
+    def __len__(self) -> int:
+        return len(self.token_starts)
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__ if name != '_words'}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._words = None
+
+    @property
+    def words(self) -> Tuple[str, ...]:
+        """Token texts"""
+        if self._words is None:
+            text = self.text
+            self._words = tuple(text[s:e] for s, e in zip(self.token_starts, self.token_ends))
+        return self._words
+
+    def _sentence_token_range(self, i: int) -> Tuple[int, int]:
+        end = self.sentence_starts[i + 1] if i + 1 < len(self.sentence_starts) else len(self)
+        return self.sentence_starts[i], end
+
+    @property
+    def sentences(self) -> List[str]:
+        """Sentence texts, as sliced from the original text"""
+        sentences = []
+        for i in range(len(self.sentence_starts)):
+            first, end = self._sentence_token_range(i)
+            if first < end:
+                sentences.append(self.text[self.token_starts[first]:self.token_ends[end - 1]])
+        return sentences
+
+    def sentence_words(self) -> List[List[str]]:
+        """Word tokens (punctuation dropped) of every sentence, in the same order as sentences"""
+        words = self.words
+        result = []
+        for i in range(len(self.sentence_starts)):
+            first, end = self._sentence_token_range(i)
+            if first < end:
+                result.append([w for w in words[first:end] if any(c.isalnum() for c in w)])
+        return result
+
+    def content_words(self, stop_words: Iterable[str],
+                      pos: Tuple[str, ...] = ('NOUN', 'VERB', 'PROPN'),
+                      min_length: int = 3) -> List[str]:
+        """Lowercased words with the given POS tags, minus stop words and short tokens"""
+        stop_words = stop_words if isinstance(stop_words, (set, frozenset)) else set(stop_words)
+        words = []
+        for word, tag in zip(self.words, self.pos):
+            if tag in pos and len(word) >= min_length:
+                word = word.lower()
+                if word not in stop_words:
+                    words.append(word)
+        return words
+
+    def capitalized_phrases(self) -> List[str]:
+        """Runs of adjacent Capitalized words (the key phrase heuristic)"""
+        phrases, current = [], []
+        previous_end = None
+        for start, word in zip(self.token_starts, self.words):
+            capitalized = word[:1].isupper() and word[1:].islower() and word.isalpha() and len(word) > 1
+            # Phrases only continue across plain whitespace
+            if capitalized and current and self.text[previous_end:start].isspace():
+                current.append(word)
+            else:
+                if current:
+                    phrases.append(' '.join(current))
+                current = [word] if capitalized else []
+            previous_end = start + len(word)
+        if current:
+            phrases.append(' '.join(current))
+        return phrases
+
+    def word_frequencies(self, pos_map: Dict[str, str],
+                         stop_words: Optional[Iterable[str]] = None) -> Counter:
+        """Counts of lowercased words whose POS tag is in pos_map"""
+        stop_words = set(stop_words or ())
+        counts = Counter()
+        for word, tag in zip(self.words, self.pos):
+            if tag in pos_map and word.isalpha():
+                word = word.lower()
+                if word not in stop_words:
+                    counts[word] += 1
+        return counts
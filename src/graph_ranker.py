@@ -0,0 +1,153 @@
+from collections import Counter
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy import sparse
+
+# Same constants as sumy's TextRankSummarizer / LexRankSummarizer so rankings match
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_EPSILON = 1e-4
+LEXRANK_THRESHOLD = 0.1
+LEXRANK_EPSILON = 0.1
+_ZERO_DIVISION_PREVENTION = 1e-7
+
+
+def term_matrix(sentences_terms: Sequence[List[str]]) -> sparse.csr_matrix:
+    """Sentence x term count matrix (CSR) for already stemmed/filtered sentences"""
+    vocabulary: Dict[str, int] = {}
+    indptr = [0]
+    indices = []
+    data = []
+    for terms in sentences_terms:
+        for term, count in Counter(terms).items():
+            indices.append(vocabulary.setdefault(term, len(vocabulary)))
+            data.append(count)
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float64), indices, indptr),
+        shape=(len(sentences_terms), max(len(vocabulary), 1))
+    )
+
+
+def prune_common_terms(counts: sparse.csr_matrix, max_df: float = 0.5) -> sparse.csr_matrix:
+    """
+    Drop terms that occur in more than max_df of the sentences. They connect
+    almost every pair and make the similarity product dense on long inputs.
+    """
+    document_frequency = np.asarray((counts > 0).sum(axis=0)).ravel()
+    keep = document_frequency <= max(max_df * counts.shape[0], 1)
+    return counts[:, np.flatnonzero(keep)].tocsr()
+
+
+def keep_top_k(matrix: sparse.csr_matrix, k: int) -> sparse.csr_matrix:
+    """Keep the k largest entries of every row of a CSR matrix"""
+    matrix = matrix.tocsr()
+    matrix.sort_indices()
+    data = matrix.data.copy()
+    for row in range(matrix.shape[0]):
+        begin, end = matrix.indptr[row], matrix.indptr[row + 1]
+        if end - begin > k:
+            row_data = data[begin:end]
+            drop = np.argpartition(row_data, -k)[:-k]
+            row_data[drop] = 0
+    pruned = sparse.csr_matrix((data, matrix.indices, matrix.indptr), shape=matrix.shape)
+    pruned.eliminate_zeros()
+    return pruned
+
+
+def centroid_scores(counts: sparse.csr_matrix) -> np.ndarray:
+    """
+    Linear-time sentence scores: overlap with the document's term centroid,
+    normalized by sentence length. Used to pre-filter candidates and as the
+    cheap fallback ranker.
+    """
+    centroid = np.asarray(counts.sum(axis=0)).ravel()
+    lengths = np.asarray(counts.sum(axis=1)).ravel()
+    return counts.dot(centroid) / (lengths + 1.0)
+
+
+def power_iteration(transition: sparse.spmatrix, epsilon: float,
+                    damping: float = 1.0) -> np.ndarray:
+    """
+    Stationary distribution of the (optionally damped) row-stochastic matrix.
+    Damping adds the uniform (1 - damping) / n jump without materializing it.
+    """
+    n = transition.shape[0]
+    transposed = transition.T.tocsr()
+    p_vector = np.full(n, 1.0 / n)
+    teleport = (1.0 - damping) / n
+    lambda_val = 1.0
+    while lambda_val > epsilon:
+        next_p = damping * transposed.dot(p_vector)
+        if teleport:
+            next_p += teleport * p_vector.sum()
+        lambda_val = np.linalg.norm(next_p - p_vector)
+        p_vector = next_p
+    return p_vector
+
+
+def textrank_graph(counts: sparse.csr_matrix,
+                   top_k: Optional[int] = None) -> sparse.csr_matrix:
+    """
+    Row-normalized TextRank weights: shared word count divided by the sum of
+    the log sentence lengths, computed only for sentence pairs that share a term.
+    With top_k each sentence keeps only its k strongest edges.
+    """
+    lengths = np.asarray(counts.sum(axis=1)).ravel()
+    with np.errstate(divide='ignore'):
+        log_lengths = np.log(lengths)
+    
+    overlap = (counts @ counts.T).tocoo()
+    norm = log_lengths[overlap.row] + log_lengths[overlap.col]
+    near_zero = np.isclose(norm, 0.0)
+    values = np.divide(overlap.data, norm, out=overlap.data.copy(), where=~near_zero)
+    weights = sparse.csr_matrix((values, (overlap.row, overlap.col)), shape=overlap.shape)
+    if top_k is not None:
+        weights = keep_top_k(weights, top_k)
+    
+    row_sums = np.asarray(weights.sum(axis=1)).ravel() + _ZERO_DIVISION_PREVENTION
+    return sparse.diags(1.0 / row_sums) @ weights
+
+
+def lexrank_graph(counts: sparse.csr_matrix,
+                  threshold: float = LEXRANK_THRESHOLD,
+                  top_k: Optional[int] = None) -> sparse.csr_matrix:
+    """
+    Row-normalized LexRank adjacency: idf-modified cosine similarity between
+    sentences, binarized at the threshold. With top_k each sentence keeps only
+    its k most similar neighbours.
+    """
+    n = counts.shape[0]
+    
+    # tf relative to the most frequent term of each sentence
+    max_tf = counts.max(axis=1).toarray().ravel()
+    max_tf[max_tf == 0] = 1
+    tf = sparse.diags(1.0 / max_tf) @ counts
+    
+    # Every sentence is treated as a document
+    document_frequency = np.asarray((counts > 0).sum(axis=0)).ravel()
+    idf = np.log(n / (1.0 + document_frequency))
+    
+    vectors = (tf @ sparse.diags(idf)).tocsr()
+    norms = np.sqrt(np.asarray(vectors.multiply(vectors).sum(axis=1)).ravel())
+    inverse_norms = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+    vectors = sparse.diags(inverse_norms) @ vectors
+    
+    similarity = (vectors @ vectors.T).tocsr()
+    similarity.data[similarity.data <= threshold] = 0
+    if top_k is not None:
+        similarity = keep_top_k(similarity, top_k)
+    similarity.data = (similarity.data > threshold).astype(np.float64)
+    similarity.eliminate_zeros()
+    
+    degrees = np.asarray(similarity.sum(axis=1)).ravel()
+    degrees[degrees == 0] = 1
+    return sparse.diags(1.0 / degrees) @ similarity
+
+
+def textrank_scores(counts: sparse.csr_matrix, top_k: Optional[int] = None) -> np.ndarray:
+    return power_iteration(textrank_graph(counts, top_k=top_k), TEXTRANK_EPSILON, TEXTRANK_DAMPING)
+
+
+def lexrank_scores(counts: sparse.csr_matrix, top_k: Optional[int] = None) -> np.ndarray:
+    return power_iteration(lexrank_graph(counts, top_k=top_k), LEXRANK_EPSILON)
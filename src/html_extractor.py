@@ -0,0 +1,132 @@
+"""
+Incremental HTML-to-text extraction on top of html.parser.
+
+MainTextExtractor is fed chunks as they arrive from the network and keeps
+only paragraph-level text, preferring what sits inside <article>/<main>
+and skipping scripts, styles and page furniture (nav, header, footer, ...).
+"""
+from html.parser import HTMLParser
+from typing import List
+
+# Subtrees whose text is never article body
+SKIP_TAGS = frozenset({'script', 'style', 'noscript', 'template', 'svg', 'nav', 'header',
+                       'footer', 'aside', 'form', 'button', 'select', 'iframe', 'figcaption'})
+# Elements that hold body text
+BLOCK_TAGS = frozenset({'p', 'h1', 'h2', 'h3', 'h4', 'li', 'blockquote', 'pre'})
+# Containers that mark the main content when a page has them
+MAIN_TAGS = frozenset({'article', 'main'})
+# Never have a closing tag, so must not change nesting depth
+VOID_TAGS = frozenset({'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                       'link', 'meta', 'source', 'track', 'wbr'})
+# Elements that start a new line of rendered text: strip_tags separates
+# their text with whitespace, and runs inline text (<b>, <a>, ...) together
+BREAK_TAGS = BLOCK_TAGS | MAIN_TAGS | SKIP_TAGS | frozenset({
+    'address', 'body', 'br', 'dd', 'div', 'dl', 'dt', 'figure', 'h5', 'h6', 'hr', 'html',
+    'ol', 'section', 'table', 'td', 'th', 'title', 'tr', 'ul'})
+
+
+class MainTextExtractor(HTMLParser):
+    """Feed HTML with feed(); text() returns the extracted body, one block per line"""
+
+    def __init__(self, min_block_chars: int = 40):
+        super().__init__(convert_charrefs=True)
+        self.min_block_chars = min_block_chars
+        self._skip_depth = 0
+        self._main_depth = 0
+        self._in_block = False
+        self._current: List[str] = []
+        self._main_blocks: List[str] = []
+        self._other_blocks: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == 'br':
+                self.handle_data(' ')
+            return
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in MAIN_TAGS:
+            self._main_depth += 1
+        elif tag in BLOCK_TAGS:
+            # Blocks don't nest for our purposes; also covers unclosed <p>/<li>
+            self._finish_block()
+            self._in_block = True
+
+    def handle_startendtag(self, tag, attrs):
+        pass
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in MAIN_TAGS:
+            self._finish_block()
+            self._main_depth = max(0, self._main_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self._finish_block()
+
+    def handle_data(self, data):
+        if self._in_block and not self._skip_depth:
+            self._current.append(data)
+
+    def close(self):
+        super().close()
+        self._finish_block()
+
+    def _finish_block(self):
+        self._in_block = False
+        if not self._current:
+            return
+        block = ' '.join(''.join(self._current).split())
+        self._current = []
+        if len(block) >= self.min_block_chars:
+            (self._main_blocks if self._main_depth else self._other_blocks).append(block)
+
+    def text(self) -> str:
+        """Body text so far: the <article>/<main> blocks if there were any, else all blocks"""
+        return '\n'.join(self._main_blocks or self._other_blocks)
+
+    @property
+    def size(self) -> int:
+        return sum(len(block) for block in self._main_blocks or self._other_blocks)
+
+
+def extract_main_text(html: str, min_block_chars: int = 40) -> str:
+    """Body text of a complete HTML document"""
+    extractor = MainTextExtractor(min_block_chars)
+    extractor.feed(html)
+    extractor.close()
+    return extractor.text()
+
+
+class _TextStripper(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BREAK_TAGS:
+            self.parts.append(' ')
+        if tag in ('script', 'style', 'noscript', 'template'):
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in BREAK_TAGS:
+            self.parts.append(' ')
+        if tag in ('script', 'style', 'noscript', 'template'):
+            self._skip_depth = max(0, self._skip_depth - 1)
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def strip_tags(text: str) -> str:
+    """
+    All text of an HTML fragment without tags, scripts or styles (entities
+    decoded); block-level elements are separated by whitespace
+    """
+    stripper = _TextStripper()
+    stripper.feed(text)
+    stripper.close()
+    return ''.join(stripper.parts)
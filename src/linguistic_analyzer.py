@@ -1,34 +1,67 @@
-from nltk.corpus import wordnet
-from typing import List, Dict, Set
-import nltk
+import os
+from typing import List, Dict, Set, Optional
+from src.document import AnalyzedDocument
+from src.metrics import instrument
 
 class LinguisticAnalyzer:
-    def __init__(self):
+    def __init__(self, index_path: Optional[str] = None):
+        # WordNet POS tags; the corpus itself is loaded on first use
         self.pos_map = {
-            'NOUN': wordnet.NOUN,
-            'VERB': wordnet.VERB,
-            'ADJ': wordnet.ADJ,
-            'ADV': wordnet.ADV
+            'NOUN': 'n',
+            'VERB': 'v',
+            'ADJ': 'a',
+            'ADV': 'r'
         }
+        self._wordnet = None
+        
+        # Precomputed memory-mapped index (see src/wordnet_index.py), used when built
+        self.index_path = index_path
+        self._index = None
+    
+    @property
+    def index(self):
+        if self._index is None and self.index_path and os.path.exists(self.index_path):
+            from src.wordnet_index import WordNetIndex
+            self._index = WordNetIndex(self.index_path)
+        return self._index
+    
+    @property
+    def wordnet(self):
+        if self._wordnet is None:
+            from nltk.corpus import wordnet
+            wordnet.ensure_loaded()
+            self._wordnet = wordnet
+        return self._wordnet
     
+    def warm_up(self):
+        """Map the WordNet index, or load the NLTK corpus when there is none"""
+        if self.index is None:
+            self.wordnet
+        return self
+    
+    @instrument('linguistic_analyzer')
     def get_synonyms_antonyms(self, word: str, pos: str = None) -> Dict:
-        """Get synonyms and antonyms for a word"""
-        synonyms = set()
-        antonyms = set()
+        """Get synonyms and antonyms for a word, ranked by sense order"""
+        if self.index is not None:
+            return self.index.lookup(word)
+        
+        # Ordered de-duplication so results are deterministic
+        synonyms = {}
+        antonyms = {}
         
         # Get all synsets for the word
-        synsets = wordnet.synsets(word)
+        synsets = self.wordnet.synsets(word)
         
         for synset in synsets:
             # Get synonyms
             for lemma in synset.lemmas():
                 synonym = lemma.name().replace('_', ' ')
                 if synonym.lower() != word.lower():
-                    synonyms.add(synonym)
+                    synonyms.setdefault(synonym)
                 
                 # Get antonyms
                 for antonym in lemma.antonyms():
-                    antonyms.add(antonym.name().replace('_', ' '))
+                    antonyms.setdefault(antonym.name().replace('_', ' '))
         
         return {
             'word': word,
@@ -36,19 +69,34 @@ class LinguisticAnalyzer:
             'antonyms': list(antonyms)[:5]
         }
     
+    @instrument('linguistic_analyzer')
     def analyze_words(self, words: List[str]) -> List[Dict]:
         """Analyze multiple words for synonyms and antonyms"""
         results = []
-        for word in words:
-            analysis = self.get_synonyms_antonyms(word)
+        if self.index is not None:
+            analyses = self.index.lookup_many(words)
+        else:
+            analyses = [self.get_synonyms_antonyms(word) for word in words]
+        for analysis in analyses:
             if analysis['synonyms'] or analysis['antonyms']:
                 results.append(analysis)
         return results
     
+    @instrument('linguistic_analyzer')
+    def analyze_document(self, document: AnalyzedDocument, max_words: int = 5,
+                         stop_words: Optional[Set[str]] = None) -> List[Dict]:
+        """
+        Synonyms and antonyms for the most frequent nouns, verbs, adjectives
+        and adverbs of an analyzed document, using its POS tags
+        """
+        frequencies = document.word_frequencies(self.pos_map, stop_words)
+        return self.analyze_words([word for word, _ in frequencies.most_common(max_words)])
+    
+    @instrument('linguistic_analyzer')
     def get_word_definition(self, word: str) -> List[str]:
         """Get definitions for a word"""
         definitions = []
-        synsets = wordnet.synsets(word)
+        synsets = self.wordnet.synsets(word)
         
         for synset in synsets[:3]:  # Limit to 3 definitions
             definitions.append(synset.definition())
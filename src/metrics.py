@@ -0,0 +1,364 @@
+"""
+Lightweight instrumentation for the analysis components.
+
+    from src.metrics import metrics, instrument
+
+    class Summarizer:
+        @instrument('summarizer', 'summarize_text')
+        def summarize_text(self, text, ...): ...
+
+Instrumented calls record a latency histogram, an input size histogram and an
+error count per (component, operation). Caches report hits and misses with
+metrics.cache_result(). While metrics.enabled is False the wrappers only test
+that flag and call straight through. `with metrics.session(enabled):` overrides
+the flag for one request (e.g. one UI session) without touching the others.
+
+Export with metrics.to_prometheus() (text exposition format) or
+metrics.snapshot() (JSON-serializable dict). profile_request() wraps a single
+request in cProfile and/or tracemalloc; work it hands to thread pools is
+included when submitted through carry_context().
+"""
+import contextlib
+import contextvars
+import functools
+import io
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+LATENCY_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+                   0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1, 10, 100, 1000, 10000, 100000, 1000000)
+
+
+class Histogram:
+    """Cumulative-bucket histogram, as in Prometheus"""
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate by linear interpolation inside the bucket holding the q-th observation"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else 0.0,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'buckets': dict(zip([str(b) for b in self.buckets] + ['+Inf'], self.counts)),
+        }
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        # Per-request override of enabled, see session()
+        self._session = contextvars.ContextVar(f'metrics_session_{id(self)}', default=None)
+        self._lock = threading.Lock()
+        self._latency: Dict[Tuple[str, str], Histogram] = {}
+        self._sizes: Dict[Tuple[str, str], Histogram] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._cache: Dict[Tuple[str, str], int] = {}
+
+    def observe_call(self, component: str, operation: str, seconds: float,
+                     size: Optional[float] = None, error: bool = False):
+        key = (component, operation)
+        with self._lock:
+            latency = self._latency.get(key)
+            if latency is None:
+                latency = self._latency[key] = Histogram(LATENCY_BUCKETS)
+            latency.observe(seconds)
+            if size is not None:
+                sizes = self._sizes.get(key)
+                if sizes is None:
+                    sizes = self._sizes[key] = Histogram(SIZE_BUCKETS)
+                sizes.observe(size)
+            if error:
+                self._errors[key] = self._errors.get(key, 0) + 1
+
+    def is_enabled(self) -> bool:
+        """Whether calls are recorded in the current context"""
+        enabled = self._session.get()
+        return self.enabled if enabled is None else enabled
+
+    @contextlib.contextmanager
+    def session(self, enabled: bool):
+        """Record (or not) only what runs in this context, and in tasks given carry_context()"""
+        token = self._session.set(enabled)
+        try:
+            yield self
+        finally:
+            self._session.reset(token)
+
+    def cache_result(self, cache: str, result: str):
+        """Count one cache lookup; result is e.g. 'hit', 'stale' or 'miss'"""
+        if not self.is_enabled():
+            return
+        with self._lock:
+            self._cache[(cache, result)] = self._cache.get((cache, result), 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._latency.clear()
+            self._sizes.clear()
+            self._errors.clear()
+            self._cache.clear()
+
+    def snapshot(self) -> Dict:
+        """Everything recorded so far, JSON-serializable"""
+        with self._lock:
+            operations = {}
+            for (component, operation), latency in self._latency.items():
+                entry = {
+                    'latency_seconds': latency.to_dict(),
+                    'errors': self._errors.get((component, operation), 0),
+                }
+                sizes = self._sizes.get((component, operation))
+                if sizes is not None:
+                    entry['input_size'] = sizes.to_dict()
+                operations[f"{component}.{operation}"] = entry
+            caches = {}
+            for (cache, result), count in self._cache.items():
+                caches.setdefault(cache, {})[result] = count
+        return {'enabled': self.is_enabled(), 'timestamp': time.time(),
+                'operations': operations, 'caches': caches}
+
+    def summary_rows(self) -> List[Dict]:
+        """One flat row per operation, for tables"""
+        rows = []
+        for name, entry in sorted(self.snapshot()['operations'].items()):
+            latency = entry['latency_seconds']
+            rows.append({
+                'operation': name,
+                'calls': latency['count'],
+                'mean_ms': round(latency['mean'] * 1000, 2),
+                'p50_ms': round(latency['p50'] * 1000, 2),
+                'p95_ms': round(latency['p95'] * 1000, 2),
+                'total_s': round(latency['sum'], 3),
+                'errors': entry['errors'],
+            })
+        return rows
+
+    def to_prometheus(self, prefix: str = 'news') -> str:
+        """Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            for metric, histograms, help_text in (
+                (f'{prefix}_call_duration_seconds', self._latency, 'Latency of instrumented calls'),
+                (f'{prefix}_call_input_size', self._sizes, 'Input size (chars or items) of instrumented calls'),
+            ):
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} histogram")
+                for (component, operation), histogram in sorted(histograms.items()):
+                    labels = f'component="{component}",operation="{operation}"'
+                    cumulative = 0
+                    for bound, count in zip(list(histogram.buckets) + ['+Inf'], histogram.counts):
+                        cumulative += count
+                        lines.append(f'{metric}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f'{metric}_sum{{{labels}}} {histogram.sum}')
+                    lines.append(f'{metric}_count{{{labels}}} {histogram.count}')
+
+            metric = f'{prefix}_call_errors_total'
+            lines.append(f"# HELP {metric} Instrumented calls that raised or returned an error")
+            lines.append(f"# TYPE {metric} counter")
+            for (component, operation), count in sorted(self._errors.items()):
+                lines.append(f'{metric}{{component="{component}",operation="{operation}"}} {count}')
+
+            metric = f'{prefix}_cache_requests_total'
+            lines.append(f"# HELP {metric} Cache lookups by result")
+            lines.append(f"# TYPE {metric} counter")
+            for (cache, result), count in sorted(self._cache.items()):
+                lines.append(f'{metric}{{cache="{cache}",result="{result}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+
+
+def _input_size(args) -> Optional[int]:
+    """len() of the first argument after self, when it has one"""
+    if len(args) > 1:
+        try:
+            return len(args[1])
+        except TypeError:
+            return None
+    return None
+
+
+def instrument(component: str, operation: Optional[str] = None,
+               is_error: Optional[Callable[[object], bool]] = None,
+               sized: bool = True,
+               registry: Optional[MetricsRegistry] = None):
+    """
+    Method decorator recording latency, input size (len() of the first
+    argument, when sized) and errors. A call counts as an error when it
+    raises, or when is_error(result) is true.
+    """
+    def decorate(function):
+        name = operation or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            target = registry or metrics
+            if not target.is_enabled():
+                return function(*args, **kwargs)
+            size = _input_size(args) if sized else None
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            except Exception:
+                target.observe_call(component, name, time.perf_counter() - start, size, error=True)
+                raise
+            target.observe_call(component, name, time.perf_counter() - start, size,
+                                error=bool(is_error and is_error(result)))
+            return result
+        return wrapper
+    return decorate
+
+
+# The RequestProfile of the request running in this context, if any
+_current_profile = contextvars.ContextVar('current_profile', default=None)
+
+
+class RequestProfile:
+    """
+    Opt-in profiling of one request:
+
+        with profile_request() as profile:
+            executor.submit(carry_context(task))
+            handle_request()
+        print(profile.report())
+
+    cProfile only sees the thread that enabled it (before Python 3.12), so
+    tasks submitted through carry_context() are profiled on their own thread
+    and merged into the CPU report. tracemalloc covers every thread.
+    """
+
+    def __init__(self, cpu: bool = True, memory: bool = True):
+        self.cpu = cpu
+        self.memory = memory
+        self.profiler = None
+        self.elapsed = 0.0
+        self.peak_memory = 0
+        self.top_allocations: List[Tuple[str, int]] = []
+        self._task_profilers = []
+        self._lock = threading.Lock()
+
+    def run_task(self, function: Callable, *args, **kwargs):
+        """Run function (on another thread) and add its profile to this request's"""
+        if not self.cpu:
+            return function(*args, **kwargs)
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Python 3.12+: one profiler at a time, and the request's already sees every thread
+            return function(*args, **kwargs)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profiler.disable()
+            with self._lock:
+                self._task_profilers.append(profiler)
+
+    def __enter__(self):
+        self._token = _current_profile.set(self)
+        if self.memory:
+            import tracemalloc
+            self._tracing_before = tracemalloc.is_tracing()
+            if not self._tracing_before:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        if self.cpu:
+            import cProfile
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self._start
+        _current_profile.reset(self._token)
+        if self.profiler is not None:
+            self.profiler.disable()
+        if self.memory:
+            import tracemalloc
+            snapshot = tracemalloc.take_snapshot()
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            if not self._tracing_before:
+                tracemalloc.stop()
+            self.top_allocations = [
+                (str(stat.traceback[0]), stat.size)
+                for stat in snapshot.statistics('lineno')[:10]
+            ]
+        return False
+
+    def cpu_report(self, limit: int = 25, sort: str = 'cumulative') -> str:
+        if self.profiler is None:
+            return ''
+        import pstats
+        stream = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=stream)
+        with self._lock:
+            for profiler in self._task_profilers:
+                stats.add(profiler)
+        stats.sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def report(self, limit: int = 25) -> str:
+        parts = [f"Elapsed: {self.elapsed:.3f}s"]
+        if self.memory:
+            parts.append(f"Peak traced memory: {self.peak_memory / 1e6:.1f} MB")
+            parts.extend(f"  {size / 1e3:10.1f} KB  {where}" for where, size in self.top_allocations)
+        if self.profiler is not None:
+            parts.append(self.cpu_report(limit))
+        return '\n'.join(parts)
+
+
+def profile_request(cpu: bool = True, memory: bool = True) -> RequestProfile:
+    return RequestProfile(cpu, memory)
+
+
+def carry_context(function: Callable) -> Callable:
+    """
+    function bound to the caller's metrics session and request profile, for
+    submitting to a thread pool (which doesn't inherit them). Wrap once per task.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.run(_run_in_profile, function, *args, **kwargs)
+    return run
+
+
+def _run_in_profile(function: Callable, *args, **kwargs):
+    profile = _current_profile.get()
+    if profile is None:
+        return function(*args, **kwargs)
+    return profile.run_task(function, *args, **kwargs)
@@ -0,0 +1,298 @@
+"""
+Per-language analysis models, loaded on demand under a memory budget.
+
+Each language needs its own spaCy pipeline, sumy stemmer/tokenizer and
+stopword lists. Loading them all into every process at startup costs
+hundreds of MB per locale, most of it for languages the process may never
+see. The registry loads a language's models the first time an article in
+that language arrives, measures what they cost, and evicts the least
+recently used languages once the total exceeds the budget.
+
+    models = ModelRegistry(memory_budget_mb=1024)
+    language = models.language_of(article)  # GNews 'lang', else detected
+    bundle = models.get(language)
+    bundle.processor.analyze_many(texts)
+    bundle.summarizer.summarize_text(document)
+"""
+import gc
+import importlib.util
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from importlib import metadata
+from typing import Dict, Iterable, List, Optional
+
+from src.summarizer import NewsSummarizer
+from src.text_processor import TextProcessor
+
+logger = logging.getLogger(__name__)
+
+# ISO 639-1 code -> spaCy pipeline and the NLTK/sumy language name
+LANGUAGES = {
+    'en': {'spacy': 'en_core_web_sm', 'name': 'english'},
+    'de': {'spacy': 'de_core_news_sm', 'name': 'german'},
+    'fr': {'spacy': 'fr_core_news_sm', 'name': 'french'},
+    'es': {'spacy': 'es_core_news_sm', 'name': 'spanish'},
+    'it': {'spacy': 'it_core_news_sm', 'name': 'italian'},
+    'pt': {'spacy': 'pt_core_news_sm', 'name': 'portuguese'},
+    'nl': {'spacy': 'nl_core_news_sm', 'name': 'dutch'},
+    'sv': {'spacy': 'sv_core_news_sm', 'name': 'swedish'},
+    'ru': {'spacy': 'ru_core_news_sm', 'name': 'russian'},
+}
+
+# The most frequent function words of each language: enough to tell news
+# text apart after a sentence or two, without a detection model
+FUNCTION_WORDS = {
+    'en': {'the', 'and', 'of', 'to', 'in', 'is', 'that', 'for', 'with', 'was', 'on', 'it',
+           'he', 'as', 'are', 'by', 'this', 'from', 'at', 'have'},
+    'de': {'der', 'die', 'und', 'das', 'ist', 'nicht', 'den', 'mit', 'sich', 'des', 'auf',
+           'ein', 'eine', 'dem', 'auch', 'es', 'zu', 'im', 'wird', 'von'},
+    'fr': {'le', 'la', 'les', 'et', 'des', 'est', 'une', 'du', 'que', 'dans', 'pour',
+           'qui', 'au', 'sur', 'pas', 'avec', 'il', 'ce', 'aux', 'un'},
+    'es': {'el', 'la', 'los', 'las', 'y', 'que', 'del', 'en', 'por', 'una', 'con', 'para',
+           'se', 'es', 'su', 'al', 'como', 'pero', 'más', 'fue'},
+    'it': {'il', 'di', 'che', 'e', 'la', 'per', 'un', 'non', 'del', 'della', 'sono', 'gli',
+           'nel', 'anche', 'alla', 'con', 'una', 'ha', 'è', 'dei'},
+    'pt': {'o', 'de', 'que', 'e', 'do', 'da', 'em', 'um', 'para', 'com', 'não', 'uma', 'os',
+           'no', 'na', 'por', 'mais', 'as', 'dos', 'foi'},
+    'nl': {'de', 'het', 'een', 'en', 'van', 'is', 'dat', 'niet', 'op', 'zijn', 'met', 'voor',
+           'ook', 'die', 'er', 'aan', 'worden', 'bij', 'wordt', 'naar'},
+    'sv': {'och', 'att', 'det', 'som', 'en', 'på', 'är', 'av', 'för', 'med', 'till', 'den',
+           'har', 'inte', 'om', 'ett', 'var', 'jag', 'men', 'från'},
+}
+CYRILLIC = re.compile(r'[Ѐ-ӿ]')
+WORD = re.compile(r'[^\W\d_]+')
+
+# Words examined per text and the share of them that must be function words
+DETECT_WORDS = 200
+DETECT_MIN_SHARE = 0.05
+
+
+def normalize_language(language: Optional[str]) -> Optional[str]:
+    """'en-US', 'EN' and 'en_GB' -> 'en'; None for empty input"""
+    if not language:
+        return None
+    return re.split(r'[-_]', language.strip().lower(), maxsplit=1)[0] or None
+
+
+def detect_language(text: str, languages: Iterable[str] = LANGUAGES) -> Optional[str]:
+    """
+    Best guess of text's language among languages, by script and function
+    word counts; None when nothing is conclusive
+    """
+    candidates = set(languages)
+    if not text:
+        return None
+    sample = text[:4000]
+    if 'ru' in candidates and len(CYRILLIC.findall(sample)) > len(sample) // 4:
+        return 'ru'
+    words = WORD.findall(sample.lower())[:DETECT_WORDS]
+    if not words:
+        return None
+    hits = {
+        language: sum(word in FUNCTION_WORDS[language] for word in words)
+        for language in candidates if language in FUNCTION_WORDS
+    }
+    best = max(hits, key=hits.get, default=None)
+    if best is None or hits[best] < DETECT_MIN_SHARE * len(words):
+        return None
+    return best
+
+
+def model_installed(model: str) -> bool:
+    """Whether spacy.load(model) can find the pipeline: an installed package or a directory"""
+    return importlib.util.find_spec(model) is not None or os.path.isdir(model)
+
+
+def model_version(model: str) -> Optional[str]:
+    """Version of an installed spaCy pipeline package, or of a pipeline directory's meta.json"""
+    try:
+        return metadata.version(model)
+    except (metadata.PackageNotFoundError, ValueError):
+        pass
+    try:
+        with open(os.path.join(model, 'meta.json'), encoding='utf-8') as f:
+            return json.load(f).get('version')
+    except (OSError, ValueError):
+        return None
+
+
+def _rss_mb() -> Optional[float]:
+    """Resident set size of this process, where /proc is available"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+@dataclass
+class LanguageModels:
+    """The loaded models of one language"""
+    language: str
+    processor: TextProcessor
+    summarizer: NewsSummarizer
+    size_mb: float
+    loaded_at: float
+
+
+class ModelRegistry:
+    """
+    Thread-safe LRU cache of LanguageModels, capped at memory_budget_mb
+    (0 for no cap). A language's cost is the growth of the process RSS while
+    its models load, or estimate_mb where RSS cannot be read or warm_up is
+    off (the models then load on first use). The language just requested is
+    never evicted, so one language over budget still loads; evicted models
+    are freed once no caller holds them any more.
+    Unsupported or undetectable languages, and those whose spaCy pipeline is
+    not installed (see news.py), fall back to default_language.
+    """
+
+    def __init__(self,
+                 memory_budget_mb: float = 1024,
+                 default_language: str = 'en',
+                 languages: Optional[Iterable[str]] = None,
+                 spacy_models: Optional[Dict[str, str]] = None,
+                 estimate_mb: float = 150,
+                 warm_up: bool = True):
+        self.memory_budget_mb = memory_budget_mb
+        self.default_language = normalize_language(default_language)
+        self.languages = [normalize_language(language) for language in (languages or LANGUAGES)]
+        self.languages = [language for language in self.languages if language in LANGUAGES]
+        if self.default_language not in self.languages:
+            self.languages.insert(0, self.default_language)
+        self.spacy_models = {language: LANGUAGES[language]['spacy'] for language in self.languages}
+        self.spacy_models.update(spacy_models or {})
+        missing = [language for language in self.languages
+                   if language != self.default_language
+                   and not model_installed(self.spacy_models[language])]
+        if missing:
+            logger.warning("spaCy pipelines not installed for %s; their articles use %s models",
+                           ', '.join(missing), self.default_language)
+        self.languages = [language for language in self.languages if language not in missing]
+        self.spacy_models = {language: self.spacy_models[language] for language in self.languages}
+        self.estimate_mb = estimate_mb
+        self.warm_up = warm_up
+
+        self._versions: Dict[str, Optional[str]] = {}
+        self._loaded: 'OrderedDict[str, LanguageModels]' = OrderedDict()  # least recently used first
+        self._lock = threading.Lock()
+        # One load at a time, so RSS growth is attributed to the right language
+        self._load_lock = threading.Lock()
+        self.loads = 0
+        self.evictions = 0
+
+    def resolve(self, language: Optional[str]) -> str:
+        """The supported language to use for a requested one"""
+        language = normalize_language(language)
+        return language if language in self.spacy_models else self.default_language
+
+    def language_of(self, article: Dict) -> str:
+        """The fetch language of an article, else its detected language, else the default"""
+        language = normalize_language(article.get('lang') or article.get('language'))
+        if language not in self.spacy_models:
+            text = ' '.join(filter(None, (article.get('title'), article.get('description'),
+                                          article.get('content'))))
+            language = detect_language(text, self.languages)
+        return self.resolve(language)
+
+    def cache_params(self, language: Optional[str]) -> Dict:
+        """
+        What results analyzed in a language depend on, for analysis cache
+        keys: the resolved language and its spaCy pipeline and version
+        """
+        language = self.resolve(language)
+        model = self.spacy_models[language]
+        if language not in self._versions:
+            self._versions[language] = model_version(model)
+        return {'language': language, 'spacy_model': model,
+                'spacy_model_version': self._versions[language]}
+
+    def group(self, languages: List[str]) -> Dict[str, List[int]]:
+        """Positions of each language in a list, so every language's models run once per batch"""
+        positions: Dict[str, List[int]] = {}
+        for i, language in enumerate(languages):
+            positions.setdefault(self.resolve(language), []).append(i)
+        return positions
+
+    def get(self, language: Optional[str] = None) -> LanguageModels:
+        """The models of a language, loading them (and evicting others) if needed"""
+        language = self.resolve(language)
+        with self._lock:
+            models = self._loaded.get(language)
+            if models is not None:
+                self._loaded.move_to_end(language)
+                return models
+        with self._load_lock:
+            with self._lock:
+                models = self._loaded.get(language)
+            if models is None:
+                models = self._load(language)
+            with self._lock:
+                self._loaded[language] = models
+                self._loaded.move_to_end(language)
+                self._evict(keep=language)
+        return models
+
+    def processor(self, language: Optional[str] = None) -> TextProcessor:
+        return self.get(language).processor
+
+    def summarizer(self, language: Optional[str] = None) -> NewsSummarizer:
+        return self.get(language).summarizer
+
+    def _load(self, language: str) -> LanguageModels:
+        start = time.perf_counter()
+        name = LANGUAGES[language]['name']
+        processor = TextProcessor(self.spacy_models[language], language=name)
+        summarizer = NewsSummarizer(name)
+        size = self.estimate_mb
+        if self.warm_up:
+            before = _rss_mb()
+            processor.warm_up()
+            summarizer.warm_up()
+            after = _rss_mb()
+            if before is not None and after is not None:
+                size = after - before
+        self.loads += 1
+        logger.info("Loaded %s models (%s) in %.1fs, %.0f MB", language,
+                    self.spacy_models[language], time.perf_counter() - start, size)
+        return LanguageModels(language, processor, summarizer, max(size, 0.0), time.time())
+
+    def _evict(self, keep: str):
+        if not self.memory_budget_mb:
+            return
+        evicted = []
+        while (sum(models.size_mb for models in self._loaded.values()) > self.memory_budget_mb
+               and len(self._loaded) > 1):
+            language = next(iter(self._loaded))
+            if language == keep:
+                self._loaded.move_to_end(language)
+                continue
+            evicted.append(self._loaded.pop(language))
+        if evicted:
+            self.evictions += len(evicted)
+            logger.info("Evicted %s models to stay within %s MB",
+                        ', '.join(models.language for models in evicted), self.memory_budget_mb)
+            del evicted
+            gc.collect()
+
+    def loaded(self) -> List[str]:
+        """Loaded languages, least recently used first"""
+        with self._lock:
+            return list(self._loaded)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            sizes = {language: models.size_mb for language, models in self._loaded.items()}
+        return {
+            'loaded': sizes,
+            'memory_mb': sum(sizes.values()),
+            'memory_budget_mb': self.memory_budget_mb,
+            'loads': self.loads,
+            'evictions': self.evictions,
+        }
@@ -1,74 +1,97 @@
 import requests
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Optional, Iterator, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+import asyncio
 import json
+import logging
+import math
+import time
+from src.articles import Article
+from src.rate_limiter import RetryPolicy, TokenBucket
+from src.metrics import instrument, metrics
+from src.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+# GNews answers 403 with one of these once the daily request quota is used up
+QUOTA_ERROR_MARKERS = ('request limit', 'quota')
 
 class NewsFetcher:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str,
+                 base_url: str = "https://gnews.io/api/v4",
+                 timeout: float = 30,
+                 max_workers: int = 8,
+                 cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 max_page_size: int = 10,
+                 language: str = "en"):
         self.api_key = api_key
-        self.base_url = "https://gnews.io/api/v4"
+        self.language = language
+        self.cache = cache
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_workers = max_workers
+        
+        # Plan limits: requests/second (shared by all threads), articles per page
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.max_page_size = max_page_size
+        self._quota_exhausted_on = None
         
+        # Shared session so keep-alive connections are reused across calls
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._revalidator = ThreadPoolExecutor(max_workers=2) if cache else None
+        
+    @instrument('fetcher', is_error=lambda result: result['status'] != 'ok', sized=False)
     def get_top_headlines(self, 
                          country: str = "us", 
                          category: Optional[str] = None,
-                         page_size: int = 10) -> Dict:
+                         page_size: int = 10,
+                         timeout: Optional[float] = None,
+                         lang: Optional[str] = None) -> Dict:
         """
         Fetch top headlines from GNews API
         Categories: general, world, nation, business, technology, entertainment, sports, science, health
+        More than max_page_size articles are fetched as parallel pages.
+        lang defaults to the fetcher's language; articles are tagged with it.
         """
         endpoint = f"{self.base_url}/top-headlines"
         params = {
             'token': self.api_key,
             'country': country,
-            'max': min(page_size, 10),  # GNews API max is 10 for free tier
-            'lang': 'en'
+            'lang': lang or self.language
         }
         
         if category and category != 'general':
             params['category'] = category
             
-        try:
-            response = requests.get(endpoint, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Check if the response contains an error message
-            if 'error' in data:
-                return {
-                    "articles": [], 
-                    "status": "error", 
-                    "message": data.get('error', 'Unknown error from GNews API')
-                }
-            
-            # Convert GNews format to NewsAPI-like format for compatibility
-            return {
-                'status': 'ok',
-                'totalResults': data.get('totalArticles', 0),
-                'articles': self._convert_gnews_articles(data.get('articles', []))
-            }
-        except requests.exceptions.HTTPError as e:
-            error_msg = f"HTTP Error {e.response.status_code}: {e.response.text}"
-            print(f"Error fetching news: {error_msg}")
-            return {"articles": [], "status": "error", "message": error_msg}
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching news: {e}")
-            return {"articles": [], "status": "error", "message": str(e)}
+        return self._request_pages(endpoint, params, page_size, "Error fetching news", timeout)
     
+    @instrument('fetcher', is_error=lambda result: result['status'] != 'ok', sized=False)
     def search_news(self, 
                    query: str, 
                    from_date: Optional[str] = None,
-                   sort_by: str = "relevancy") -> Dict:
+                   sort_by: str = "relevancy",
+                   timeout: Optional[float] = None,
+                   max_results: int = 10,
+                   lang: Optional[str] = None) -> Dict:
         """
         Search for specific news articles using GNews API
         sort_by: relevancy, publishedAt
+        lang defaults to the fetcher's language; articles are tagged with it.
         """
         endpoint = f"{self.base_url}/search"
         
         params = {
             'token': self.api_key,
             'q': query,
-            'lang': 'en',
-            'max': 10  # GNews API max is 10 for free tier
+            'lang': lang or self.language
         }
         
         # GNews API uses different sort parameter values
@@ -81,62 +104,256 @@ class NewsFetcher:
         if from_date:
             params['from'] = from_date
             
+        return self._request_pages(endpoint, params, max_results, "Error searching news", timeout)
+    
+    def get_sources(self, category: Optional[str] = None) -> Dict:
+        """Get available news sources - Note: GNews doesn't have a sources endpoint"""
+        # GNews doesn't have a sources endpoint, so we'll return a mock response
+        # The category parameter is kept for API compatibility but not used
+        return {
+            "status": "ok",
+            "sources": [
+                {"id": "gnews", "name": "GNews", "description": "GNews aggregated sources"}
+            ]
+        }
+    
+    @property
+    def quota_exhausted(self) -> bool:
+        """True once today's quota is known to be used up (by our count or the API's)"""
+        today = datetime.now(timezone.utc).date()
+        if self._quota_exhausted_on == today:
+            return True
+        if self.cache is not None and self.cache.calls_today() >= self.cache.daily_quota:
+            self._quota_exhausted_on = today
+            return True
+        return False
+    
+    def _request_pages(self, endpoint: str, params: Dict, total: int, error_prefix: str,
+                       timeout: Optional[float] = None) -> Dict:
+        """
+        Up to total articles, max_page_size per request. The first page tells
+        how many results exist; the remaining pages are fetched in parallel.
+        Stops early (keeping what it has) on errors or an exhausted quota.
+        """
+        per_page = max(1, min(total, self.max_page_size))
+        first = self._request(endpoint, dict(params, max=per_page), error_prefix, timeout)
+        if first['status'] != 'ok' or total <= per_page:
+            return first
+        
+        available = min(total, first.get('totalResults') or 0)
+        pages = math.ceil(available / per_page)
+        if pages <= 1 or len(first['articles']) < per_page:
+            return first
+        
+        results = {1: first}
+        workers = max(1, min(self.max_workers, pages - 1))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._request, endpoint, dict(params, max=per_page, page=page),
+                                error_prefix, timeout): page
+                for page in range(2, pages + 1)
+            }
+            cancelled = False
+            for future in as_completed(futures):
+                if future.cancelled():
+                    # Skipped once the quota ran out: reported as partial below
+                    continue
+                results[futures[future]] = future.result()
+                if self.quota_exhausted and not cancelled:
+                    for pending in futures:
+                        pending.cancel()
+                    cancelled = True
+        
+        articles, seen, message = [], set(), None
+        for page in range(1, pages + 1):
+            result = results.get(page)
+            if result is None or result['status'] != 'ok':
+                message = result['message'] if result else "Daily GNews quota exhausted"
+                break
+            for article in result['articles']:
+                if article['url'] not in seen:
+                    seen.add(article['url'])
+                    articles.append(article)
+        
+        merged = {
+            'status': 'ok',
+            'totalResults': first.get('totalResults', 0),
+            'articles': articles[:total]
+        }
+        if message:
+            merged['partial'] = True
+            merged['message'] = message
+        return merged
+    
+    def _request(self, endpoint: str, params: Dict, error_prefix: str,
+                 timeout: Optional[float] = None) -> Dict:
+        """Serve from the response cache when possible, otherwise call the API"""
+        if self.cache is None:
+            return self._call_api(endpoint, params, error_prefix, timeout)
+        
+        key = self.cache.make_key(endpoint, params)
+        cached, state = self.cache.get(key)
+        metrics.cache_result('gnews_response', 'hit' if state == 'fresh' else state)
+        if state == 'fresh':
+            return cached
+        if state == 'stale':
+            # Stale-while-revalidate: answer now, refresh in the background
+            if self.cache.begin_refresh(key):
+                self._revalidator.submit(self._revalidate, key, endpoint, params, error_prefix, timeout)
+            return cached
+        
+        result = self._call_api(endpoint, params, error_prefix, timeout)
+        if result['status'] == 'ok':
+            self.cache.set(key, endpoint, result)
+        return result
+    
+    def _revalidate(self, key: str, endpoint: str, params: Dict, error_prefix: str,
+                    timeout: Optional[float] = None):
         try:
-            response = requests.get(endpoint, params=params)
-            response.raise_for_status()
-            data = response.json()
+            result = self._call_api(endpoint, params, error_prefix, timeout)
+            if result['status'] == 'ok':
+                self.cache.set(key, endpoint, result)
+        finally:
+            self.cache.end_refresh(key)
+    
+    @instrument('fetcher', 'gnews_request', is_error=lambda result: result['status'] != 'ok', sized=False)
+    def _call_api(self, endpoint: str, params: Dict, error_prefix: str,
+                  timeout: Optional[float] = None) -> Dict:
+        """
+        Perform a GET through the pooled session and normalize the response.
+        Waits for the rate limiter, retries 429/5xx and connection errors with
+        jittered exponential backoff (honoring Retry-After), and refuses to
+        call once the daily quota is exhausted.
+        """
+        attempt = 0
+        waited = 0.0
+        while True:
+            if self.quota_exhausted:
+                return {"articles": [], "status": "error", "message": "Daily GNews quota exhausted"}
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            if self.cache is not None:
+                self.cache.record_api_call()
+            
+            try:
+                response = self.session.get(endpoint, params=params,
+                                            timeout=timeout or self.timeout)
+            except requests.exceptions.RequestException as e:
+                delay = None
+                if self.retry_policy.should_retry(None, attempt):
+                    delay = self.retry_policy.delay(attempt, waited=waited)
+                if delay is not None:
+                    logger.warning("%s: %s; retrying in %.2fs", error_prefix, e, delay)
+                    time.sleep(delay)
+                    waited += delay
+                    attempt += 1
+                    continue
+                logger.error("%s: %s", error_prefix, e)
+                return {"articles": [], "status": "error", "message": str(e)}
+            
+            if response.status_code == 403 and any(
+                    marker in response.text.lower() for marker in QUOTA_ERROR_MARKERS):
+                self._quota_exhausted_on = datetime.now(timezone.utc).date()
+                logger.error("%s: daily quota exhausted", error_prefix)
+                return {"articles": [], "status": "error", "message": "Daily GNews quota exhausted"}
+            
+            if self.retry_policy.should_retry(response.status_code, attempt):
+                retry_after = response.headers.get('Retry-After')
+                delay = self.retry_policy.delay(attempt, retry_after, waited)
+                if delay is None:
+                    error_msg = (f"HTTP Error {response.status_code}: next retry "
+                                 f"(Retry-After: {retry_after}) exceeds the retry budget")
+                    logger.error("%s: %s", error_prefix, error_msg)
+                    return {"articles": [], "status": "error", "message": error_msg}
+                if retry_after and self.rate_limiter is not None:
+                    # Throttled: slow every worker down, not just this one
+                    self.rate_limiter.pause(delay)
+                logger.warning("%s: HTTP %s; retrying in %.2fs", error_prefix,
+                               response.status_code, delay)
+                time.sleep(delay)
+                waited += delay
+                attempt += 1
+                continue
+            
+            if response.status_code >= 400:
+                error_msg = f"HTTP Error {response.status_code}: {response.text}"
+                logger.error("%s: %s", error_prefix, error_msg)
+                return {"articles": [], "status": "error", "message": error_msg}
+            
+            try:
+                data = response.json()
+            except ValueError as e:
+                logger.error("%s: invalid JSON: %s", error_prefix, e)
+                return {"articles": [], "status": "error", "message": f"Invalid JSON: {e}"}
             
             # Check if the response contains an error message
-            if 'error' in data:
+            if 'error' in data or 'errors' in data:
                 return {
                     "articles": [], 
                     "status": "error", 
-                    "message": data.get('error', 'Unknown error from GNews API')
+                    "message": data.get('error') or '; '.join(data.get('errors') or []) or 'Unknown error from GNews API'
                 }
             
             # Convert GNews format to NewsAPI-like format for compatibility
             return {
                 'status': 'ok',
                 'totalResults': data.get('totalArticles', 0),
-                'articles': self._convert_gnews_articles(data.get('articles', []))
+                'articles': self._convert_gnews_articles(data.get('articles', []), params.get('lang'))
             }
-        except requests.exceptions.HTTPError as e:
-            error_msg = f"HTTP Error {e.response.status_code}: {e.response.text}"
-            print(f"Error searching news: {error_msg}")
-            return {"articles": [], "status": "error", "message": error_msg}
-        except requests.exceptions.RequestException as e:
-            print(f"Error searching news: {e}")
-            return {"articles": [], "status": "error", "message": str(e)}
     
-    def get_sources(self, category: Optional[str] = None) -> Dict:
-        """Get available news sources - Note: GNews doesn't have a sources endpoint"""
-        # GNews doesn't have a sources endpoint, so we'll return a mock response
-        # The category parameter is kept for API compatibility but not used
-        return {
-            "status": "ok",
-            "sources": [
-                {"id": "gnews", "name": "GNews", "description": "GNews aggregated sources"}
-            ]
-        }
+    def _fetch_one(self, spec: Dict, timeout: Optional[float] = None) -> Dict:
+        """Dispatch a single batch spec to the matching endpoint method"""
+        spec = dict(spec)
+        kind = spec.pop('type', 'top_headlines')
+        spec.setdefault('timeout', timeout)
+        if kind == 'search':
+            return self.search_news(**spec)
+        return self.get_top_headlines(**spec)
+    
+    def fetch_many(self, specs: List[Dict],
+                   max_workers: Optional[int] = None,
+                   timeout: Optional[float] = None) -> Iterator[Tuple[Dict, Dict]]:
+        """
+        Fetch many headline/search requests concurrently over the pooled session.
+        Each spec is a dict with 'type' ('top_headlines' or 'search') plus the
+        keyword arguments of the matching method, e.g.
+        {'type': 'top_headlines', 'country': 'us', 'category': 'business'}.
+        Yields (spec, result) pairs as they finish.
+        """
+        workers = max(1, min(max_workers or self.max_workers, len(specs) or 1))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(self._fetch_one, spec, timeout): spec for spec in specs}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
     
-    def _convert_gnews_articles(self, gnews_articles: List[Dict]) -> List[Dict]:
-        """Convert GNews article format to NewsAPI-like format for compatibility"""
-        converted_articles = []
+    async def fetch_many_async(self, specs: List[Dict],
+                               max_concurrency: Optional[int] = None,
+                               timeout: Optional[float] = None):
+        """
+        Asyncio variant of fetch_many. Requests run on worker threads through
+        the same pooled session, capped by a semaphore.
+        Async-iterates (spec, result) pairs as they finish.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_workers)
         
-        for article in gnews_articles:
-            converted_article = {
-                'source': {
-                    'id': None,
-                    'name': article.get('source', {}).get('name', 'Unknown')
-                },
-                'author': None,  # GNews doesn't provide author info
-                'title': article.get('title', ''),
-                'description': article.get('description', ''),
-                'url': article.get('url', ''),
-                'urlToImage': article.get('image', ''),
-                'publishedAt': article.get('publishedAt', ''),
-                'content': article.get('content', article.get('description', ''))
-            }
-            converted_articles.append(converted_article)
-            
-        return converted_articles
\ No newline at end of file
+        async def run(spec: Dict):
+            async with semaphore:
+                result = await asyncio.to_thread(self._fetch_one, spec, timeout)
+                return spec, result
+        
+        for coro in asyncio.as_completed([run(spec) for spec in specs]):
+            yield await coro
+    
+    def close(self):
+        """Release pooled connections"""
+        if self._revalidator is not None:
+            self._revalidator.shutdown(wait=False)
+        self.session.close()
+    
+    def _convert_gnews_articles(self, gnews_articles: List[Dict],
+                                lang: Optional[str] = None) -> List[Dict]:
+        """
+        Convert GNews article format to NewsAPI-like format for compatibility,
+        plus the 'lang' the articles were requested in (see src/articles.py)
+        """
+        return [Article.from_gnews(article, lang).to_dict() for article in gnews_articles]
\ No newline at end of file
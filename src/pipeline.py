@@ -0,0 +1,480 @@
+"""
+Headless streaming analysis pipeline.
+
+fetch -> body -> clean -> nlp -> summarize -> categorize, each stage with its own
+thread (or process) workers, connected by bounded queues so a slow stage
+applies backpressure upstream and memory stays constant.
+
+    python -m src.pipeline --input articles.jsonl --output results.jsonl
+    python -m src.pipeline --country us --country gb --category business --output results.jsonl
+    python -m src.pipeline --input articles.jsonl --full-text --body-workers 16
+    python -m src.pipeline --input articles.jsonl --stories
+
+The body stage only does work with --full-text: it downloads each article's
+page and analyzes the extracted body instead of the GNews snippet.
+
+With --stories, articles are grouped into stories as they arrive and, instead
+of one summary per article, one summary per story is written after the
+articles (records with 'story_summary'). Each story's texts are kept until
+then.
+
+Each article is analyzed with the spaCy and sumy models of its language (its
+fetch 'lang', else detected; --language forces one), loaded per worker
+process the first time that language comes up (see src/model_registry.py).
+"""
+import argparse
+import json
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from queue import Queue
+from typing import Dict, Iterable, Iterator, List, Optional
+
+DEFAULT_SETTINGS = {
+    'num_keywords': 10,
+    'summary_method': 'textrank',
+    'summary_length': 3,
+    'summary_time_budget': None,
+    'summary_max_sentences': None,
+    'key_phrases': 5,
+    'topic_model_path': None,
+    'analysis_cache_path': None,
+    'dedupe': False,
+    'stories': False,
+    'full_text': False,
+    'body_cache_path': None,
+    'spacy_model': None,  # overrides the default language's pipeline
+    'language': None,  # analyze everything as this language instead of routing per article
+}
+
+# Parameters that key the analysis cache (shared with app.py) and the fields it stores
+CACHE_PARAMS = ('summary_method', 'summary_length', 'num_keywords')
+CACHED_FIELDS = ('keywords', 'entities', 'summary', 'category', 'key_phrases')
+
+STAGE_NAMES = ['body', 'clean', 'nlp', 'summarize', 'categorize']
+# The body stage waits on the network, so it gets more workers by default
+DEFAULT_WORKERS = {'body': 8}
+
+# Per-process analysis components, built lazily by whichever worker needs them first
+_settings = dict(DEFAULT_SETTINGS)
+_components = {}
+_components_lock = threading.Lock()
+_DONE = object()
+
+
+def _init_worker(settings: Dict):
+    _settings.update(settings)
+
+
+def _component(name: str):
+    with _components_lock:
+        if name not in _components:
+            if name == 'processor':
+                # Cleaning only: nothing here loads its spaCy model
+                from src.text_processor import TextProcessor
+                _components[name] = TextProcessor()
+            elif name == 'models':
+                from config.config import Config
+                from src.model_registry import ModelRegistry
+                spacy_model = _settings['spacy_model']
+                _components[name] = ModelRegistry(
+                    Config.MODEL_MEMORY_BUDGET_MB,
+                    Config.DEFAULT_LANGUAGE,
+                    Config.SUPPORTED_LANGUAGES,
+                    spacy_models={Config.DEFAULT_LANGUAGE: spacy_model} if spacy_model else None
+                )
+            elif name == 'extractor':
+                from src.topic_extractor import TopicExtractor
+                _components[name] = TopicExtractor(_settings['topic_model_path'])
+            elif name == 'body_fetcher':
+                from src.article_body import ArticleBodyFetcher, BodyCache
+                path = _settings['body_cache_path']
+                _components[name] = ArticleBodyFetcher(cache=BodyCache(path) if path else None)
+            elif name == 'analysis_cache':
+                from src.analysis_cache import AnalysisCache
+                path = _settings['analysis_cache_path']
+                _components[name] = AnalysisCache(path) if path else None
+        return _components[name]
+
+
+def body_stage(item: Dict) -> Dict:
+    if _settings['full_text']:
+        item['body'] = _component('body_fetcher').fetch(item['article'].get('url', ''))
+    return item
+
+
+def clean_stage(item: Dict) -> Dict:
+    article = item['article']
+    content = item.get('body') or article.get('description') or article.get('content') or ""
+    item['clean_content'] = _component('processor').clean_text(content)
+    # Routing only: a language's models load when the nlp stage first needs them
+    models = _component('models')
+    item['language'] = models.resolve(_settings['language'] or models.language_of(article))
+    
+    # Previously analyzed content skips the remaining stages
+    cache = _component('analysis_cache')
+    if cache is not None and item['clean_content']:
+        cached = cache.get(item['clean_content'], _cache_params(item['language']))
+        # Entries written in stories mode have no per-article summary
+        if cached is not None and (_settings['stories'] or 'summary' in cached):
+            item.update(cached)
+            item['cached'] = True
+    return item
+
+
+def _cache_params(language: str) -> Dict:
+    params = {name: _settings[name] for name in CACHE_PARAMS}
+    params.update(_component('models').cache_params(language))
+    return params
+
+
+def nlp_stage(item: Dict) -> Dict:
+    # Parsed once here; the later stages reuse the document instead of re-tokenizing
+    keywords, entities = [], []
+    item['document'] = None
+    if item['clean_content']:
+        processor = _component('models').processor(item['language'])
+        item['document'] = processor.analyze(item['clean_content'])
+        keywords, entities = processor.important_words(
+            item['document'],
+            _settings['num_keywords']
+        )
+    item['keywords'] = keywords
+    item['entities'] = entities
+    return item
+
+
+def summarize_stage(item: Dict) -> Dict:
+    if _settings['stories']:
+        return item  # summarized per story once all articles are in
+    item['summary'] = _component('models').summarizer(item['language']).summarize_text(
+        item['document'] or item['clean_content'],
+        _settings['summary_length'],
+        _settings['summary_method'],
+        time_budget=_settings['summary_time_budget'],
+        max_sentences=_settings['summary_max_sentences']
+    )
+    return item
+
+
+def categorize_stage(item: Dict) -> Dict:
+    extractor = _component('extractor')
+    text = item['clean_content']
+    document = item.pop('document') or text
+    item['category'] = extractor.categorize_article(document)
+    item['key_phrases'] = extractor.extract_key_phrases(document, _settings['key_phrases'])
+    
+    # Dominant topic from the persistent topic model, when one has been trained
+    if extractor.topic_model is not None and extractor.topic_model.is_fitted and text:
+        item['topic'] = int(extractor.infer_topics([text])[0].argmax())
+    
+    cache = _component('analysis_cache')
+    if cache is not None and text:
+        cache.set(text, _cache_params(item['language']),
+                  {field: item[field] for field in CACHED_FIELDS if field in item})
+    return item
+
+
+STAGE_FUNCTIONS = {
+    'body': body_stage,
+    'clean': clean_stage,
+    'nlp': nlp_stage,
+    'summarize': summarize_stage,
+    'categorize': categorize_stage,
+}
+
+
+def fetch_articles(fetcher, specs: List[Dict]) -> Iterator[Dict]:
+    """Fetch stage: stream articles from NewsFetcher.fetch_many as requests finish"""
+    for spec, result in fetcher.fetch_many(specs):
+        if result.get('status') != 'ok':
+            print(f"Error fetching {spec}: {result.get('message')}", file=sys.stderr)
+            continue
+        yield from result['articles']
+
+
+def read_articles(path: str) -> Iterator[Dict]:
+    """Stream articles from a JSONL file, one article object per line"""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class NewsPipeline:
+    """
+    Runs articles through the analysis stages concurrently.
+    workers: number of workers per stage name (default 1 each).
+    process_stages: stage names whose workers run in separate processes.
+    """
+    
+    def __init__(self, 
+                 settings: Optional[Dict] = None,
+                 workers: Optional[Dict[str, int]] = None,
+                 process_stages: Iterable[str] = (),
+                 queue_size: int = 32):
+        self.settings = dict(DEFAULT_SETTINGS, **(settings or {}))
+        workers = dict(DEFAULT_WORKERS, **(workers or {}))
+        self.workers = {name: max(1, workers.get(name, 1)) for name in STAGE_NAMES}
+        self.process_stages = set(process_stages)
+        self.queue_size = queue_size
+    
+    def run(self, articles: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Yield analyzed items (in completion order, each with its input 'index').
+        With the dedupe setting, near-duplicates are yielded unanalyzed with
+        'duplicate_of' set to the index of their cluster's analyzed article.
+        With the stories setting, items get a 'story_id' and no summary.
+        If reading articles fails, the items already fed are still yielded,
+        then the error is raised.
+        """
+        _init_worker(self.settings)
+        queues = [Queue(maxsize=self.queue_size) for _ in range(len(STAGE_NAMES) + 1)]
+        executors = {
+            name: ProcessPoolExecutor(
+                max_workers=self.workers[name],
+                initializer=_init_worker,
+                initargs=(self.settings,)
+            )
+            for name in STAGE_NAMES if name in self.process_stages
+        }
+        
+        deduplicator = None
+        if self.settings['dedupe']:
+            from src.deduplicator import ArticleDeduplicator
+            deduplicator = ArticleDeduplicator()
+        clusterer = None
+        if self.settings['stories']:
+            from config.config import Config
+            from src.story_clusterer import StoryClusterer
+            clusterer = StoryClusterer(Config.STORY_SIMILARITY_THRESHOLD)
+        
+        feed_errors = []
+        
+        def feed():
+            try:
+                for index, article in enumerate(articles):
+                    item = {'index': index, 'article': article}
+                    if clusterer is not None:
+                        item['story_id'] = clusterer.add(article)['story_id']
+                    if deduplicator is not None:
+                        assignment = deduplicator.add(article)
+                        item['cluster_id'] = assignment['cluster_id']
+                        if assignment['duplicate_of'] is not None:
+                            # Near-duplicate of an article already analyzed: skip the stages
+                            item['duplicate_of'] = assignment['duplicate_of']
+                            queues[-1].put(item)
+                            continue
+                    queues[0].put(item)
+            except BaseException as e:
+                # Raised from run() once the stages have drained
+                feed_errors.append(e)
+            finally:
+                # Always shut the stages down, or they and the consumer wait forever
+                for _ in range(self.workers[STAGE_NAMES[0]]):
+                    queues[0].put(_DONE)
+        
+        threads = [threading.Thread(target=feed, daemon=True)]
+        for position, name in enumerate(STAGE_NAMES):
+            remaining = [self.workers[name]]
+            lock = threading.Lock()
+            threads.extend(
+                threading.Thread(
+                    target=self._work,
+                    args=(name, queues[position], queues[position + 1],
+                          executors.get(name), remaining, lock),
+                    daemon=True
+                )
+                for _ in range(self.workers[name])
+            )
+        
+        for thread in threads:
+            thread.start()
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _DONE:
+                    break
+                yield item
+            if feed_errors:
+                raise feed_errors[0]
+        finally:
+            for executor in executors.values():
+                executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _work(self, name: str, inbox: Queue, outbox: Queue, executor,
+              remaining: List[int], lock: threading.Lock):
+        function = STAGE_FUNCTIONS[name]
+        while True:
+            item = inbox.get()
+            if item is _DONE:
+                break
+            if 'error' not in item and not item.get('cached'):
+                try:
+                    if executor is not None:
+                        item = executor.submit(function, item).result()
+                    else:
+                        item = function(item)
+                except Exception as e:
+                    print(f"Error in {name} stage: {e}", file=sys.stderr)
+                    item['error'] = f"{name}: {e}"
+            outbox.put(item)
+        
+        # The last worker of a stage signals every worker of the next one
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            next_position = STAGE_NAMES.index(name) + 1
+            downstream = self.workers[STAGE_NAMES[next_position]] if next_position < len(STAGE_NAMES) else 1
+            for _ in range(downstream):
+                outbox.put(_DONE)
+
+
+def to_record(item: Dict) -> Dict:
+    """Flatten a pipeline item into the JSONL output record"""
+    article = item['article']
+    record = {
+        'index': item['index'],
+        'title': article.get('title'),
+        'url': article.get('url'),
+        'source': (article.get('source') or {}).get('name'),
+        'publishedAt': article.get('publishedAt'),
+    }
+    for key in ('cluster_id', 'duplicate_of', 'story_id', 'language', 'summary', 'keywords', 'entities', 'category',
+                'key_phrases', 'topic', 'cached', 'error'):
+        if key in item:
+            record[key] = item[key]
+    return record
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--input', help="JSONL file of articles (NewsAPI-like format)")
+    parser.add_argument('--country', action='append', help="fetch top headlines for country (repeatable)")
+    parser.add_argument('--category', action='append', help="fetch top headlines for category (repeatable)")
+    parser.add_argument('--query', action='append', help="fetch search results for query (repeatable)")
+    parser.add_argument('--output', default='-', help="JSONL output path, '-' for stdout")
+    parser.add_argument('--summary-method', default=DEFAULT_SETTINGS['summary_method'])
+    parser.add_argument('--summary-length', type=int, default=DEFAULT_SETTINGS['summary_length'])
+    parser.add_argument('--summary-time-budget', type=float)
+    parser.add_argument('--num-keywords', type=int, default=DEFAULT_SETTINGS['num_keywords'])
+    parser.add_argument('--language', help="fetch and analyze in this language "
+                                           "(default: fetch in Config.DEFAULT_LANGUAGE, "
+                                           "analyze each article in its own)")
+    parser.add_argument('--dedupe', action='store_true',
+                        help="analyze only one article per near-duplicate cluster")
+    parser.add_argument('--stories', action='store_true',
+                        help="group articles into stories and write one summary per story")
+    parser.add_argument('--analysis-cache', help="SQLite analysis cache path (reuses prior results)")
+    parser.add_argument('--queue-size', type=int, default=32)
+    parser.add_argument('--trending', help="update the trending tracker saved at this path (.npz)")
+    parser.add_argument('--metrics', help="write a JSON metrics snapshot here ('.prom' for Prometheus text)")
+    parser.add_argument('--full-text', action='store_true',
+                        help="fetch and analyze each article's full page instead of the snippet")
+    parser.add_argument('--body-cache', help="SQLite cache path for fetched article bodies")
+    for name in STAGE_NAMES:
+        parser.add_argument(f'--{name}-workers', type=int, default=DEFAULT_WORKERS.get(name, 1))
+    parser.add_argument('--processes', nargs='*', default=[], choices=STAGE_NAMES,
+                        help="stages to run in worker processes instead of threads")
+    args = parser.parse_args(argv)
+    
+    if args.input:
+        articles = read_articles(args.input)
+    else:
+        from config.config import Config
+        from src.news_fetcher import NewsFetcher
+        from src.rate_limiter import TokenBucket
+        specs = [{'type': 'search', 'query': query} for query in args.query or []]
+        if args.country or args.category or not specs:
+            specs += [
+                {'type': 'top_headlines', 'country': country, 'category': category}
+                for country in args.country or [Config.DEFAULT_COUNTRY]
+                for category in args.category or ['general']
+            ]
+        fetcher = NewsFetcher(
+            Config.GNEWS_API_KEY,
+            rate_limiter=TokenBucket(Config.GNEWS_RATE_LIMIT),
+            max_page_size=Config.GNEWS_MAX_PAGE_SIZE,
+            language=args.language or Config.DEFAULT_LANGUAGE
+        )
+        articles = fetch_articles(fetcher, specs)
+    
+    pipeline = NewsPipeline(
+        settings={
+            'num_keywords': args.num_keywords,
+            'summary_method': args.summary_method,
+            'summary_length': args.summary_length,
+            'summary_time_budget': args.summary_time_budget,
+            'analysis_cache_path': args.analysis_cache,
+            'dedupe': args.dedupe,
+            'stories': args.stories,
+            'full_text': args.full_text,
+            'body_cache_path': args.body_cache,
+            'language': args.language,
+        },
+        workers={name: getattr(args, f'{name}_workers') for name in STAGE_NAMES},
+        process_stages=args.processes,
+        queue_size=args.queue_size
+    )
+    
+    if args.metrics:
+        from src.metrics import metrics
+        metrics.enabled = True
+    
+    trending = None
+    if args.trending:
+        from src.search_index import parse_published_at
+        from src.trending import TrendingTracker, article_phrases
+        trending = TrendingTracker.load_or_create(args.trending)
+    
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    count = 0
+    story_texts: Dict[int, List] = {}
+    try:
+        for item in pipeline.run(articles):
+            output.write(json.dumps(to_record(item)) + '\n')
+            count += 1
+            if 'story_id' in item and item.get('clean_content'):
+                story_texts.setdefault(item['story_id'], []).append(
+                    (item['index'], item['clean_content'], item.get('language'))
+                )
+            if trending is not None and 'entities' in item:
+                article = item['article']
+                trending.add(
+                    article_phrases(item['entities'], item.get('key_phrases', [])),
+                    parse_published_at(article.get('publishedAt')) or None,
+                    key=article.get('url') or None
+                )
+        print(f"Processed {count} articles", file=sys.stderr)
+        if story_texts:
+            models = _component('models')
+            for story_id, members in story_texts.items():
+                members.sort()
+                # In the language of the story's first article
+                summarizer = models.summarizer(members[0][2])
+                output.write(json.dumps({
+                    'story_id': story_id,
+                    'indices': [index for index, _, _ in members],
+                    'story_summary': summarizer.summarize_cluster(
+                        [text for _, text, _ in members], args.summary_length, args.summary_method
+                    ),
+                }) + '\n')
+            print(f"Summarized {len(story_texts)} stories", file=sys.stderr)
+        if trending is not None:
+            trending.save(args.trending)
+        if args.metrics:
+            # Calls made in worker processes are not included
+            with open(args.metrics, 'w', encoding='utf-8') as f:
+                if args.metrics.endswith('.prom'):
+                    f.write(metrics.to_prometheus())
+                else:
+                    json.dump(metrics.snapshot(), f, indent=2)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
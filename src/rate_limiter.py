@@ -0,0 +1,125 @@
+import random
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` requests per second on average, bursts
+    of up to `capacity`. A server-requested pause (Retry-After) blocks every
+    caller sharing the bucket, not just the one that was throttled.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests: float, burst: Optional[float] = None) -> 'TokenBucket':
+        """Bucket for a plan limit given in requests per minute"""
+        return cls(requests / 60.0, burst)
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _wait_time(self, tokens: float, now: float) -> float:
+        """Seconds until tokens are available; takes them when they already are"""
+        if now < self._paused_until:
+            return self._paused_until - now
+        self._refill(now)
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return 0.0
+        return (tokens - self._tokens) / self.rate
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        with self._lock:
+            return self._wait_time(tokens, time.monotonic()) == 0.0
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """Block until tokens are available. Returns False if that would exceed timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._wait_time(tokens, now)
+            if wait == 0.0:
+                return True
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold back all callers for seconds (e.g. a Retry-After), and drop the burst"""
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = 0.0
+            self._updated = max(now, self._paused_until)
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter, honoring Retry-After when the server
+    sends one. Retries stop once their total delay would exceed max_total_delay:
+    waiting out a Retry-After longer than what is left of that budget is
+    pointless, so delay() returns None to give up instead.
+    """
+
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(self, max_retries: int = 4, base_delay: float = 0.5,
+                 max_delay: float = 30.0, seed: Optional[int] = None,
+                 max_total_delay: float = 120.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_total_delay = max_total_delay
+        self._random = random.Random(seed)
+
+    def should_retry(self, status: Optional[int], attempt: int) -> bool:
+        """status None means a connection error or timeout"""
+        return attempt < self.max_retries and (status is None or status in self.RETRY_STATUSES)
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None,
+              waited: float = 0.0) -> Optional[float]:
+        """
+        Seconds to wait before retry number attempt + 1, given the seconds
+        already waited on earlier retries; None when the retry budget can't
+        cover it
+        """
+        server_delay = parse_retry_after(retry_after)
+        backoff = min(self.max_delay, self.base_delay * (2 ** attempt))
+        jittered = self._random.uniform(0, backoff)
+        if server_delay is not None:
+            # Never earlier than the server asked; jitter spreads the workers out
+            delay = max(server_delay, jittered) + jittered * 0.1
+        else:
+            delay = jittered
+        if waited + delay > self.max_total_delay:
+            return None
+        return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
@@ -0,0 +1,194 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+class ResponseCache:
+    """
+    TTL + LRU cache for GNews API responses with an optional SQLite tier.
+    Entries past their TTL are still served as stale (and revalidated by the
+    caller) until stale_ttl runs out. The SQLite tier drops expired rows on
+    open and every purge_every writes, and keeps at most max_db_entries.
+    """
+    
+    def __init__(self, 
+                 ttl: float = 900,
+                 endpoint_ttls: Optional[Dict[str, float]] = None,
+                 stale_ttl: float = 3600,
+                 max_entries: int = 256,
+                 path: Optional[str] = None,
+                 daily_quota: int = 100,
+                 max_db_entries: int = 10000,
+                 purge_every: int = 100):
+        self.ttl = ttl
+        self.endpoint_ttls = endpoint_ttls or {}
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.daily_quota = daily_quota
+        self.max_db_entries = max_db_entries
+        self.purge_every = purge_every
+        self._writes = 0
+
+        self._memory = OrderedDict()  # key -> (endpoint, stored_at, value)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'api_calls': 0}
+        self._calls_by_day = {}
+        
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, endpoint TEXT, stored_at REAL, value TEXT)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS quota (day TEXT PRIMARY KEY, calls INTEGER)"
+            )
+            self._purge()
+            self._db.commit()
+    
+    @staticmethod
+    def make_key(endpoint: str, params: Dict) -> str:
+        """Normalize endpoint and params (minus the API token) into a cache key"""
+        normalized = {
+            k: str(v).strip().lower()
+            for k, v in params.items()
+            if k != 'token' and v is not None
+        }
+        return f"{endpoint.rstrip('/')}?{json.dumps(normalized, sort_keys=True)}"
+    
+    def ttl_for(self, endpoint: str) -> float:
+        """TTL for an endpoint, looked up by its last path segment (e.g. 'search')"""
+        return self.endpoint_ttls.get(endpoint.rstrip('/').rsplit('/', 1)[-1], self.ttl)
+    
+    def get(self, key: str) -> Tuple[Optional[Dict], str]:
+        """
+        Look up a key.
+        Returns (value, state) where state is 'fresh', 'stale' or 'miss'
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT endpoint, stored_at, value FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row:
+                    entry = (row[0], row[1], json.loads(row[2]))
+                    self._put_memory(key, entry)
+            
+            if entry is None:
+                self._stats['misses'] += 1
+                return None, 'miss'
+            
+            endpoint, stored_at, value = entry
+            age = time.time() - stored_at
+            ttl = self.ttl_for(endpoint)
+            if age <= ttl:
+                self._memory.move_to_end(key)
+                self._stats['hits'] += 1
+                return value, 'fresh'
+            if age <= ttl + self.stale_ttl:
+                self._memory.move_to_end(key)
+                self._stats['stale_hits'] += 1
+                return value, 'stale'
+            
+            self._stats['misses'] += 1
+            return None, 'miss'
+    
+    def set(self, key: str, endpoint: str, value: Dict):
+        """Store a response"""
+        entry = (endpoint, time.time(), value)
+        with self._lock:
+            self._put_memory(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                    (key, endpoint, entry[1], json.dumps(value))
+                )
+                self._writes += 1
+                if self._writes % self.purge_every == 0:
+                    self._purge()
+                self._db.commit()
+    
+    def _purge(self):
+        """Delete rows no endpoint would serve even stale, then the oldest beyond max_db_entries"""
+        longest_ttl = max([self.ttl, *self.endpoint_ttls.values()])
+        self._db.execute(
+            "DELETE FROM responses WHERE stored_at < ?",
+            (time.time() - longest_ttl - self.stale_ttl,)
+        )
+        self._db.execute(
+            "DELETE FROM responses WHERE key IN "
+            "(SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_db_entries,)
+        )
+    
+    def _put_memory(self, key: str, entry: Tuple):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+    
+    def begin_refresh(self, key: str) -> bool:
+        """Claim a background revalidation slot; False if one is already running"""
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            return True
+    
+    def end_refresh(self, key: str):
+        with self._lock:
+            self._refreshing.discard(key)
+    
+    def record_api_call(self):
+        """Count one request actually sent to the API against today's quota"""
+        day = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        with self._lock:
+            self._stats['api_calls'] += 1
+            self._calls_by_day[day] = self._calls_by_day.get(day, 0) + 1
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT INTO quota VALUES (?, 1) "
+                    "ON CONFLICT(day) DO UPDATE SET calls = calls + 1",
+                    (day,)
+                )
+                self._db.commit()
+    
+    def calls_today(self) -> int:
+        day = datetime.now(timezone.utc).strftime('%Y-%m-%d')
+        with self._lock:
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT calls FROM quota WHERE day = ?", (day,)
+                ).fetchone()
+                return row[0] if row else 0
+            return self._calls_by_day.get(day, 0)
+    
+    def stats(self) -> Dict:
+        """Hit/miss counters, API calls saved and remaining daily quota"""
+        calls_today = self.calls_today()
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._memory)
+        lookups = stats['hits'] + stats['stale_hits'] + stats['misses']
+        # Stale hits still trigger a background revalidation call
+        stats['api_calls_saved'] = stats['hits']
+        stats['hit_rate'] = (stats['hits'] + stats['stale_hits']) / lookups if lookups else 0.0
+        stats['quota_used_today'] = calls_today
+        stats['quota_remaining'] = max(self.daily_quota - calls_today, 0)
+        return stats
+    
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
@@ -0,0 +1,342 @@
+import json
+import math
+import mmap
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.deduplicator import normalize_url
+
+
+def encode_varints(values: Iterable[int]) -> bytearray:
+    out = bytearray()
+    for value in values:
+        while value >= 0x80:
+            out.append((value & 0x7F) | 0x80)
+            value >>= 7
+        out.append(value)
+    return out
+
+
+def decode_varints(data, start: int, end: int) -> List[int]:
+    values = []
+    value = shift = 0
+    for byte in data[start:end]:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append(value)
+            value = shift = 0
+    return values
+
+
+def parse_published_at(value: str) -> float:
+    """Unix timestamp of a GNews publishedAt string (0 when missing or invalid)"""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except (AttributeError, ValueError):
+        return 0.0
+
+
+class ArticleSearchIndex:
+    """
+    Append-only on-disk BM25 index over fetched articles.
+    
+    Every add_articles() call writes an immutable segment: a postings file
+    of varint-encoded (doc id delta, term frequency) pairs plus a JSON term
+    dictionary. Articles are appended to docs.jsonl and per-document length,
+    publish time and file offset live in meta.npz. Searches score all
+    segments with BM25 and multiply in a recency boost on publishedAt.
+    Tokenization reuses TextProcessor (clean_text and its stop words).
+    
+    Segments are merged to keep their number logarithmic in the number of
+    documents: beyond merge_factor segments per power of merge_factor
+    documents, the adjacent run of merge_factor segments with the fewest
+    documents is rewritten as one (so mostly the small, recent ones).
+    """
+    
+    def __init__(self, directory: str, processor=None,
+                 k1: float = 1.2, b: float = 0.75,
+                 recency_weight: float = 0.5,
+                 recency_half_life_hours: float = 48.0,
+                 merge_factor: int = 8):
+        if processor is None:
+            from src.text_processor import TextProcessor
+            processor = TextProcessor()
+        self.directory = directory
+        self.processor = processor
+        self.k1 = k1
+        self.b = b
+        self.recency_weight = recency_weight
+        self.recency_half_life_hours = recency_half_life_hours
+        self.merge_factor = max(2, merge_factor)
+        self._lock = threading.RLock()
+        
+        os.makedirs(directory, exist_ok=True)
+        self._docs_path = os.path.join(directory, 'docs.jsonl')
+        self._meta_path = os.path.join(directory, 'meta.npz')
+        # (name, first doc id, end doc id, term dictionary, postings), by first doc id
+        self._segments: List[Tuple[str, int, int, Dict[str, List[int]], mmap.mmap]] = []
+        
+        self.doc_lengths = np.zeros(0, dtype=np.int32)
+        self.timestamps = np.zeros(0, dtype=np.float64)
+        self.offsets = np.zeros(0, dtype=np.int64)
+        self._urls = set()
+        self._load()
+    
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+    
+    def _load(self):
+        if os.path.exists(self._meta_path):
+            with np.load(self._meta_path) as meta:
+                self.doc_lengths = meta['doc_lengths']
+                self.timestamps = meta['timestamps']
+                self.offsets = meta['offsets']
+        # Drop documents whose metadata was never committed
+        with open(self._docs_path, 'a+b') as f:
+            f.truncate(int(self.offsets[-1]) + self._line_length(f, self.offsets[-1])
+                       if len(self.offsets) else 0)
+            f.seek(0)
+            for line in f:
+                self._urls.add(normalize_url(json.loads(line).get('url', '')))
+        
+        # Segments are named by their doc id range (older ones by their first
+        # doc id only). One past the committed documents belongs to an
+        # interrupted append, and one inside a merged segment's range outlived
+        # an interrupted merge; both are discarded
+        ranges = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.terms.json'):
+                segment = name[:-len('.terms.json')]
+                bounds = [int(part) for part in segment.split('_')[1:]]
+                ranges.append((bounds[0], bounds[1] if len(bounds) > 1 else None, segment))
+        # Widest first among segments starting at the same doc id
+        ranges.sort(key=lambda r: (r[0], -(r[1] if r[1] is not None else r[0])))
+        covered = 0
+        for position, (first, end, segment) in enumerate(ranges):
+            if first >= len(self) or first < covered:
+                self._remove_segment_files(segment)
+                continue
+            if end is None:
+                later = [r[0] for r in ranges[position + 1:] if r[0] > first]
+                end = min(later + [len(self)])
+            covered = end
+            self._open_segment(segment, first, end)
+    
+    @staticmethod
+    def _line_length(f, offset: int) -> int:
+        f.seek(int(offset))
+        return len(f.readline())
+    
+    def _open_segment(self, segment: str, first: int, end: int):
+        with open(os.path.join(self.directory, f'{segment}.terms.json'), encoding='utf-8') as f:
+            terms = json.load(f)
+        with open(os.path.join(self.directory, f'{segment}.post'), 'rb') as f:
+            postings = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b''
+        self._segments.append((segment, first, end, terms, postings))
+    
+    def _remove_segment_files(self, segment: str):
+        # The term dictionary goes first: without it the segment is never loaded
+        for suffix in ('.terms.json', '.post'):
+            path = os.path.join(self.directory, segment + suffix)
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def _write_segment(self, segment: str, postings: Dict[str, List[Tuple[int, int]]]):
+        """Write postings {term: [(doc id, tf), ...] in doc id order} as a segment"""
+        data = bytearray()
+        terms = {}
+        for term in sorted(postings):
+            start = len(data)
+            previous = 0
+            pairs = []
+            for doc_id, tf in postings[term]:
+                pairs.extend((doc_id - previous, tf))
+                previous = doc_id
+            data += encode_varints(pairs)
+            terms[term] = [start, len(data), len(postings[term])]
+        with open(os.path.join(self.directory, f'{segment}.post'), 'wb') as f:
+            f.write(data)
+        # The term dictionary is written last and atomically: it marks the segment complete
+        tmp_path = os.path.join(self.directory, f'{segment}.terms.json.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(terms, f, separators=(',', ':'))
+        os.replace(tmp_path, os.path.join(self.directory, f'{segment}.terms.json'))
+    
+    def _maybe_merge(self):
+        """Merge the cheapest runs of adjacent segments while there are too many"""
+        factor = self.merge_factor
+        while len(self._segments) > factor * (int(math.log(max(len(self), 1), factor)) + 1):
+            sizes = [end - first for _, first, end, _, _ in self._segments]
+            start = min(range(len(sizes) - factor + 1), key=lambda i: sum(sizes[i:i + factor]))
+            self._merge(start, start + factor)
+    
+    def _merge(self, start: int, stop: int):
+        """Rewrite segments[start:stop] (adjacent doc id ranges) as one segment"""
+        segments = self._segments[start:stop]
+        first, end = segments[0][1], segments[-1][2]
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for _, _, _, terms, data in segments:
+            for term, (begin, finish, _) in terms.items():
+                values = decode_varints(data, begin, finish)
+                doc_ids = np.cumsum(values[0::2]).tolist()
+                postings.setdefault(term, []).extend(zip(doc_ids, values[1::2]))
+        merged = f"seg_{first:010d}_{end:010d}"
+        self._write_segment(merged, postings)
+        
+        # A crash from here on leaves segments inside the merged range, dropped on load
+        self._open_segment(merged, first, end)
+        self._segments[start:stop] = [self._segments.pop()]
+        for segment, _, _, _, data in segments:
+            if isinstance(data, mmap.mmap):
+                data.close()
+            self._remove_segment_files(segment)
+    
+    def add_articles(self, articles: List[Dict]) -> int:
+        """Index articles not seen before (by normalized URL). Returns how many were added."""
+        with self._lock:
+            new_articles = []
+            for article in articles:
+                url = normalize_url(article.get('url', ''))
+                if url and url in self._urls:
+                    continue
+                self._urls.add(url)
+                new_articles.append(article)
+            if not new_articles:
+                return 0
+            
+            first_id = len(self)
+            postings: Dict[str, List[Tuple[int, int]]] = {}
+            lengths, timestamps, offsets = [], [], []
+            with open(self._docs_path, 'ab') as docs:
+                for doc_id, article in enumerate(new_articles, first_id):
+                    offsets.append(docs.tell())
+                    docs.write(json.dumps(article).encode('utf-8') + b'\n')
+                    
+                    tokens = self.processor.tokenize(' '.join(filter(None, [
+                        article.get('title'), article.get('description'), article.get('content')
+                    ])))
+                    lengths.append(len(tokens))
+                    timestamps.append(parse_published_at(article.get('publishedAt', '')))
+                    counts: Dict[str, int] = {}
+                    for token in tokens:
+                        counts[token] = counts.get(token, 0) + 1
+                    for term, tf in counts.items():
+                        postings.setdefault(term, []).append((doc_id, tf))
+            
+            # Write the segment, then commit the metadata that makes its docs visible
+            end_id = first_id + len(new_articles)
+            segment = f"seg_{first_id:010d}_{end_id:010d}"
+            self._write_segment(segment, postings)
+
+            self.doc_lengths = np.concatenate([self.doc_lengths, np.asarray(lengths, dtype=np.int32)])
+            self.timestamps = np.concatenate([self.timestamps, np.asarray(timestamps, dtype=np.float64)])
+            self.offsets = np.concatenate([self.offsets, np.asarray(offsets, dtype=np.int64)])
+            tmp_path = f"{self._meta_path}.tmp.npz"
+            np.savez(tmp_path, doc_lengths=self.doc_lengths,
+                     timestamps=self.timestamps, offsets=self.offsets)
+            os.replace(tmp_path, self._meta_path)
+            
+            self._open_segment(segment, first_id, end_id)
+            self._maybe_merge()
+            return len(new_articles)
+    
+    def _postings(self, term: str):
+        """(doc ids, term frequencies, document frequency) across all segments"""
+        doc_ids, tfs, df = [], [], 0
+        for _, _, _, terms, data in self._segments:
+            entry = terms.get(term)
+            if entry is None:
+                continue
+            start, end, segment_df = entry
+            values = decode_varints(data, start, end)
+            doc_ids.append(np.cumsum(values[0::2]))
+            tfs.append(values[1::2])
+            df += segment_df
+        if not df:
+            return None, None, 0
+        return np.concatenate(doc_ids), np.concatenate(tfs).astype(np.float64), df
+    
+    def search(self, query: str, limit: int = 10,
+               now: Optional[float] = None,
+               lang: Optional[str] = None) -> List[Tuple[Dict, float]]:
+        """
+        Top articles for the query as (article, score) pairs. With lang, only
+        articles fetched in that language (or of unknown language) count.
+        """
+        with self._lock:
+            n_docs = len(self)
+            terms = set(self.processor.tokenize(query))
+            if not n_docs or not terms:
+                return []
+            
+            scores = np.zeros(n_docs)
+            average_length = max(float(self.doc_lengths.mean()), 1.0)
+            length_norm = self.k1 * (1 - self.b + self.b * self.doc_lengths / average_length)
+            for term in terms:
+                doc_ids, tfs, df = self._postings(term)
+                if not df:
+                    continue
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                scores[doc_ids] += idf * tfs * (self.k1 + 1) / (tfs + length_norm[doc_ids])
+            
+            matched = np.flatnonzero(scores)
+            if not len(matched):
+                return []
+            
+            # Recency boost halves every recency_half_life_hours
+            now = now if now is not None else datetime.now(timezone.utc).timestamp()
+            age_hours = np.maximum(now - self.timestamps[matched], 0) / 3600.0
+            boost = 1.0 + self.recency_weight * np.power(0.5, age_hours / self.recency_half_life_hours)
+            boost[self.timestamps[matched] == 0] = 1.0
+            boosted = scores[matched] * boost
+            
+            order = np.argsort(-boosted, kind='stable')
+            if not lang:
+                return [(self._article(int(matched[i])), float(boosted[i])) for i in order[:limit]]
+            results = []
+            for i in order:
+                article = self._article(int(matched[i]))
+                if article.get('lang') in (None, lang):
+                    results.append((article, float(boosted[i])))
+                    if len(results) == limit:
+                        break
+            return results
+    
+    def _article(self, doc_id: int) -> Dict:
+        with open(self._docs_path, 'rb') as f:
+            f.seek(int(self.offsets[doc_id]))
+            return json.loads(f.readline())
+    
+    def search_news(self, query: str, limit: int = 10, lang: Optional[str] = None) -> Dict:
+        """search() in NewsFetcher.search_news response format"""
+        results = self.search(query, limit, lang=lang)
+        return {
+            'status': 'ok',
+            'totalResults': len(results),
+            'articles': [article for article, _ in results],
+            'source': 'local'
+        }
+
+
+def search_with_fallback(index: ArticleSearchIndex, fetcher, query: str,
+                         limit: int = 10, min_results: int = 1,
+                         api_fallback: bool = True,
+                         lang: Optional[str] = None) -> Dict:
+    """
+    Answer from the local index; when it has fewer than min_results hits,
+    query the API instead and index what comes back
+    """
+    local = index.search_news(query, limit, lang=lang)
+    if len(local['articles']) >= min_results or not api_fallback:
+        return local
+    remote = fetcher.search_news(query, max_results=limit, lang=lang)
+    if remote.get('status') == 'ok':
+        index.add_articles(remote['articles'])
+        remote['source'] = 'api'
+    return remote
@@ -0,0 +1,141 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.deduplicator import ArticleDeduplicator
+from src.tfidf_index import IncrementalTfidf
+
+
+class StoryClusterer:
+    """
+    Incremental grouping of articles into stories.
+
+    Each article becomes a hashed TF-IDF vector, with document frequencies
+    accumulated as articles arrive (src/tfidf_index.py), and joins the story
+    whose centroid is most cosine-similar, or founds a new one below the
+    threshold. Centroids are kept to their top terms and indexed by term, so
+    an article is only compared with stories it shares terms with. The least
+    recently updated stories are dropped beyond max_stories.
+
+    Looser than ArticleDeduplicator: different write-ups of the same event
+    land in one story, not just syndicated copies.
+    """
+
+    def __init__(self,
+                 threshold: float = 0.25,
+                 article_terms: int = 50,
+                 centroid_terms: int = 100,
+                 max_stories: int = 5000,
+                 tfidf: Optional[IncrementalTfidf] = None):
+        self.threshold = threshold
+        self.article_terms = article_terms
+        self.centroid_terms = centroid_terms
+        self.max_stories = max_stories
+        self.tfidf = tfidf or IncrementalTfidf(n_features=2 ** 18)
+
+        self._next_id = 0
+        self._totals: Dict[int, Dict[int, float]] = {}  # story -> summed member vectors (pruned)
+        self._centroids: Dict[int, Dict[int, float]] = {}  # story -> unit centroid (top terms)
+        self._postings: Dict[int, Dict[int, float]] = {}  # term -> {story: centroid weight}
+        self._recent: 'OrderedDict[int, None]' = OrderedDict()  # stories, least recently updated first
+        self.story_sizes: Dict[int, int] = {}
+
+    def vectors(self, texts: List[str]) -> List[Dict[int, float]]:
+        """Unit TF-IDF vectors {term column: weight}, top article_terms terms each"""
+        counts = self.tfidf.vectorizer.transform(texts)
+        self.tfidf.partial_fit_counts(counts)
+        tfidf = counts.tocsr().multiply(self.tfidf.idf()).tocsr()
+        vectors = []
+        for row in range(tfidf.shape[0]):
+            begin, end = tfidf.indptr[row], tfidf.indptr[row + 1]
+            vectors.append(self._unit(dict(zip(tfidf.indices[begin:end].tolist(),
+                                               tfidf.data[begin:end].tolist())),
+                                      self.article_terms))
+        return vectors
+
+    @staticmethod
+    def _unit(vector: Dict[int, float], top: int) -> Dict[int, float]:
+        if len(vector) > top:
+            vector = dict(sorted(vector.items(), key=lambda item: item[1], reverse=True)[:top])
+        norm = float(np.sqrt(sum(w * w for w in vector.values())))
+        return {term: w / norm for term, w in vector.items()} if norm else {}
+
+    def add(self, article: Dict) -> Dict:
+        """Register one article: {'id', 'story_id', 'similarity'}"""
+        return self.add_many([article])[0]
+
+    def add_many(self, articles: List[Dict]) -> List[Dict]:
+        """Register articles in order (one vectorizer pass for all of them)"""
+        texts = [ArticleDeduplicator.article_text(article) for article in articles]
+        return [self._assign(vector) for vector in self.vectors(texts)]
+
+    def _assign(self, vector: Dict[int, float]) -> Dict:
+        article_id = self._next_id
+        self._next_id += 1
+
+        # Cosine with every story sharing a term, through the term index
+        scores: Dict[int, float] = {}
+        for term, weight in vector.items():
+            for story, centroid_weight in self._postings.get(term, {}).items():
+                scores[story] = scores.get(story, 0.0) + weight * centroid_weight
+        story, similarity = max(scores.items(), key=lambda item: item[1], default=(None, 0.0))
+
+        if story is None or similarity < self.threshold:
+            story, similarity = article_id, 0.0
+            self._totals[story] = {}
+            self.story_sizes[story] = 0
+        self._update(story, vector)
+        return {'id': article_id, 'story_id': story, 'similarity': similarity}
+
+    def _update(self, story: int, vector: Dict[int, float]):
+        for term in self._centroids.pop(story, {}):
+            self._unindex(term, story)
+
+        total = self._totals[story]
+        for term, weight in vector.items():
+            total[term] = total.get(term, 0.0) + weight
+        if len(total) > 4 * self.centroid_terms:
+            total = self._totals[story] = dict(
+                sorted(total.items(), key=lambda item: item[1], reverse=True)[:2 * self.centroid_terms]
+            )
+
+        centroid = self._centroids[story] = self._unit(total, self.centroid_terms)
+        for term, weight in centroid.items():
+            self._postings.setdefault(term, {})[story] = weight
+        self.story_sizes[story] += 1
+
+        self._recent[story] = None
+        self._recent.move_to_end(story)
+        while len(self._recent) > self.max_stories:
+            self._forget(self._recent.popitem(last=False)[0])
+
+    def _unindex(self, term: int, story: int):
+        stories = self._postings.get(term)
+        if stories is not None:
+            stories.pop(story, None)
+            if not stories:
+                del self._postings[term]
+
+    def _forget(self, story: int):
+        for term in self._centroids.pop(story, {}):
+            self._unindex(term, story)
+        self._totals.pop(story, None)
+        self.story_sizes.pop(story, None)
+
+    def cluster(self, articles: List[Dict]) -> Tuple[List[Dict], Dict[int, List[Dict]]]:
+        """
+        Group a batch into stories. Returns the first article of each story,
+        in order, and the members of every story by that article's index in
+        `articles` (same shape as ArticleDeduplicator.deduplicate).
+        """
+        representatives = []
+        stories: Dict[int, List[Dict]] = {}
+        index_of_story: Dict[int, int] = {}
+        for idx, (article, assignment) in enumerate(zip(articles, self.add_many(articles))):
+            story = assignment['story_id']
+            if story not in index_of_story:
+                index_of_story[story] = idx
+                representatives.append(article)
+            stories.setdefault(index_of_story[story], []).append(article)
+        return representatives, stories
@@ -1,56 +1,395 @@
-from sumy.parsers.plaintext import PlaintextParser
-from sumy.nlp.tokenizers import Tokenizer
-from sumy.summarizers.lsa import LsaSummarizer
-from sumy.summarizers.text_rank import TextRankSummarizer
-from sumy.summarizers.lex_rank import LexRankSummarizer
-from sumy.nlp.stemmers import Stemmer
-from sumy.utils import get_stop_words
-from typing import List
-import nltk
+import re
+import time
+from functools import lru_cache
+from typing import List, Dict, Optional, Union
+from src.document import AnalyzedDocument
+from src.metrics import instrument
+
+
+class _PretokenizedWords:
+    """sumy tokenizer stand-in that returns the words an AnalyzedDocument already has"""
+    
+    def __init__(self, document: AnalyzedDocument, tokenizer):
+        self._words = dict(zip(document.sentences, document.sentence_words()))
+        self._tokenizer = tokenizer
+    
+    def to_words(self, sentence: str):
+        words = self._words.get(sentence)
+        return tuple(words) if words is not None else self._tokenizer.to_words(sentence)
+
 
 class NewsSummarizer:
+    FAST_METHODS = ('fast_textrank', 'fast_lexrank')
+    
+    # Rough seconds per sentence pair, used to predict whether a method fits a time budget
+    PAIR_COST = {
+        'textrank': 4e-5,
+        'lexrank': 3e-5,
+        'lsa': 3e-5,
+        'fast_textrank': 2e-7,
+        'fast_lexrank': 2e-7
+    }
+    # Rough seconds to tokenize and stem one sentence
+    SENTENCE_COST = 2e-4
+    # Above this many candidate sentences the graph is pruned to its top-k edges per sentence
+    SPARSE_GRAPH_MIN_SENTENCES = 150
+    SPARSE_GRAPH_TOP_K = 10
+    # Distinct words whose stems are kept (least recently used dropped first)
+    STEM_CACHE_SIZE = 50000
+    
     def __init__(self, language: str = "english"):
+        # sumy and its NLTK-backed stemmer/tokenizer are imported on first use
         self.language = language
-        self.stemmer = Stemmer(language)
-        self.stop_words = get_stop_words(language)
+        self._stemmer = None
+        self._stop_words = None
+        self._tokenizer = None
+        self._stem = lru_cache(maxsize=self.STEM_CACHE_SIZE)(self._stem_word)
+        self._lower_stop_words = None
         
-    def summarize_text(self, text: str, 
+    @property
+    def stemmer(self):
+        if self._stemmer is None:
+            from sumy.nlp.stemmers import Stemmer
+            self._stemmer = Stemmer(self.language)
+        return self._stemmer
+    
+    @property
+    def tokenizer(self):
+        if self._tokenizer is None:
+            from sumy.nlp.tokenizers import Tokenizer
+            self._tokenizer = Tokenizer(self.language)
+        return self._tokenizer
+    
+    @property
+    def stop_words(self):
+        if self._stop_words is None:
+            from sumy.utils import get_stop_words
+            self._stop_words = get_stop_words(self.language)
+        return self._stop_words
+    
+    def warm_up(self):
+        """Import sumy and build the stemmer and tokenizer ahead of the first request"""
+        self.tokenizer.to_sentences("Warm up.")
+        self.stemmer
+        self.stop_words
+        return self
+    
+    @instrument('summarizer')
+    def summarize_text(self, text: Union[str, AnalyzedDocument], 
                       sentences_count: int = 3,
-                      method: str = "textrank") -> str:
+                      method: str = "textrank",
+                      time_budget: Optional[float] = None,
+                      max_sentences: Optional[int] = None) -> str:
         """
-        Summarize text using specified method
-        Methods: textrank, lsa, lexrank
+        Summarize text (or an AnalyzedDocument) using specified method
+        Methods: textrank, lsa, lexrank, fast_textrank, fast_lexrank
+        The fast_* methods rank the same graphs as textrank/lexrank with
+        vectorized sparse operations instead of sumy's Python loops.
+        With a time_budget (seconds) or max_sentences, see summarize_within_budget.
         """
-        if not text or len(text) < 100:
-            return text
-            
-        parser = PlaintextParser.from_string(text, Tokenizer(self.language))
+        if time_budget is not None or max_sentences is not None:
+            return self.summarize_within_budget(
+                text, sentences_count, method, time_budget, max_sentences
+            )['summary']
         
-        if method == "lsa":
-            summarizer = LsaSummarizer(self.stemmer)
-        elif method == "lexrank":
-            summarizer = LexRankSummarizer(self.stemmer)
-        else:  # textrank
-            summarizer = TextRankSummarizer(self.stemmer)
+        plain_text = self._plain_text(text)
+        if not plain_text or len(plain_text) < 100:
+            return plain_text
         
-        summarizer.stop_words = self.stop_words
+        document = self._parse(text)
+        
+        if method in self.FAST_METHODS:
+            try:
+                return self._summarize_fast(document.sentences, sentences_count, method)
+            except Exception:
+                return ' '.join(self._lead_sentences(text, sentences_count))
+        
+        summarizer = self._sumy_summarizer(method)
         
         try:
-            summary_sentences = summarizer(parser.document, sentences_count)
+            summary_sentences = summarizer(document, sentences_count)
             return ' '.join([str(sentence) for sentence in summary_sentences])
         except:
-            # Fallback to simple extraction
-            sentences = text.split('.')[:sentences_count]
-            return '. '.join(sentences) + '.'
+            # Fallback to the lead sentences
+            return ' '.join(self._lead_sentences(text, sentences_count))
     
-    def extract_key_sentences(self, text: str, num_sentences: int = 5) -> List[str]:
+    @instrument('summarizer')
+    def summarize_within_budget(self, text: Union[str, AnalyzedDocument],
+                                sentences_count: int = 3,
+                                method: str = "textrank",
+                                time_budget: Optional[float] = None,
+                                max_sentences: Optional[int] = None) -> Dict:
+        """
+        Summarize within a time budget (seconds) and/or a cap on the number of
+        sentences that go into the similarity graph.
+        
+        Long inputs are pre-filtered to the max_sentences most central
+        candidates and ranked on a sparse top-k graph. When the predicted cost
+        of the requested method does not fit the remaining time, it degrades to
+        the vectorized engine, then to linear centroid scoring, then to the
+        lead sentences. Returns the summary together with the strategy used.
+        """
+        import numpy as np
+        from src import graph_ranker
+        from sumy.models.dom import ObjectDocumentModel, Paragraph
+        
+        start = time.perf_counter()
+        deadline = start + time_budget if time_budget is not None else None
+        
+        def remaining() -> float:
+            return float('inf') if deadline is None else deadline - time.perf_counter()
+        
+        def result(summary: str, strategy: str, used: str, candidates: int = 0) -> Dict:
+            return {
+                'summary': summary,
+                'strategy': strategy,
+                'method': used,
+                'sentences': len(sentences),
+                'candidates': candidates,
+                'elapsed': time.perf_counter() - start
+            }
+        
+        sentences = ()
+        plain_text = self._plain_text(text)
+        if not plain_text or len(plain_text) < 100:
+            return result(plain_text, 'passthrough', 'none')
+        
+        sentences = self._parse(text).sentences
+        lead = ' '.join(str(s) for s in sentences[:sentences_count])
+        if len(sentences) <= sentences_count:
+            return result(lead, 'passthrough', 'none', len(sentences))
+        if remaining() <= 0:
+            return result(lead, 'lead', 'lead')
+        
+        try:
+            strategy = []
+            candidates = list(sentences)
+            
+            # Cheap linear pre-filter down to the most central sentences, on raw
+            # lowercased words, before paying for word tokenization and stemming
+            limit = max_sentences or len(candidates)
+            if deadline is not None:
+                # Spend at most half of what is left on tokenizing, the rest on ranking
+                affordable = int(remaining() / 2 / self.SENTENCE_COST)
+                limit = min(limit, max(sentences_count, affordable))
+            if len(candidates) > limit:
+                stop_words = self._normalized_stop_words
+                raw_counts = graph_ranker.term_matrix([
+                    [w for w in re.findall(r'\w+', str(s).lower()) if w not in stop_words]
+                    for s in sentences
+                ])
+                scores = graph_ranker.centroid_scores(raw_counts)
+                keep = sorted(np.argsort(-scores, kind='stable')[:limit])
+                candidates = [sentences[i] for i in keep]
+                strategy.append('prefilter')
+            
+            counts = graph_ranker.term_matrix([self._sentence_terms(s) for s in candidates])
+            if remaining() <= 0:
+                return result(lead, 'lead', 'lead')
+            
+            pairs = len(candidates) ** 2
+            used = method if method in self.PAIR_COST else 'textrank'
+            if self.PAIR_COST[used] * pairs > remaining():
+                used = 'fast_lexrank' if 'lexrank' in used else 'fast_textrank'
+                strategy.append('degraded')
+            if self.PAIR_COST[used] * pairs > remaining():
+                used = 'centroid'
+            
+            top_k = None
+            if used in self.FAST_METHODS and len(candidates) > self.SPARSE_GRAPH_MIN_SENTENCES:
+                counts = graph_ranker.prune_common_terms(counts)
+                top_k = self.SPARSE_GRAPH_TOP_K
+                strategy.append('sparse_topk')
+            
+            if used == 'centroid':
+                scores = graph_ranker.centroid_scores(counts)
+            elif used == 'fast_lexrank':
+                scores = graph_ranker.lexrank_scores(counts, top_k=top_k)
+            elif used == 'fast_textrank':
+                scores = graph_ranker.textrank_scores(counts, top_k=top_k)
+            else:
+                document = ObjectDocumentModel([Paragraph(candidates)])
+                summary = self._sumy_summarizer(used)(document, sentences_count)
+                strategy.append(used)
+                return result(' '.join(str(s) for s in summary), '+'.join(strategy), used, len(candidates))
+            
+            strategy.append(used)
+            return result(self._best_sentences(candidates, scores, sentences_count),
+                          '+'.join(strategy), used, len(candidates))
+        except Exception as e:
+            print(f"Error summarizing text, using lead sentences: {e}")
+            return result(lead, 'fallback_lead', 'lead')
+    
+    @instrument('summarizer')
+    def extract_key_sentences(self, text: Union[str, AnalyzedDocument],
+                              num_sentences: int = 5) -> List[str]:
         """Extract key sentences from text"""
-        parser = PlaintextParser.from_string(text, Tokenizer(self.language))
+        from sumy.summarizers.text_rank import TextRankSummarizer
+        
         summarizer = TextRankSummarizer(self.stemmer)
         summarizer.stop_words = self.stop_words
         
         try:
-            sentences = summarizer(parser.document, num_sentences)
+            sentences = summarizer(self._parse(text), num_sentences)
             return [str(sentence) for sentence in sentences]
         except:
-            return text.split('.')[:num_sentences]
\ No newline at end of file
+            return self._lead_sentences(text, num_sentences)
+    
+    @instrument('summarizer')
+    def summarize_many(self, texts: List[Union[str, AnalyzedDocument]],
+                       sentences_count: int = 3,
+                       method: str = "fast_textrank",
+                       time_budget: Optional[float] = None,
+                       max_sentences: Optional[int] = None) -> List[str]:
+        """
+        Summarize a batch of documents, sharing the tokenizer, stemmer and
+        stem cache across all of them
+        """
+        return [self.summarize_text(text, sentences_count, method, time_budget, max_sentences)
+                for text in texts]
+    
+    @instrument('summarizer')
+    def summarize_cluster(self, texts: List[Union[str, AnalyzedDocument]],
+                          sentences_count: int = 3,
+                          method: str = "fast_textrank",
+                          max_sentences: Optional[int] = 400,
+                          redundancy: float = 0.5) -> str:
+        """
+        One summary for several articles about the same story (see
+        src/story_clusterer.py), ranked over their pooled sentences.
+        
+        Sentences repeated across articles are pooled once. Ranking uses the
+        vectorized graph engine: lexrank methods with LexRank, the others
+        (lsa included, which has no pooled mode) with TextRank. A ranked
+        sentence is skipped when its cosine similarity with one already chosen
+        exceeds `redundancy`. The chosen sentences keep article, then
+        in-article order.
+        """
+        import numpy as np
+        from src import graph_ranker
+        
+        pooled, seen = [], set()
+        for text in texts:
+            if not self._plain_text(text):
+                continue
+            for sentence in self._parse(text).sentences:
+                key = tuple(word.lower() for word in sentence.words)
+                if key and key not in seen:
+                    seen.add(key)
+                    pooled.append(sentence)
+        if len(pooled) <= sentences_count:
+            return ' '.join(str(sentence) for sentence in pooled)
+        
+        try:
+            counts = graph_ranker.term_matrix([self._sentence_terms(s) for s in pooled])
+            if max_sentences and len(pooled) > max_sentences:
+                keep = np.sort(np.argsort(-graph_ranker.centroid_scores(counts),
+                                          kind='stable')[:max_sentences])
+                pooled = [pooled[i] for i in keep]
+                counts = counts[keep]
+            graph_counts, top_k = counts, None
+            if len(pooled) > self.SPARSE_GRAPH_MIN_SENTENCES:
+                graph_counts = graph_ranker.prune_common_terms(counts)
+                top_k = self.SPARSE_GRAPH_TOP_K
+            if 'lexrank' in method:
+                scores = graph_ranker.lexrank_scores(graph_counts, top_k=top_k)
+            else:
+                scores = graph_ranker.textrank_scores(graph_counts, top_k=top_k)
+        except Exception as e:
+            print(f"Error summarizing cluster, using lead sentences: {e}")
+            return ' '.join(str(sentence) for sentence in pooled[:sentences_count])
+        
+        # Greedy selection in rank order, skipping near-repeats of chosen sentences
+        norms = np.sqrt(np.asarray(counts.multiply(counts).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        chosen = []
+        for i in np.argsort(-np.asarray(scores), kind='stable'):
+            if chosen:
+                overlap = (counts[chosen] @ counts[i].T).toarray().ravel()
+                if (overlap / (norms[chosen] * norms[i])).max() > redundancy:
+                    continue
+            chosen.append(int(i))
+            if len(chosen) == sentences_count:
+                break
+        return ' '.join(str(pooled[i]) for i in sorted(chosen))
+    
+    def _parse(self, text: Union[str, AnalyzedDocument]):
+        """sumy document model; an AnalyzedDocument is reused without re-tokenizing"""
+        if isinstance(text, AnalyzedDocument):
+            from sumy.models.dom import ObjectDocumentModel, Paragraph, Sentence
+            words = _PretokenizedWords(text, self.tokenizer)
+            return ObjectDocumentModel([Paragraph([Sentence(s, words) for s in text.sentences])])
+        
+        from sumy.parsers.plaintext import PlaintextParser
+        return PlaintextParser.from_string(text, self.tokenizer).document
+    
+    @staticmethod
+    def _plain_text(text: Union[str, AnalyzedDocument]) -> str:
+        return text.text if isinstance(text, AnalyzedDocument) else text
+    
+    def _lead_sentences(self, text: Union[str, AnalyzedDocument], count: int) -> List[str]:
+        """The first count sentences, for when ranking fails"""
+        if isinstance(text, AnalyzedDocument):
+            return text.sentences[:count]
+        try:
+            sentences = self.tokenizer.to_sentences(text)
+        except Exception:
+            # The sentence tokenizer itself is unavailable (e.g. punkt data missing)
+            sentences = re.split(r'(?<=[.!?])\s+', text.strip())
+        return [str(sentence) for sentence in sentences[:count]]
+    
+    def _summarize_fast(self, sentences, sentences_count: int, method: str) -> str:
+        """Rank sumy sentences with the vectorized graph ranker"""
+        from src import graph_ranker
+        
+        if not sentences:
+            return ''
+        counts = graph_ranker.term_matrix([self._sentence_terms(s) for s in sentences])
+        if method == 'fast_lexrank':
+            scores = graph_ranker.lexrank_scores(counts)
+        else:
+            scores = graph_ranker.textrank_scores(counts)
+        
+        return self._best_sentences(sentences, scores, sentences_count)
+    
+    def _sumy_summarizer(self, method: str):
+        """sumy summarizer for textrank, lsa or lexrank"""
+        if method == "lsa":
+            from sumy.summarizers.lsa import LsaSummarizer
+            summarizer = LsaSummarizer(self.stemmer)
+        elif method == "lexrank":
+            from sumy.summarizers.lex_rank import LexRankSummarizer
+            summarizer = LexRankSummarizer(self.stemmer)
+        else:  # textrank
+            from sumy.summarizers.text_rank import TextRankSummarizer
+            summarizer = TextRankSummarizer(self.stemmer)
+        
+        summarizer.stop_words = self.stop_words
+        return summarizer
+    
+    @staticmethod
+    def _best_sentences(sentences, scores, sentences_count: int) -> str:
+        """Same selection as sumy: best rated first (stable on ties), then document order"""
+        ratings = dict(zip(sentences, scores))
+        best = sorted(range(len(sentences)), key=lambda i: ratings[sentences[i]], reverse=True)
+        return ' '.join(str(sentences[i]) for i in sorted(best[:sentences_count]))
+    
+    def _sentence_terms(self, sentence) -> List[str]:
+        """Lowercased, stop-word filtered, stemmed words of a sentence"""
+        stop_words = self._normalized_stop_words
+        terms = []
+        for word in sentence.words:
+            word = word.lower()
+            if word in stop_words:
+                continue
+            terms.append(self._stem(word))
+        return terms
+    
+    def _stem_word(self, word: str) -> str:
+        return self.stemmer(word)
+    
+    @property
+    def _normalized_stop_words(self) -> frozenset:
+        if self._lower_stop_words is None:
+            self._lower_stop_words = frozenset(w.lower() for w in self.stop_words)
+        return self._lower_stop_words
@@ -1,16 +1,78 @@
+import atexit
+import os
 import re
-import spacy
-from typing import List, Dict, Tuple
+import threading
+import time
+from typing import List, Dict, Tuple, Optional, Union
 from collections import Counter
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
+from src.document import AnalyzedDocument
+from src.metrics import instrument
 
 class TextProcessor:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
-        self.stop_words = set(stopwords.words('english'))
+    # Only POS tags and entities are used downstream
+    UNUSED_COMPONENTS = ['parser', 'lemmatizer']
+    
+    def __init__(self, model: str = "en_core_web_sm", tfidf_path: Optional[str] = None,
+                 language: str = "english", tfidf_save_every: int = 100,
+                 tfidf_save_interval: float = 60.0):
+        # spaCy, NLTK and the model itself are loaded on first use
+        self.model = model
+        self.language = language  # NLTK stopwords name (see src/model_registry.py)
+        self._nlp = None
+        self._stop_words = None
+        self._lock = threading.Lock()
+        
+        # Corpus-wide document frequencies (see src/tfidf_index.py), if configured,
+        # saved after tfidf_save_every new documents or tfidf_save_interval seconds
+        self.tfidf_path = tfidf_path
+        self.tfidf_save_every = tfidf_save_every
+        self.tfidf_save_interval = tfidf_save_interval
+        self._tfidf_index = None
+        self._tfidf_unsaved = 0
+        self._tfidf_saved_at = time.monotonic()
+    
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            with self._lock:
+                if self._nlp is None:
+                    import spacy
+                    nlp = spacy.load(self.model)
+                    # Sentence boundaries without the dependency parser
+                    if 'senter' in nlp.disabled:
+                        nlp.enable_pipe('senter')
+                    elif not {'senter', 'parser', 'sentencizer'} & set(nlp.pipe_names):
+                        nlp.add_pipe('sentencizer')
+                    self._nlp = nlp
+        return self._nlp
+    
+    @property
+    def tfidf_index(self):
+        if self._tfidf_index is None and self.tfidf_path:
+            with self._lock:
+                if self._tfidf_index is None:
+                    from src.tfidf_index import IncrementalTfidf
+                    if os.path.exists(self.tfidf_path):
+                        self._tfidf_index = IncrementalTfidf.load(self.tfidf_path)
+                    else:
+                        self._tfidf_index = IncrementalTfidf()
+                    atexit.register(self.save_tfidf)
+        return self._tfidf_index
+    
+    @property
+    def stop_words(self) -> set:
+        if self._stop_words is None:
+            from nltk.corpus import stopwords
+            self._stop_words = set(stopwords.words(self.language))
+        return self._stop_words
+    
+    def warm_up(self):
+        """Load the spaCy model and stopwords now instead of on the first request"""
+        self.nlp
+        self.stop_words
+        return self
         
+    @instrument('text_processor')
     def clean_text(self, text: str) -> str:
         """Clean and normalize text"""
         if not text:
@@ -19,8 +81,10 @@ class TextProcessor:
         # Remove URLs
         text = re.sub(r'http\S+|www.\S+', '', text)
         
-        # Remove HTML tags
-        text = re.sub(r'<.*?>', '', text)
+        # Remove HTML tags (a real parser: handles scripts, styles and entities)
+        if '<' in text:
+            from src.html_extractor import strip_tags
+            text = strip_tags(text)
         
         # Remove special characters but keep sentence structure
         text = re.sub(r'[^\w\s\.\!\?\,\;\:\-]', '', text)
@@ -30,27 +94,73 @@ class TextProcessor:
         
         return text
     
-    def extract_sentences(self, text: str) -> List[str]:
+    def tokenize(self, text: str) -> List[str]:
+        """Lowercased word tokens of the cleaned text, without stopwords"""
+        return [
+            word for word in re.findall(r'\w+', self.clean_text(text).lower())
+            if word not in self.stop_words
+        ]
+    
+    def analyze(self, text: str) -> AnalyzedDocument:
+        """Parse text once into an AnalyzedDocument (see src/document.py)"""
+        return self.analyze_many([text])[0]
+    
+    @instrument('text_processor')
+    def analyze_many(self, texts: List[str],
+                     batch_size: int = 64,
+                     n_process: int = 1) -> List[AnalyzedDocument]:
+        """
+        Parse many texts in one nlp.pipe pass, with the components nothing
+        downstream uses disabled
+        """
+        disable = [name for name in self.UNUSED_COMPONENTS if name in self.nlp.pipe_names]
+        docs = self.nlp.pipe(
+            (text or "" for text in texts),
+            batch_size=batch_size,
+            n_process=n_process,
+            disable=disable
+        )
+        return [AnalyzedDocument.from_spacy(doc) for doc in docs]
+    
+    def extract_sentences(self, text: Union[str, AnalyzedDocument]) -> List[str]:
         """Extract sentences from text"""
+        if isinstance(text, AnalyzedDocument):
+            return text.sentences
+        from nltk.tokenize import sent_tokenize
         return sent_tokenize(text)
     
-    def extract_important_words(self, text: str, top_n: int = 10) -> List[Dict]:
+    @instrument('text_processor')
+    def extract_important_words(self, text: Union[str, AnalyzedDocument],
+                                top_n: int = 10) -> Tuple[List[Dict], List[Tuple[str, str]]]:
         """Extract important words with their properties"""
-        doc = self.nlp(text)
-        
+        document = text if isinstance(text, AnalyzedDocument) else self.analyze(text)
+        return self.important_words(document, top_n)
+    
+    @instrument('text_processor')
+    def extract_important_words_batch(self, texts: List[str],
+                                      top_n: int = 10,
+                                      batch_size: int = 64,
+                                      n_process: int = 1) -> List[Tuple[List[Dict], List[Tuple[str, str]]]]:
+        """
+        Extract important words and entities for many texts in one nlp.pipe pass.
+        Returns one (important_words, entities) tuple per input text, in order.
+        """
+        return [
+            self.important_words(document, top_n)
+            for document in self.analyze_many(texts, batch_size, n_process)
+        ]
+    
+    def important_words(self, document: AnalyzedDocument,
+                        top_n: int = 10) -> Tuple[List[Dict], List[Tuple[str, str]]]:
+        """Keywords and entities of an already analyzed document"""
         # Extract entities and important words
         important_words = []
         
         # Named entities
-        entities = [(ent.text, ent.label_) for ent in doc.ents]
+        entities = list(document.entities)
         
         # Nouns and verbs (excluding stop words)
-        words = []
-        for token in doc:
-            if (token.pos_ in ['NOUN', 'VERB', 'PROPN'] and 
-                token.text.lower() not in self.stop_words and
-                len(token.text) > 2):
-                words.append(token.text.lower())
+        words = document.content_words(self.stop_words, ('NOUN', 'VERB', 'PROPN'), min_length=3)
         
         # Calculate word frequency
         word_freq = Counter(words)
@@ -65,13 +175,17 @@ class TextProcessor:
         
         return important_words, entities
     
+    @instrument('text_processor')
     def calculate_tfidf(self, documents: List[str]) -> Dict:
         """Calculate TF-IDF scores for words across documents"""
+        if self.tfidf_index is not None:
+            return self.score_tfidf(documents)
+        
         from sklearn.feature_extraction.text import TfidfVectorizer
         
         vectorizer = TfidfVectorizer(
             max_features=20,
-            stop_words='english',
+            stop_words='english' if self.language == 'english' else list(self.stop_words),
             ngram_range=(1, 2)
         )
         
@@ -91,4 +205,31 @@ class TextProcessor:
             
             return scores
         except:
-            return {}
\ No newline at end of file
+            return {}
+    
+    def score_tfidf(self, documents: List[str], top_k: int = 20,
+                    update: bool = True) -> Dict:
+        """
+        Top-k TF-IDF terms per document against the corpus-wide document
+        frequencies. With update, documents not seen before are first added to
+        the corpus statistics (saved periodically, see __init__).
+        """
+        if update:
+            added = self.tfidf_index.partial_fit(documents)
+            with self._lock:
+                self._tfidf_unsaved += added
+                due = self._tfidf_unsaved and (
+                    self._tfidf_unsaved >= self.tfidf_save_every
+                    or time.monotonic() - self._tfidf_saved_at >= self.tfidf_save_interval)
+            if due:
+                self.save_tfidf()
+        return dict(enumerate(self.tfidf_index.top_terms(documents, top_k)))
+    
+    def save_tfidf(self):
+        """Save the corpus statistics if documents were added since the last save"""
+        with self._lock:
+            if not self._tfidf_unsaved or self._tfidf_index is None:
+                return
+            self._tfidf_unsaved = 0
+            self._tfidf_saved_at = time.monotonic()
+        self._tfidf_index.save(self.tfidf_path)
@@ -0,0 +1,126 @@
+import hashlib
+import os
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+class IncrementalTfidf:
+    """
+    TF-IDF with document frequencies accumulated over the whole ingested corpus.
+    Terms are hashed into a fixed number of columns, so the persisted state is a
+    single int32 array of document frequencies plus the document count, and new
+    documents are scored against the global statistics without refitting.
+    partial_fit() counts every distinct document once: a 64-bit hash of each
+    one seen is kept (and persisted) so re-ingested articles are skipped.
+    """
+    
+    def __init__(self, n_features: int = 2 ** 20):
+        self.n_features = n_features
+        self.n_documents = 0
+        self.document_frequency = np.zeros(n_features, dtype=np.int32)
+        self._seen = set()
+        self._lock = threading.Lock()
+        self._vectorizer = None
+        self._hasher = None
+    
+    @property
+    def vectorizer(self):
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+            self._vectorizer = HashingVectorizer(
+                n_features=self.n_features,
+                stop_words='english',
+                ngram_range=(1, 2),
+                alternate_sign=False,
+                norm=None
+            )
+        return self._vectorizer
+    
+    @staticmethod
+    def document_hash(document: str) -> int:
+        digest = hashlib.blake2b(document.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little')
+    
+    def partial_fit(self, documents: List[str]) -> int:
+        """Add documents not seen before to the corpus statistics; returns how many were new"""
+        new = {}
+        with self._lock:
+            for document in documents:
+                key = self.document_hash(document)
+                if key not in self._seen and key not in new:
+                    new[key] = document
+            self._seen.update(new)
+        if new:
+            self.partial_fit_counts(self.vectorizer.transform(list(new.values())))
+        return len(new)
+    
+    def partial_fit_counts(self, counts) -> 'IncrementalTfidf':
+        """partial_fit for documents already run through self.vectorizer"""
+        counts = counts.tocsc()
+        # Number of documents containing each column
+        present = np.diff(counts.indptr).astype(np.int32)
+        with self._lock:
+            self.document_frequency += present
+            self.n_documents += counts.shape[0]
+        return self
+    
+    def idf(self) -> np.ndarray:
+        """Smoothed idf, same formula as scikit-learn's TfidfVectorizer"""
+        with self._lock:
+            n_documents = self.n_documents
+            document_frequency = self.document_frequency.astype(np.float64)
+        return np.log((1.0 + n_documents) / (1.0 + document_frequency)) + 1.0
+    
+    def top_terms(self, documents: List[str], top_k: int = 10) -> List[Dict[str, float]]:
+        """
+        L2-normalized TF-IDF scores of the top_k terms of each document,
+        taken straight from the sparse rows
+        """
+        from sklearn.feature_extraction import FeatureHasher
+        from sklearn.preprocessing import normalize
+        
+        counts = self.vectorizer.transform(documents).tocsr()
+        tfidf = normalize(counts.multiply(self.idf()).tocsr())
+        
+        analyzer = self.vectorizer.build_analyzer()
+        hasher = FeatureHasher(n_features=self.n_features, input_type='string',
+                               alternate_sign=False)
+        results = []
+        for row, document in enumerate(documents):
+            begin, end = tfidf.indptr[row], tfidf.indptr[row + 1]
+            columns, scores = tfidf.indices[begin:end], tfidf.data[begin:end]
+            if not len(scores):
+                results.append({})
+                continue
+            
+            # Only this document's terms are needed to name its columns
+            terms = list(set(analyzer(document)))
+            names = dict(zip(hasher.transform([[t] for t in terms]).indices.tolist(), terms))
+            
+            best = np.argsort(-scores, kind='stable')[:top_k]
+            results.append({names[int(columns[i])]: float(scores[i]) for i in best})
+        return results
+    
+    def save(self, path: str):
+        """Persist the document frequencies (compressed) atomically"""
+        with self._lock:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            tmp_path = f"{path}.tmp.npz"
+            np.savez_compressed(
+                tmp_path,
+                document_frequency=self.document_frequency,
+                n_documents=np.int64(self.n_documents),
+                seen=np.fromiter(self._seen, dtype=np.uint64, count=len(self._seen))
+            )
+            os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path: str) -> 'IncrementalTfidf':
+        with np.load(path) as state:
+            model = cls(n_features=len(state['document_frequency']))
+            model.document_frequency = state['document_frequency'].astype(np.int32)
+            model.n_documents = int(state['n_documents'])
+            if 'seen' in state.files:
+                model._seen = set(state['seen'].tolist())
+        return model
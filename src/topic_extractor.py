@@ -1,18 +1,44 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Union
 from collections import Counter
+import os
 import re
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.decomposition import LatentDirichletAllocation
-import numpy as np
+import threading
+from src.category_classifier import CategoryClassifier
+from src.document import AnalyzedDocument
+from src.metrics import instrument
 
 class TopicExtractor:
-    def __init__(self):
-        self.vectorizer = CountVectorizer(
-            max_features=50,
-            stop_words='english',
-            ngram_range=(1, 2)
-        )
+    def __init__(self, model_path: Optional[str] = None, n_model_topics: int = 10,
+                 category_lexicon: Optional[Dict[str, List[str]]] = None):
+        # scikit-learn is imported on first use
+        # With a model_path, topics come from a persistent online LDA model
+        # (see src/topic_model.py) instead of a fresh per-request fit
+        self.model_path = model_path
+        self.n_model_topics = n_model_topics
+        self._topic_model = None
+        self._model_lock = threading.Lock()
+        self.classifier = CategoryClassifier(category_lexicon)
+    
+    @property
+    def topic_model(self):
+        if self._topic_model is None and self.model_path:
+            with self._model_lock:
+                if self._topic_model is None:
+                    from src.topic_model import OnlineTopicModel
+                    if os.path.exists(self.model_path):
+                        self._topic_model = OnlineTopicModel.load(self.model_path)
+                    else:
+                        self._topic_model = OnlineTopicModel(n_topics=self.n_model_topics)
+        return self._topic_model
+    
+    def warm_up(self):
+        """Import scikit-learn and load the topic model ahead of the first request"""
+        from sklearn.feature_extraction.text import CountVectorizer
+        from sklearn.decomposition import LatentDirichletAllocation
+        self.topic_model
+        return self
         
+    @instrument('topic_extractor')
     def extract_topics_lda(self, documents: List[str], 
                            n_topics: int = 3,
                            words_per_topic: int = 5) -> List[Dict]:
@@ -20,9 +46,20 @@ class TopicExtractor:
         if not documents or len(documents) < 2:
             return []
         
+        if self.topic_model is not None:
+            return self.update_and_infer_topics(documents, n_topics, words_per_topic)
+        
+        from sklearn.feature_extraction.text import CountVectorizer
+        from sklearn.decomposition import LatentDirichletAllocation
+        
         try:
-            # Vectorize documents
-            doc_term_matrix = self.vectorizer.fit_transform(documents)
+            # Vectorize documents (local vectorizer, safe to share the extractor across sessions)
+            vectorizer = CountVectorizer(
+                max_features=50,
+                stop_words='english',
+                ngram_range=(1, 2)
+            )
+            doc_term_matrix = vectorizer.fit_transform(documents)
             
             # Apply LDA
             lda = LatentDirichletAllocation(
@@ -33,7 +70,7 @@ class TopicExtractor:
             lda.fit(doc_term_matrix)
             
             # Get feature names
-            feature_names = self.vectorizer.get_feature_names_out()
+            feature_names = vectorizer.get_feature_names_out()
             
             # Extract topics
             topics = []
@@ -52,14 +89,34 @@ class TopicExtractor:
             print(f"Error in LDA: {e}")
             return []
     
-    def extract_key_phrases(self, text: str, top_n: int = 5) -> List[str]:
+    def update_and_infer_topics(self, documents: List[str],
+                                n_topics: int = 3,
+                                words_per_topic: int = 5) -> List[Dict]:
+        """
+        Train the persistent model on documents it has not seen yet, save it,
+        and return the n_topics topics most present in documents
+        """
+        try:
+            if self.topic_model.partial_fit(documents):
+                self.topic_model.save(self.model_path)
+            return self.topic_model.topics_for(documents, n_topics, words_per_topic)
+        except Exception as e:
+            print(f"Error in online LDA: {e}")
+            return []
+    
+    def infer_topics(self, documents: List[str]):
+        """Per-document topic distributions from the persistent model, without training"""
+        return self.topic_model.transform(documents)
+    
+    @instrument('topic_extractor')
+    def extract_key_phrases(self, text: Union[str, AnalyzedDocument], top_n: int = 5) -> List[str]:
         """Extract key phrases from text"""
-        # Simple noun phrase extraction
-        phrases = []
-        
-        # Pattern for noun phrases
-        pattern = r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b'
-        matches = re.findall(pattern, text)
+        # Simple noun phrase extraction: runs of Capitalized words
+        if isinstance(text, AnalyzedDocument):
+            matches = text.capitalized_phrases()
+        else:
+            pattern = r'\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b'
+            matches = re.findall(pattern, text)
         
         # Count frequency
         phrase_freq = Counter(matches)
@@ -67,26 +124,16 @@ class TopicExtractor:
         # Get top phrases
         return [phrase for phrase, _ in phrase_freq.most_common(top_n)]
     
-    def categorize_article(self, text: str) -> str:
-        """Simple category detection based on keywords"""
-        categories = {
-            'technology': ['tech', 'software', 'ai', 'computer', 'digital', 'internet', 'app'],
-            'business': ['business', 'economy', 'market', 'finance', 'stock', 'trade', 'company'],
-            'politics': ['politics', 'government', 'election', 'president', 'congress', 'law', 'policy'],
-            'sports': ['sports', 'game', 'team', 'player', 'match', 'score', 'championship'],
-            'health': ['health', 'medical', 'doctor', 'disease', 'treatment', 'hospital', 'covid'],
-            'science': ['science', 'research', 'study', 'discovery', 'experiment', 'scientist'],
-            'entertainment': ['movie', 'music', 'celebrity', 'film', 'actor', 'singer', 'show']
-        }
-        
-        text_lower = text.lower()
-        scores = {}
-        
-        for category, keywords in categories.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
-            if score > 0:
-                scores[category] = score
-        
-        if scores:
-            return max(scores, key=scores.get)
-        return 'general'
\ No newline at end of file
+    @instrument('topic_extractor')
+    def categorize_article(self, text: Union[str, AnalyzedDocument]) -> str:
+        """Keyword category detection (see CategoryClassifier)"""
+        return self.classifier.categorize(_plain_text(text))
+    
+    @instrument('topic_extractor')
+    def categorize_many(self, texts: List[Union[str, AnalyzedDocument]]) -> List[str]:
+        """Categorize a batch of articles with one compiled matcher"""
+        return self.classifier.categorize_many([_plain_text(text) for text in texts])
+
+
+def _plain_text(text: Union[str, AnalyzedDocument]) -> str:
+    return text.text if isinstance(text, AnalyzedDocument) else text
@@ -0,0 +1,159 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+class OnlineTopicModel:
+    """
+    Persistent LDA topic model updated incrementally with partial_fit.
+    Documents are vectorized with a HashingVectorizer, so the vocabulary is
+    stable across batches and never refit. Hashed columns are mapped back to
+    the most recently seen term for display.
+    """
+    
+    def __init__(self, 
+                 n_topics: int = 10,
+                 n_features: int = 2 ** 16,
+                 max_seen: int = 100000,
+                 random_state: int = 42):
+        self.n_topics = n_topics
+        self.n_features = n_features
+        self.max_seen = max_seen
+        self.random_state = random_state
+        self.n_documents = 0
+        
+        self.terms: Dict[int, str] = {}
+        self._seen = OrderedDict()  # hashes of documents already trained on
+        self._lock = threading.RLock()
+        self._lda = None
+        self._vectorizer = None
+    
+    @property
+    def vectorizer(self):
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+            self._vectorizer = HashingVectorizer(
+                n_features=self.n_features,
+                stop_words='english',
+                ngram_range=(1, 2),
+                alternate_sign=False,
+                norm=None
+            )
+        return self._vectorizer
+    
+    @property
+    def lda(self):
+        if self._lda is None:
+            from sklearn.decomposition import LatentDirichletAllocation
+            self._lda = LatentDirichletAllocation(
+                n_components=self.n_topics,
+                learning_method='online',
+                random_state=self.random_state
+            )
+        return self._lda
+    
+    @property
+    def is_fitted(self) -> bool:
+        return self._lda is not None and hasattr(self._lda, 'components_')
+    
+    def partial_fit(self, documents: List[str]) -> int:
+        """
+        Update the model with documents it has not seen before.
+        Returns the number of new documents trained on.
+        """
+        with self._lock:
+            new_documents = []
+            for document in documents:
+                key = hashlib.sha1(document.encode('utf-8')).hexdigest()
+                if document and key not in self._seen:
+                    self._seen[key] = None
+                    new_documents.append(document)
+            while len(self._seen) > self.max_seen:
+                self._seen.popitem(last=False)
+            
+            if not new_documents:
+                return 0
+            
+            # Remember a readable term for every hashed column
+            # (HashingVectorizer hashes analyzed terms with the same FeatureHasher)
+            from sklearn.feature_extraction import FeatureHasher
+            analyzer = self.vectorizer.build_analyzer()
+            new_terms = list({term for document in new_documents for term in analyzer(document)})
+            if new_terms:
+                hasher = FeatureHasher(n_features=self.n_features, input_type='string',
+                                       alternate_sign=False)
+                columns = hasher.transform([[term] for term in new_terms]).indices
+                self.terms.update(zip(columns.tolist(), new_terms))
+            
+            self.lda.partial_fit(self.vectorizer.transform(new_documents))
+            self.n_documents += len(new_documents)
+            return len(new_documents)
+    
+    def transform(self, documents: List[str]):
+        """Topic distribution for each document, without training"""
+        with self._lock:
+            if not self.is_fitted:
+                raise ValueError("Topic model has not been trained yet")
+            return self.lda.transform(self.vectorizer.transform(documents))
+    
+    def topics(self, words_per_topic: int = 5,
+               topic_ids: Optional[List[int]] = None) -> List[Dict]:
+        """Top words of each topic, in the same shape as TopicExtractor.extract_topics_lda"""
+        with self._lock:
+            if not self.is_fitted:
+                return []
+            components = self.lda.components_
+            topics = []
+            for topic_idx in (topic_ids if topic_ids is not None else range(self.n_topics)):
+                topic = components[topic_idx]
+                # Only columns with a known term can be displayed
+                top_indices = [i for i in topic.argsort()[::-1] if int(i) in self.terms][:words_per_topic]
+                topics.append({
+                    'topic_id': int(topic_idx),
+                    'words': [self.terms[int(i)] for i in top_indices],
+                    'weight': float(topic[top_indices].mean()) if top_indices else 0.0
+                })
+            return topics
+    
+    def topics_for(self, documents: List[str], n_topics: int = 3,
+                   words_per_topic: int = 5) -> List[Dict]:
+        """The n_topics topics most present in documents"""
+        distribution = self.transform(documents).sum(axis=0)
+        topic_ids = [int(i) for i in distribution.argsort()[::-1][:n_topics]]
+        return self.topics(words_per_topic, topic_ids)
+    
+    def save(self, path: str):
+        """Persist the model atomically"""
+        import joblib
+        with self._lock:
+            state = {
+                'n_topics': self.n_topics,
+                'n_features': self.n_features,
+                'max_seen': self.max_seen,
+                'random_state': self.random_state,
+                'n_documents': self.n_documents,
+                'terms': self.terms,
+                'seen': list(self._seen),
+                'lda': self._lda
+            }
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            joblib.dump(state, tmp_path)
+            os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path: str) -> 'OnlineTopicModel':
+        import joblib
+        state = joblib.load(path)
+        model = cls(
+            n_topics=state['n_topics'],
+            n_features=state['n_features'],
+            max_seen=state['max_seen'],
+            random_state=state['random_state']
+        )
+        model.n_documents = state['n_documents']
+        model.terms = state['terms']
+        model._seen = OrderedDict.fromkeys(state['seen'])
+        model._lda = state['lda']
+        return model
@@ -0,0 +1,257 @@
+"""
+Streaming trending-phrase tracker with bounded memory.
+
+Every analyzed article contributes its entities and key phrases once. Counts
+go into a ring of time buckets (one hour each by default); each bucket holds
+a Count-Min Sketch for frequency estimates and a Space-Saving summary of its
+top-k candidate phrases. "Top trending in the last N hours" only reads the
+buckets in that window, weighting each by exponential decay of its age, so
+time and memory depend on the configuration, never on how much was ingested.
+
+    tracker = TrendingTracker.load_or_create('data/trending.npz')
+    tracker.add(article_phrases(entities, key_phrases), published_at, key=url)
+    tracker.trending(hours=24, top_n=10)
+    tracker.save('data/trending.npz')
+"""
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Numeric entity types say nothing about what a story is about
+SKIPPED_ENTITY_LABELS = frozenset({'CARDINAL', 'DATE', 'TIME', 'PERCENT', 'MONEY',
+                                   'QUANTITY', 'ORDINAL'})
+
+
+def normalize_phrase(phrase: str) -> str:
+    return ' '.join(phrase.split()).lower()
+
+
+def article_phrases(entities: Sequence[Tuple[str, str]], key_phrases: Sequence[str]) -> List[str]:
+    """Trackable phrases of one analyzed article: its named entities and key phrases"""
+    phrases = [text for text, label in entities if label not in SKIPPED_ENTITY_LABELS]
+    return phrases + list(key_phrases)
+
+
+class CountMinSketch:
+    """
+    Frequency estimates in depth x width counters; never underestimates, and
+    with conservative update overestimates by much less than the e/width bound
+    """
+
+    def __init__(self, width: int = 2048, depth: int = 4, table: Optional[np.ndarray] = None):
+        self.width = width
+        self.depth = depth
+        self.table = table if table is not None else np.zeros((depth, width), dtype=np.float32)
+        self._rows = np.arange(depth)
+
+    def columns(self, key: str) -> np.ndarray:
+        """One column per row; a keyed hash, stable across processes (unlike hash())"""
+        digest = blake2b(key.encode('utf-8'), digest_size=4 * self.depth).digest()
+        return np.frombuffer(digest, dtype='<u4') % self.width
+
+    def add(self, key: str, count: float = 1.0, columns: Optional[np.ndarray] = None):
+        columns = self.columns(key) if columns is None else columns
+        cells = self.table[self._rows, columns]
+        # Conservative update: raise only the counters below the new estimate
+        self.table[self._rows, columns] = np.maximum(cells, cells.min() + count)
+
+    def estimate(self, key: str, columns: Optional[np.ndarray] = None) -> float:
+        columns = self.columns(key) if columns is None else columns
+        return float(self.table[self._rows, columns].min())
+
+
+class SpaceSaving:
+    """
+    The k most frequent keys of a stream (Metwally et al.): when full, a new
+    key replaces the least counted one and inherits its count as error
+    """
+
+    def __init__(self, k: int = 100):
+        self.k = k
+        self.counters: Dict[str, List] = {}  # key -> [count, error, display form]
+
+    def add(self, key: str, display: str, count: float = 1.0):
+        counter = self.counters.get(key)
+        if counter is not None:
+            counter[0] += count
+        elif len(self.counters) < self.k:
+            self.counters[key] = [count, 0.0, display]
+        else:
+            evicted = min(self.counters, key=lambda name: self.counters[name][0])
+            floor = self.counters.pop(evicted)[0]
+            self.counters[key] = [floor + count, floor, display]
+
+    def clear(self):
+        self.counters.clear()
+
+
+class TrendingTracker:
+    """
+    Time-bucketed heavy hitters over a sliding window of num_buckets buckets
+    of bucket_seconds each. Memory: num_buckets sketches plus num_buckets * k
+    candidates, whatever the stream length.
+    """
+
+    def __init__(self, bucket_seconds: int = 3600, num_buckets: int = 72,
+                 half_life_hours: float = 6.0, width: int = 2048, depth: int = 4,
+                 k: int = 100, max_seen: int = 50_000):
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = num_buckets
+        self.half_life_hours = half_life_hours
+        self.k = k
+        self.max_seen = max_seen
+        self._tables = np.zeros((num_buckets, depth, width), dtype=np.float32)
+        self._sketches = [CountMinSketch(width, depth, self._tables[i]) for i in range(num_buckets)]
+        self._candidates = [SpaceSaving(k) for _ in range(num_buckets)]
+        self._bucket_ids = np.full(num_buckets, -1, dtype=np.int64)
+        # Keys (e.g. URLs) of articles already counted, so re-fetches don't count twice
+        self._seen: 'OrderedDict[str, None]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.articles = 0
+
+    def _slot(self, bucket_id: int) -> int:
+        """Ring slot of a bucket, recycling the slot when it held an older bucket"""
+        slot = bucket_id % self.num_buckets
+        if self._bucket_ids[slot] != bucket_id:
+            self._tables[slot] = 0
+            self._candidates[slot].clear()
+            self._bucket_ids[slot] = bucket_id
+        return slot
+
+    def add(self, phrases: Iterable[str], timestamp: Optional[float] = None,
+            key: Optional[str] = None) -> bool:
+        """
+        Count one article's phrases (each distinct phrase once) at timestamp
+        (default now). Returns False when the article was already counted
+        under key or is older than the window.
+        """
+        now = time.time()
+        timestamp = min(timestamp or now, now)
+        bucket_id = int(timestamp // self.bucket_seconds)
+        with self._lock:
+            if bucket_id <= int(now // self.bucket_seconds) - self.num_buckets:
+                return False
+            if key is not None:
+                if key in self._seen:
+                    return False
+                self._seen[key] = None
+                if len(self._seen) > self.max_seen:
+                    self._seen.popitem(last=False)
+            slot = self._slot(bucket_id)
+            distinct = {}
+            for phrase in phrases:
+                normalized = normalize_phrase(phrase)
+                if normalized and normalized not in distinct:
+                    distinct[normalized] = ' '.join(phrase.split())
+            for normalized, display in distinct.items():
+                self._sketches[slot].add(normalized)
+                self._candidates[slot].add(normalized, display)
+            self.articles += 1
+        return True
+
+    def trending(self, hours: float = 24, top_n: int = 10,
+                 now: Optional[float] = None) -> List[Dict]:
+        """
+        Top phrases of the last `hours`, ranked by decayed count (each bucket
+        weighted 0.5 ** (age / half-life)). 'previous' is the count over the
+        `hours` before that (None when the ring does not reach back that far),
+        and 'growth' the ratio of the two (add-one smoothed).
+        """
+        now = time.time() if now is None else now
+        current = int(now // self.bucket_seconds)
+        span = max(1, math.ceil(hours * 3600 / self.bucket_seconds))
+        with self._lock:
+            window = [(current - age, age) for age in range(min(span, self.num_buckets))]
+            previous = [current - span - age for age in range(span)]
+            live = {int(b): slot for slot, b in enumerate(self._bucket_ids) if b >= 0}
+            window = [(live[b], age) for b, age in window if b in live]
+            previous = [live[b] for b in previous if b in live]
+            if not window:
+                return []
+
+            names = {}
+            for slot, _ in window:
+                for normalized, (_, _, display) in self._candidates[slot].counters.items():
+                    names.setdefault(normalized, display)
+            if not names:
+                return []
+
+            # counts[bucket, phrase]: the sketch estimates of every candidate at once
+            sketch = self._sketches[0]
+            columns = np.stack([sketch.columns(normalized) for normalized in names])
+            rows = np.arange(sketch.depth)
+            slots = np.array([slot for slot, _ in window])
+            counts = self._tables[slots[:, None, None], rows, columns].min(axis=2)
+            weights = 0.5 ** (np.array([age for _, age in window], dtype=np.float64)
+                              * self.bucket_seconds / 3600 / self.half_life_hours)
+            scores = weights @ counts
+            totals = counts.sum(axis=0)
+            before = None
+            if 2 * span <= self.num_buckets:
+                before = np.zeros(len(names))
+                if previous:
+                    previous_slots = np.array(previous)[:, None, None]
+                    before = self._tables[previous_slots, rows, columns].min(axis=2).sum(axis=0)
+
+        best = np.argsort(-scores, kind='stable')[:top_n]
+        displays = list(names.values())
+        results = []
+        for i in best:
+            count = float(totals[i])
+            previous_count = float(before[i]) if before is not None else None
+            results.append({
+                'phrase': displays[i],
+                'score': float(scores[i]),
+                'count': count,
+                'previous': previous_count,
+                'growth': (count + 1) / (previous_count + 1) if previous_count is not None else None,
+            })
+        return results
+
+    def save(self, path: str):
+        """Persist the sketches, candidates and seen keys (compressed) atomically"""
+        with self._lock:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            tmp_path = f"{path}.tmp.npz"
+            state = {
+                'params': [self.bucket_seconds, self.num_buckets, self.half_life_hours,
+                           self.k, self.max_seen, self.articles],
+                'candidates': [candidates.counters for candidates in self._candidates],
+                'seen': list(self._seen),
+            }
+            np.savez_compressed(
+                tmp_path,
+                tables=self._tables,
+                bucket_ids=self._bucket_ids,
+                state=np.array(json.dumps(state))
+            )
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'TrendingTracker':
+        with np.load(path) as saved:
+            state = json.loads(str(saved['state']))
+            bucket_seconds, num_buckets, half_life_hours, k, max_seen, articles = state['params']
+            _, depth, width = saved['tables'].shape
+            tracker = cls(int(bucket_seconds), int(num_buckets), half_life_hours,
+                          width, depth, int(k), int(max_seen))
+            tracker._tables[:] = saved['tables']
+            tracker._bucket_ids[:] = saved['bucket_ids']
+        for candidates, counters in zip(tracker._candidates, state['candidates']):
+            candidates.counters = counters
+        tracker._seen = OrderedDict.fromkeys(state['seen'])
+        tracker.articles = int(articles)
+        return tracker
+
+    @classmethod
+    def load_or_create(cls, path: Optional[str], **kwargs) -> 'TrendingTracker':
+        if path and os.path.exists(path):
+            return cls.load(path)
+        return cls(**kwargs)
@@ -0,0 +1,197 @@
+"""
+Read-only, memory-mapped WordNet synonym/antonym index.
+
+Build once (python -m src.wordnet_index build data/wordnet.idx); every worker
+process then maps the same file instead of loading the NLTK corpus, so the
+pages are shared through the OS page cache.
+
+File layout: header (magic, record count), a sorted table of uint32 record
+offsets, then UTF-8 records "key\\tjson\\n" sorted by key. Each record holds,
+per part of speech, the synonyms and antonyms ranked by sense order (most
+frequent sense first, lemma order within a sense), plus the morphological
+exceptions for that form.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+MAGIC = b'WNIDX001'
+HEADER = struct.Struct('<8sI')
+OFFSET = struct.Struct('<I')
+POS_LIST = ('n', 'v', 'a', 'r')
+
+# Same rules as nltk's WordNetCorpusReader.MORPHOLOGICAL_SUBSTITUTIONS
+MORPHOLOGICAL_SUBSTITUTIONS = {
+    'n': [('s', ''), ('ses', 's'), ('ves', 'f'), ('xes', 'x'), ('zes', 'z'),
+          ('ches', 'ch'), ('shes', 'sh'), ('men', 'man'), ('ies', 'y')],
+    'v': [('s', ''), ('ies', 'y'), ('es', 'e'), ('es', ''), ('ed', 'e'),
+          ('ed', ''), ('ing', 'e'), ('ing', '')],
+    'a': [('er', ''), ('est', ''), ('er', 'e'), ('est', 'e')],
+    'r': [],
+}
+
+
+def _ordered_unique(items: Iterable[str], limit: int) -> List[str]:
+    result = []
+    seen = set()
+    for item in items:
+        if item not in seen:
+            seen.add(item)
+            result.append(item)
+            if len(result) >= limit:
+                break
+    return result
+
+
+def build_index(path: str, wordnet=None, max_results: int = 12) -> int:
+    """
+    Compile WordNet into the index file at path. Stores up to max_results
+    ranked synonyms/antonyms per form and part of speech.
+    Returns the number of records written.
+    """
+    if wordnet is None:
+        from nltk.corpus import wordnet
+        wordnet.ensure_loaded()
+    
+    records: Dict[str, Dict] = {}
+    for form, offsets_by_pos in wordnet._lemma_pos_offset_map.items():
+        record = records.setdefault(form, {})
+        for pos in POS_LIST:
+            synonyms, antonyms = [], []
+            for offset in offsets_by_pos.get(pos, []):
+                synset = wordnet.synset_from_pos_and_offset(pos, offset)
+                for lemma in synset.lemmas():
+                    synonyms.append(lemma.name().replace('_', ' '))
+                    antonyms.extend(a.name().replace('_', ' ') for a in lemma.antonyms())
+            if pos in offsets_by_pos:
+                record[pos] = [_ordered_unique(synonyms, max_results),
+                               _ordered_unique(antonyms, max_results)]
+    
+    # Irregular forms (e.g. 'geese' -> 'goose') from WordNet's exception lists
+    for pos in POS_LIST:
+        for form, bases in wordnet._exception_map[pos].items():
+            records.setdefault(form, {}).setdefault('x', {})[pos] = list(bases)
+    
+    encoded = [
+        key.encode('utf-8') + b'\t' + json.dumps(records[key], separators=(',', ':')).encode('utf-8') + b'\n'
+        for key in sorted(records, key=lambda k: k.encode('utf-8'))
+    ]
+    
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(encoded)))
+        position = HEADER.size + OFFSET.size * len(encoded)
+        for record in encoded:
+            f.write(OFFSET.pack(position))
+            position += len(record)
+        for record in encoded:
+            f.write(record)
+    
+    return len(encoded)
+
+
+class WordNetIndex:
+    """Memory-mapped lookups into an index built by build_index"""
+    
+    def __init__(self, path: str, cache_size: int = 4096, max_results: int = 5):
+        self.path = path
+        self.max_results = max_results
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a WordNet index file")
+        self.lookup = lru_cache(maxsize=cache_size)(self._lookup)
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def _key_at(self, i: int) -> bytes:
+        start = OFFSET.unpack_from(self._map, HEADER.size + OFFSET.size * i)[0]
+        return self._map[start:self._map.find(b'\t', start)]
+    
+    def _record(self, form: str) -> Optional[Dict]:
+        """Binary search the sorted records for an exact form"""
+        key = form.encode('utf-8')
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self._count:
+            return None
+        start = OFFSET.unpack_from(self._map, HEADER.size + OFFSET.size * lo)[0]
+        tab = self._map.find(b'\t', start)
+        if self._map[start:tab] != key:
+            return None
+        end = self._map.find(b'\n', tab)
+        return json.loads(self._map[tab + 1:end])
+    
+    def _morphy(self, form: str, pos: str, records: Dict) -> List[str]:
+        """Base forms of form for pos, following nltk's _morphy"""
+        def record(candidate):
+            if candidate not in records:
+                records[candidate] = self._record(candidate)
+            return records[candidate]
+        
+        def filter_forms(forms):
+            return _ordered_unique(
+                (f for f in forms if (record(f) or {}).get(pos) is not None), len(forms)
+            )
+        
+        def apply_rules(forms):
+            return [f[:-len(old)] + new for f in forms
+                    for old, new in MORPHOLOGICAL_SUBSTITUTIONS[pos] if f.endswith(old)]
+        
+        exceptions = (record(form) or {}).get('x', {}).get(pos)
+        if exceptions:
+            return filter_forms([form] + exceptions)
+        
+        forms = apply_rules([form])
+        results = filter_forms([form] + forms)
+        while forms and not results:
+            forms = apply_rules(forms)
+            results = filter_forms(forms)
+        return results
+    
+    def _lookup(self, word: str) -> Dict:
+        """Ranked synonyms and antonyms for a word (same shape as LinguisticAnalyzer)"""
+        lemma = word.lower()
+        records: Dict[str, Optional[Dict]] = {}
+        synonyms, antonyms = [], []
+        for pos in POS_LIST:
+            for form in self._morphy(lemma, pos, records):
+                form_synonyms, form_antonyms = records[form][pos]
+                synonyms.extend(s for s in form_synonyms if s.lower() != word.lower())
+                antonyms.extend(form_antonyms)
+        return {
+            'word': word,
+            'synonyms': _ordered_unique(synonyms, self.max_results),
+            'antonyms': _ordered_unique(antonyms, self.max_results)
+        }
+    
+    def lookup_many(self, words: List[str]) -> List[Dict]:
+        """Batch lookup, one result per word in order"""
+        return [self.lookup(word) for word in words]
+    
+    def close(self):
+        self.lookup.cache_clear()
+        self._map.close()
+
+
+def main(argv: List[str]):
+    if len(argv) != 2 or argv[0] != 'build':
+        print("usage: python -m src.wordnet_index build <path>")
+        sys.exit(2)
+    count = build_index(argv[1])
+    print(f"Wrote {count} records to {argv[1]}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])